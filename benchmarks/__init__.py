@@ -0,0 +1,51 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Benchmarks of the client, run them with ``python -m benchmarks``.
+
+Benchmarks follow the conventions of asv: modules named ``bench_*.py``
+define ``time_*`` functions timed by the runner and ``timeraw_*``
+functions returning code timed in a fresh interpreter. The module's
+``setup()`` is called once before its benchmarks. Benchmarks raising
+``NotImplementedError`` are skipped, e.g. without an optional dependency.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def documents(count: int, index: str = "logs") -> List[Dict[str, Any]]:
+    """Log documents with the types commonly sent to Elasticsearch,
+    including values serialized by ``JsonSerializer.default``.
+    """
+    return [
+        {
+            "_index": index,
+            "_id": str(i),
+            "@timestamp": _START + timedelta(milliseconds=i),
+            "trace": {"id": uuid.UUID(int=i)},
+            "message": f"GET /api/v1/items/{i} HTTP/1.1 200 {i % 5000} bytes",
+            "log": {"level": ("info", "warn", "error")[i % 3], "logger": "http"},
+            "host": {"name": f"host-{i % 16}", "ip": f"10.0.{i % 256}.{i % 13}"},
+            "http": {"status": 200, "bytes": i % 5000, "duration": i * 0.25},
+            "tags": ["production", "eu-west-1"],
+        }
+        for i in range(count)
+    ]
@@ -0,0 +1,173 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Runs the benchmarks and compares them to a stored baseline:
+
+    $ python -m benchmarks --save baseline.json
+    $ python -m benchmarks --compare baseline.json
+    $ python -m benchmarks -k bulk
+
+The command fails when a benchmark is slower than the
+baseline by more than the ``--threshold`` ratio.
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import pkgutil
+import platform
+import subprocess
+import sys
+import timeit
+import warnings
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+BENCHMARKS_DIR = Path(__file__).absolute().parent
+SOURCE_DIR = BENCHMARKS_DIR.parent
+
+
+def discover(pattern: str) -> Iterator[Tuple[str, object, Callable[[], object]]]:
+    """Yields the name, module and function of the selected benchmarks"""
+    for info in pkgutil.iter_modules([str(BENCHMARKS_DIR)]):
+        if not info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"benchmarks.{info.name}")
+        for attr in sorted(vars(module)):
+            if not attr.startswith(("time_", "timeraw_")):
+                continue
+            name = f"{info.name}.{attr}"
+            if fnmatch.fnmatch(name, f"*{pattern}*"):
+                yield name, module, getattr(module, attr)
+
+
+def time_function(func: Callable[[], object], repeat: int) -> float:
+    """Returns the best time of one call in seconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def time_raw(func: Callable[[], str], repeat: int) -> float:
+    """Returns the best time of running the code in a new interpreter"""
+    code = (
+        "import time, warnings\n"
+        "warnings.simplefilter('ignore')\n"
+        "start = time.perf_counter()\n"
+        f"{func()}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=str(SOURCE_DIR)
+        )
+        times.append(float(output.decode().strip().splitlines()[-1]))
+    return min(times)
+
+
+def run(pattern: str, repeat: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    set_up = set()
+    for name, module, func in discover(pattern):
+        try:
+            if module not in set_up:
+                set_up.add(module)
+                setup = getattr(module, "setup", None)
+                if setup is not None:
+                    setup()
+            if name.split(".")[-1].startswith("timeraw_"):
+                results[name] = time_raw(func, repeat)  # type: ignore[arg-type]
+            else:
+                results[name] = time_function(func, repeat)
+        except NotImplementedError as e:
+            print(f"{name:<55} skipped {e}")
+            continue
+        print(f"{name:<55} {format_time(results[name])}", flush=True)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> int:
+    """Prints the ratio to the baseline, returns the number of regressions"""
+    regressions = 0
+    print(f"\n{'benchmark':<55} {'baseline':>11} {'current':>11}  ratio")
+    for name, seconds in results.items():
+        before: Optional[float] = baseline.get(name)
+        if before is None:
+            continue
+        ratio = seconds / before
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  slower"
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            flag = "  faster"
+        print(
+            f"{name:<55} {format_time(before)} {format_time(seconds)}  {ratio:5.2f}{flag}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", default="", help="run benchmarks matching a pattern")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="store the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compare to stored results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="ratio above which a slower benchmark is a regression (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    results = run(args.k, args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Expanding and chunking bulk actions, the CPU bound part of the bulk helpers"""
+
+from elasticsearch_serverless.helpers.actions import _chunk_actions, expand_action
+from elasticsearch_serverless.serializer import JsonSerializer
+
+from . import documents
+
+
+def setup():
+    global docs, expanded, serializer
+    docs = documents(1000)
+    expanded = [expand_action(doc) for doc in docs]
+    serializer = JsonSerializer()
+
+
+def time_expand_action():
+    for doc in docs:
+        expand_action(doc)
+
+
+def time_chunk_actions():
+    for _ in _chunk_actions(
+        expanded,
+        chunk_size=500,
+        max_chunk_bytes=100 * 1024 * 1024,
+        serializer=serializer,
+    ):
+        pass
+
+
+def time_chunk_actions_by_bytes():
+    for _ in _chunk_actions(
+        expanded, chunk_size=100_000, max_chunk_bytes=64 * 1024, serializer=serializer
+    ):
+        pass
@@ -0,0 +1,47 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Per-call overhead of the client outside of the transport"""
+
+from elasticsearch_serverless import Elasticsearch
+
+
+def setup():
+    global client
+    client = Elasticsearch("http://localhost:9200")
+
+
+def time_options():
+    client.options(request_timeout=10)
+
+
+def time_options_many():
+    client.options(
+        request_timeout=10,
+        ignore_status=404,
+        max_retries=2,
+        retry_on_timeout=True,
+        headers={"x-opaque-id": "benchmark"},
+    )
+
+
+def timeraw_import():
+    return "import elasticsearch_serverless"
+
+
+def timeraw_import_helpers():
+    return "import elasticsearch_serverless.helpers"
@@ -0,0 +1,59 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Throughput of the helpers against an in-process fake Elasticsearch"""
+
+import asyncio
+
+from elasticsearch_serverless import AsyncElasticsearch, Elasticsearch, helpers
+
+from . import documents
+from .fake_server import FakeServer
+
+
+def setup():
+    global server, client, docs
+    server = FakeServer()
+    server.add_documents("scan", documents(5000))
+    client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+    docs = documents(5000)
+
+
+def time_streaming_bulk():
+    for _ in helpers.streaming_bulk(client, docs, chunk_size=500):
+        pass
+
+
+def time_parallel_bulk():
+    for _ in helpers.parallel_bulk(client, docs, chunk_size=500, thread_count=4):
+        pass
+
+
+def time_async_streaming_bulk():
+    async def run():
+        async_client = AsyncElasticsearch(
+            "http://localhost:9200", node_class=server.async_node_class
+        )
+        async for _ in helpers.async_streaming_bulk(async_client, docs, chunk_size=500):
+            pass
+
+    asyncio.run(run())
+
+
+def time_scan():
+    for _ in helpers.scan(client, index="scan", size=1000):
+        pass
@@ -0,0 +1,85 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Per-request overhead of the OpenTelemetry instrumentation with tracing
+disabled, with 10% of the requests sampled and with every request traced.
+
+    $ python -m benchmarks -k otel
+"""
+
+from elastic_transport import ApiResponseMeta, HttpHeaders
+
+from elasticsearch_serverless import Elasticsearch
+from elasticsearch_serverless._otel import OpenTelemetry
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+except ImportError:
+    TracerProvider = None
+
+
+class NoopTransport:
+    """Transport which returns the same response without any I/O"""
+
+    def __init__(self):
+        self.response = (
+            ApiResponseMeta(
+                status=200,
+                http_version="1.1",
+                headers=HttpHeaders({"X-elastic-product": "Elasticsearch"}),
+                duration=0.0,
+                node=None,
+            ),
+            {"acknowledged": True},
+        )
+
+    def perform_request(self, *args, **kwargs):
+        return self.response
+
+
+def client(enabled, sample_rate=1.0):
+    client = Elasticsearch("http://localhost:9200")
+    client._transport = NoopTransport()
+    tracer = TracerProvider().get_tracer(__name__) if TracerProvider else None
+    client._otel = OpenTelemetry(
+        enabled=enabled, tracer=tracer, sample_rate=sample_rate
+    )
+    return client
+
+
+def setup():
+    global off, sampled, on
+    off = client(enabled=False)
+    if TracerProvider is not None:
+        sampled = client(enabled=True, sample_rate=0.1)
+        on = client(enabled=True)
+
+
+def time_request_otel_off():
+    off.indices.exists(index="test")
+
+
+def time_request_otel_sampled():
+    if TracerProvider is None:
+        raise NotImplementedError("opentelemetry-sdk isn't installed")
+    sampled.indices.exists(index="test")
+
+
+def time_request_otel_on():
+    if TracerProvider is None:
+        raise NotImplementedError("opentelemetry-sdk isn't installed")
+    on.indices.exists(index="test")
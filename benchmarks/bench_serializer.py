@@ -0,0 +1,225 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Serializing and deserializing documents with the JSON serializers"""
+
+from elasticsearch_serverless.serializer import JsonSerializer
+
+from . import documents
+
+try:
+    from elasticsearch_serverless.serializer import OrjsonSerializer
+except ImportError:
+    OrjsonSerializer = None
+
+try:
+    import cbor2
+
+    from elasticsearch_serverless.serializer import CborSerializer
+except ImportError:
+    CborSerializer = None
+
+try:
+    import msgspec
+
+    from elasticsearch_serverless.serializer import MsgspecSerializer, _typed_decoder
+    from elasticsearch_serverless.typed import SearchResponse
+
+    class Log(msgspec.Struct):
+        message: str
+        tags: list
+        log: dict
+        host: dict
+        http: dict
+
+except ImportError:
+    MsgspecSerializer = None
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+
+def setup():
+    global docs, search_response, json_serializer, orjson_serializer
+    global msgspec_serializer, cbor_serializer, cbor_search_response
+    global vectors_response, cbor_vectors_response
+    docs = documents(100)
+    json_serializer = JsonSerializer()
+    hits = [
+        {"_index": "logs", "_id": str(i), "_source": doc} for i, doc in enumerate(docs)
+    ]
+    search_response = json_serializer.dumps({"took": 1, "hits": {"hits": hits}})
+    orjson_serializer = OrjsonSerializer() if OrjsonSerializer else None
+    msgspec_serializer = MsgspecSerializer() if MsgspecSerializer else None
+
+    # Search responses of text and of numeric documents in JSON and CBOR
+    vector_hits = [
+        {"_index": "vectors", "_id": str(i), "_source": {"v": [i / 7] * 256}}
+        for i in range(100)
+    ]
+    vectors_response = json_serializer.dumps({"hits": {"hits": vector_hits}})
+    cbor_serializer = CborSerializer() if CborSerializer else None
+    if cbor_serializer is not None:
+        cbor_search_response = cbor2.dumps(json_serializer.loads(search_response))
+        cbor_vectors_response = cbor2.dumps({"hits": {"hits": vector_hits}})
+
+    global numpy_rows, pandas_rows, vectors, byte_vectors, hex_serializer
+    numpy_rows = pandas_rows = vectors = byte_vectors = None
+    hex_serializer = JsonSerializer(hex_byte_vectors=True)
+    if np is not None and pd is not None:
+        rng = np.random.default_rng(0)
+        vectors = [
+            {"_id": str(i), "embedding": rng.random(1024, dtype=np.float32)}
+            for i in range(100)
+        ]
+        byte_vectors = [
+            {"_id": str(i), "embedding": rng.integers(-128, 128, 1024, dtype=np.int8)}
+            for i in range(100)
+        ]
+        numpy_rows = [
+            {
+                "id": np.int64(i),
+                "count": np.int32(i % 100),
+                "score": np.float32(i / 3),
+                "active": np.bool_(i % 2),
+                "@timestamp": np.datetime64("2024-01-01T00:00:00")
+                + np.timedelta64(i, "s"),
+                "embedding": np.arange(8, dtype=np.float32),
+            }
+            for i in range(100)
+        ]
+        frame = pd.DataFrame(
+            {
+                "id": np.arange(100),
+                "score": np.linspace(0, 1, 100, dtype=np.float32),
+                "@timestamp": pd.date_range("2024-01-01", periods=100, freq="s"),
+                "level": pd.Categorical(["info", "warn"] * 50),
+                "bytes": pd.array([1, None] * 50, dtype="Int64"),
+            }
+        )
+        # Rows of mixed dtypes hold numpy and pandas scalars
+        pandas_rows = [dict(row) for _, row in frame.iterrows()]
+
+
+def _orjson():
+    if orjson_serializer is None:
+        raise NotImplementedError("orjson isn't installed")
+    return orjson_serializer
+
+
+def time_json_dumps():
+    for doc in docs:
+        json_serializer.dumps(doc)
+
+
+def time_json_loads():
+    json_serializer.loads(search_response)
+
+
+def time_orjson_dumps():
+    serializer = _orjson()
+    for doc in docs:
+        serializer.dumps(doc)
+
+
+def time_orjson_loads():
+    _orjson().loads(search_response)
+
+
+def _msgspec():
+    if msgspec_serializer is None:
+        raise NotImplementedError("msgspec isn't installed")
+    return msgspec_serializer
+
+
+def time_msgspec_dumps():
+    serializer = _msgspec()
+    for doc in docs:
+        serializer.dumps(doc)
+
+
+def time_msgspec_loads():
+    _msgspec().loads(search_response)
+
+
+def time_msgspec_loads_typed():
+    _msgspec()
+    _typed_decoder(SearchResponse[Log]).decode(search_response)
+
+
+def _cbor():
+    if cbor_serializer is None:
+        raise NotImplementedError("cbor2 isn't installed")
+    return cbor_serializer
+
+
+def time_cbor_loads():
+    _cbor().loads(cbor_search_response)
+
+
+def time_json_loads_vectors():
+    json_serializer.loads(vectors_response)
+
+
+def time_cbor_loads_vectors():
+    _cbor().loads(cbor_vectors_response)
+
+
+def _rows(rows):
+    if rows is None:
+        raise NotImplementedError("numpy and pandas aren't installed")
+    return rows
+
+
+def time_json_dumps_numpy_rows():
+    for row in _rows(numpy_rows):
+        json_serializer.dumps(row)
+
+
+def time_json_dumps_pandas_rows():
+    for row in _rows(pandas_rows):
+        json_serializer.dumps(row)
+
+
+def time_orjson_dumps_pandas_rows():
+    serializer = _orjson()
+    for row in _rows(pandas_rows):
+        serializer.dumps(row)
+
+
+def time_json_dumps_vectors():
+    for doc in _rows(vectors):
+        json_serializer.dumps(doc)
+
+
+def time_orjson_dumps_vectors():
+    serializer = _orjson()
+    for doc in _rows(vectors):
+        serializer.dumps(doc)
+
+
+def time_json_dumps_byte_vectors():
+    for doc in _rows(byte_vectors):
+        json_serializer.dumps(doc)
+
+
+def time_json_dumps_hex_byte_vectors():
+    for doc in _rows(byte_vectors):
+        hex_serializer.dumps(doc)
@@ -0,0 +1,926 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""In-process stand-in for a serverless Elasticsearch project.
+
+:class:`FakeServer` keeps indices in memory and implements enough of the
+API to run the helpers end to end without a cluster: ``bulk`` with per-item
+results, ``search`` with ``scroll``, point in time with ``search_after`` and
+``slice``, ``msearch``, ``mget``, ``count`` and ``esql.query``, also with
+``format=arrow``. Clients talk
+to it through a node class, or over HTTP with :meth:`FakeServer.serve`::
+
+    server = FakeServer(latency=0.002, throughput=50_000_000)
+    client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+    helpers.bulk(client, docs, index="test")
+
+Latency, throughput and rejections are simulated so helper
+benchmarks are reproducible offline.
+"""
+
+import asyncio
+import base64
+import contextlib
+import fnmatch
+import functools
+import gzip
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from elastic_transport import ApiResponseMeta, BaseAsyncNode, BaseNode, HttpHeaders
+from elastic_transport._node import NodeApiResponse
+
+from elasticsearch_serverless.serializer import JsonSerializer
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+__all__ = ["FakeServer"]
+
+_HEADERS = {
+    "content-type": "application/json",
+    "x-elastic-product": "Elasticsearch",
+}
+_SHARDS = {"total": 1, "successful": 1, "skipped": 0, "failed": 0}
+_ESQL_TYPES = ((bool, "boolean"), (int, "long"), (float, "double"), (str, "keyword"))
+
+
+class ApiException(Exception):
+    def __init__(self, status: int, error_type: str, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.error_type = error_type
+        self.reason = reason
+
+    def body(self) -> Dict[str, Any]:
+        error = {"type": self.error_type, "reason": self.reason}
+        return {
+            "error": dict(error, root_cause=[error]),
+            "status": self.status,
+        }
+
+
+class _Body:
+    """Response body which isn't serialized as JSON"""
+
+    __slots__ = ("content_type", "data")
+
+    def __init__(self, content_type: str, data: bytes) -> None:
+        self.content_type = content_type
+        self.data = data
+
+
+class _Doc:
+    __slots__ = ("index", "id", "source", "version", "seq_no")
+
+    def __init__(
+        self, index: str, id: str, source: Dict[str, Any], version: int, seq_no: int
+    ) -> None:
+        self.index = index
+        self.id = id
+        self.source = source
+        self.version = version
+        self.seq_no = seq_no
+
+
+class FakeServer:
+    """In-memory Elasticsearch used by the tests and benchmarks of the helpers.
+
+    :arg latency: Seconds added to every request, e.g. the network round trip.
+    :arg throughput: Bytes per second at which request and response bodies
+        are transferred, unlimited by default.
+    :arg item_rejection_rate: Ratio of bulk items rejected with
+        ``429 es_rejected_execution_exception``.
+    :arg request_rejection_rate: Ratio of bulk requests rejected
+        as a whole with ``429 Too Many Requests``.
+    :arg max_request_bytes: Request bodies above this size are
+        rejected with ``413 Request Entity Too Large``.
+    :arg seed: Seed of the random rejections.
+    :arg arrow_batch_size: Maximum number of rows of the record
+        batches of ES|QL responses with ``format=arrow``.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        throughput: Optional[float] = None,
+        item_rejection_rate: float = 0.0,
+        request_rejection_rate: float = 0.0,
+        max_request_bytes: Optional[int] = None,
+        seed: Optional[int] = 0,
+        arrow_batch_size: int = 1024,
+    ) -> None:
+        self.latency = latency
+        self.arrow_batch_size = arrow_batch_size
+        self.throughput = throughput
+        self.item_rejection_rate = item_rejection_rate
+        self.request_rejection_rate = request_rejection_rate
+        self.max_request_bytes = max_request_bytes
+
+        self.indices: Dict[str, Dict[str, _Doc]] = {}
+        #: (method, path) of every request received
+        self.requests: List[Tuple[str, str]] = []
+        self._random = random.Random(seed)
+        self._seq_no = itertools.count()
+        self._ids = itertools.count()
+        self._scrolls: Dict[str, Tuple[List[Dict[str, Any]], int]] = {}
+        self._pits: Dict[str, List[_Doc]] = {}
+        self._lock = threading.RLock()
+
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable[..., Any]]] = [
+            (method, re.compile(f"^{pattern}$"), handler)
+            for method, pattern, handler in (
+                ("GET|HEAD", "/", self._info),
+                ("POST|PUT", "(?:/(?P<index>[^_/][^/]*))?/_bulk", self._bulk),
+                ("GET|POST", "/_search/scroll", self._scroll),
+                ("DELETE", "/_search/scroll", self._clear_scroll),
+                ("GET|POST", "(?:/(?P<index>[^_/][^/]*))?/_search", self._search),
+                ("GET|POST", "(?:/(?P<index>[^_/][^/]*))?/_msearch", self._msearch),
+                ("GET|POST", "(?:/(?P<index>[^_/][^/]*))?/_mget", self._mget),
+                ("GET|POST", "(?:/(?P<index>[^_/][^/]*))?/_count", self._count),
+                ("POST", "/(?P<index>[^_/][^/]*)/_pit", self._open_pit),
+                ("DELETE", "/_pit", self._close_pit),
+                ("POST", "/_query", self._esql),
+                ("GET", "/_data_stream/(?P<name>[^/]+)", self._data_streams),
+                ("GET|POST", "(?:/(?P<index>[^_/][^/]*))?/_refresh", self._refresh),
+                ("GET|HEAD", "/(?P<index>[^_/][^/]*)/_doc/(?P<id>[^/]+)", self._get),
+                ("PUT|POST", "/(?P<index>[^_/][^/]*)/_doc/(?P<id>[^/]+)", self._index),
+                ("POST", "/(?P<index>[^_/][^/]*)/_doc", self._index),
+                ("PUT", "/(?P<index>[^_/][^/]*)", self._create_index),
+                ("HEAD", "/(?P<index>[^_/][^/]*)", self._index_exists),
+                ("DELETE", "/(?P<index>[^_/][^/]*)", self._delete_index),
+            )
+        ]
+
+    @property
+    def node_class(self) -> type:
+        """Node class to create sync clients with, e.g.
+        ``Elasticsearch("http://localhost:9200", node_class=server.node_class)``
+        """
+        return type("FakeNode", (FakeNode,), {"server": self})
+
+    @property
+    def async_node_class(self) -> type:
+        """Node class to create ``AsyncElasticsearch`` clients with"""
+        return type("AsyncFakeNode", (AsyncFakeNode,), {"server": self})
+
+    @contextlib.contextmanager
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """Serves the fake over HTTP in a background thread
+        to exercise the real HTTP nodes, yields the URL.
+        """
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("content-length") or 0)
+                body = self.rfile.read(length) if length else None
+                status, headers, data, delay = server.handle(
+                    self.command, self.path, body, dict(self.headers.items())
+                )
+                time.sleep(delay)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        httpd = ThreadingHTTPServer((host, port), Handler)
+        httpd.daemon_threads = True
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{httpd.server_address[1]}"
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join()
+
+    def add_documents(self, index: str, docs: List[Dict[str, Any]]) -> None:
+        """Indexes documents without going through the API, documents
+        with an ``_id`` key are stored with that ID.
+        """
+        serializer = JsonSerializer()
+        with self._lock:
+            for doc in docs:
+                doc = json.loads(serializer.dumps(doc))
+                doc.pop("_index", None)
+                self._put(index, doc.pop("_id", None), doc)
+
+    def handle(
+        self,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> Tuple[int, Dict[str, str], bytes, float]:
+        """Handles a request, returns the status, headers and body of the
+        response and the number of seconds the response should be delayed.
+        """
+        start = time.perf_counter()
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        path = unquote(url.path.rstrip("/") or "/")
+        headers = {key.lower(): value for key, value in headers.items()}
+        if body and headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        request_bytes = len(body or b"")
+
+        status, data = 200, {}
+        try:
+            with self._lock:
+                self.requests.append((method, path))
+            if (
+                self.max_request_bytes is not None
+                and request_bytes > self.max_request_bytes
+            ):
+                raise ApiException(
+                    413,
+                    "request_entity_too_large",
+                    f"request body of {request_bytes} bytes is larger "
+                    f"than {self.max_request_bytes} bytes",
+                )
+            handler, path_params = self._route(method, path)
+            status, data = handler(params, body or b"", **path_params)
+        except ApiException as e:
+            status, data = e.status, e.body()
+
+        if isinstance(data, dict) and "took" in data:
+            data["took"] = int((time.perf_counter() - start + self.latency) * 1000)
+        response_headers = dict(_HEADERS)
+        if method == "HEAD":
+            response = b""
+        elif isinstance(data, _Body):
+            response = data.data
+            response_headers["content-type"] = data.content_type
+        elif headers.get("accept") == "application/cbor" and cbor2 is not None:
+            response = cbor2.dumps(data)
+            response_headers["content-type"] = "application/cbor"
+        else:
+            response = json.dumps(data).encode()
+        delay = self.latency
+        if self.throughput:
+            delay += (request_bytes + len(response)) / self.throughput
+        return status, response_headers, response, delay
+
+    def _route(
+        self, method: str, path: str
+    ) -> Tuple[Callable[..., Any], Dict[str, str]]:
+        for methods, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match is not None and method in methods.split("|"):
+                return handler, {k: v for k, v in match.groupdict().items() if v}
+        raise ApiException(
+            400, "illegal_argument_exception", f"unknown endpoint [{method} {path}]"
+        )
+
+    # Documents
+
+    def _put(self, index: str, id: Optional[str], source: Dict[str, Any]) -> _Doc:
+        docs = self.indices.setdefault(index, {})
+        if id is None:
+            id = base64.urlsafe_b64encode(next(self._ids).to_bytes(8, "big")).decode()[
+                :-1
+            ]
+        previous = docs.get(id)
+        doc = _Doc(
+            index,
+            id,
+            source,
+            previous.version + 1 if previous else 1,
+            previous.seq_no if previous else next(self._seq_no),
+        )
+        docs[id] = doc
+        return doc
+
+    def _resolve(self, index: Optional[str]) -> List[str]:
+        if index is None or index in ("_all", "*"):
+            return list(self.indices)
+        names = []
+        for pattern in index.split(","):
+            if "*" in pattern:
+                names.extend(fnmatch.filter(self.indices, pattern))
+            elif pattern in self.indices:
+                names.append(pattern)
+            else:
+                raise ApiException(
+                    404, "index_not_found_exception", f"no such index [{pattern}]"
+                )
+        return names
+
+    def _docs(self, index: Optional[str]) -> List[_Doc]:
+        docs = [
+            doc for name in self._resolve(index) for doc in self.indices[name].values()
+        ]
+        docs.sort(key=lambda doc: doc.seq_no)
+        return docs
+
+    # Endpoints
+
+    def _info(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        return 200, {
+            "name": "serverless",
+            "cluster_name": "fake",
+            "version": {"number": "8.11.0", "build_flavor": "serverless"},
+            "tagline": "You Know, for Search",
+        }
+
+    def _bulk(
+        self, params: Dict[str, str], body: bytes, index: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            if self._random.random() < self.request_rejection_rate:
+                raise ApiException(
+                    429, "es_rejected_execution_exception", "rejected execution of bulk"
+                )
+            lines = iter(line for line in body.splitlines() if line.strip())
+            items = []
+            for line in lines:
+                action = json.loads(line)
+                ((op_type, meta),) = action.items()
+                source = json.loads(next(lines)) if op_type != "delete" else None
+                items.append({op_type: self._bulk_item(op_type, meta, source, index)})
+        return 200, {
+            "took": 0,
+            "errors": any("error" in item[op] for item in items for op in item),
+            "items": items,
+        }
+
+    def _bulk_item(
+        self,
+        op_type: str,
+        meta: Dict[str, Any],
+        source: Optional[Dict[str, Any]],
+        index: Optional[str],
+    ) -> Dict[str, Any]:
+        index = meta.get("_index", index)
+        id = meta.get("_id")
+        item: Dict[str, Any] = {"_index": index, "_id": id}
+        if self._random.random() < self.item_rejection_rate:
+            error = ("es_rejected_execution_exception", "rejected execution")
+            return dict(item, status=429, error=_error(*error))
+        existing = self.indices.get(index, {}).get(id) if id is not None else None
+
+        if op_type == "delete" or (op_type == "update" and existing is None):
+            if existing is None:
+                if op_type == "update" and source and "upsert" in source:
+                    doc = self._put(index, id, source["upsert"])
+                    return dict(item, **_write_result(doc, "created", 201))
+                if op_type == "update" and source and source.get("doc_as_upsert"):
+                    doc = self._put(index, id, source["doc"])
+                    return dict(item, **_write_result(doc, "created", 201))
+                error = (
+                    ("document_missing_exception", f"[{id}]: document missing")
+                    if op_type == "update"
+                    else None
+                )
+                if error is None:
+                    return dict(item, result="not_found", status=404, _version=1)
+                return dict(item, status=404, error=_error(*error))
+            del self.indices[index][id]
+            return dict(
+                item, **_write_result(existing, "deleted", 200, existing.version + 1)
+            )
+        if op_type == "create" and existing is not None:
+            error = (
+                "version_conflict_engine_exception",
+                f"[{id}]: version conflict, document already exists",
+            )
+            return dict(item, status=409, error=_error(*error))
+        if op_type == "update":
+            source = dict(existing.source, **(source or {}).get("doc", {}))
+        doc = self._put(index, id, source or {})
+        if existing is None:
+            return dict(item, **_write_result(doc, "created", 201))
+        return dict(item, **_write_result(doc, "updated", 200))
+
+    def _search(
+        self, params: Dict[str, str], body: bytes, index: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        search = json.loads(body) if body else {}
+        for key in ("size", "from"):
+            if key in params:
+                search[key] = int(params[key])
+        with self._lock:
+            pit = search.get("pit")
+            if pit is not None:
+                if index is not None:
+                    raise ApiException(
+                        400,
+                        "action_request_validation_exception",
+                        "[indices] cannot be used with point in time",
+                    )
+                try:
+                    docs = self._pits[pit["id"]]
+                except KeyError:
+                    raise ApiException(
+                        404, "search_context_missing_exception", "no such pit"
+                    ) from None
+            else:
+                docs = self._docs(index)
+            response = self._hits(docs, search, sort_values=pit is not None)
+            if pit is not None:
+                response["pit_id"] = pit["id"]
+            if "scroll" in params:
+                hits = response["hits"]["hits"]
+                size = search.get("size", 10)
+                remaining = self._hits(
+                    docs, dict(search, size=len(docs), **{"from": 0})
+                )["hits"]["hits"][len(hits) :]
+                scroll_id = base64.b64encode(
+                    f"scroll:{len(self._scrolls)}:{id(remaining)}".encode()
+                ).decode()
+                self._scrolls[scroll_id] = (remaining, size)
+                response["_scroll_id"] = scroll_id
+        return 200, response
+
+    def _hits(
+        self, docs: List[_Doc], search: Dict[str, Any], sort_values: bool = False
+    ) -> Dict[str, Any]:
+        matches = [doc for doc in docs if _matches(doc, search.get("query"))]
+        slice = search.get("slice")
+        if slice is not None:
+            matches = [
+                doc
+                for doc in matches
+                if doc.seq_no % slice.get("max", 1) == slice.get("id", 0)
+            ]
+        sort = _sort_fields(search.get("sort"))
+        sort_values = sort_values or bool(sort)
+        if not sort:
+            sort = [("_shard_doc", False)] if sort_values else [("_doc", False)]
+        keys = [
+            (doc, [_sort_value(doc, field) for field, _ in sort]) for doc in matches
+        ]
+        keys.sort(key=functools.cmp_to_key(lambda a, b: _compare(a[1], b[1], sort)))
+
+        search_after = search.get("search_after")
+        if search_after is not None:
+            keys = [key for key in keys if _compare(key[1], search_after, sort) > 0]
+        offset = search.get("from", 0)
+        page = keys[offset : offset + search.get("size", 10)]
+
+        hits = []
+        source_filter = search.get("_source", True)
+        for doc, values in page:
+            hit: Dict[str, Any] = {
+                "_index": doc.index,
+                "_id": doc.id,
+                "_score": None if sort_values else 1.0,
+            }
+            if source_filter is not False:
+                hit["_source"] = _filter_source(doc.source, source_filter)
+            if sort_values:
+                hit["sort"] = values
+            hits.append(hit)
+        return {
+            "took": 0,
+            "timed_out": False,
+            "_shards": dict(_SHARDS),
+            "hits": {
+                "total": {"value": len(matches), "relation": "eq"},
+                "max_score": None if sort_values or not hits else 1.0,
+                "hits": hits,
+            },
+        }
+
+    def _scroll(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        scroll_id = json.loads(body)["scroll_id"] if body else params["scroll_id"]
+        with self._lock:
+            try:
+                remaining, size = self._scrolls[scroll_id]
+            except KeyError:
+                raise ApiException(
+                    404, "search_context_missing_exception", "no such search context"
+                ) from None
+            hits, self._scrolls[scroll_id] = remaining[:size], (remaining[size:], size)
+        return 200, {
+            "_scroll_id": scroll_id,
+            "took": 0,
+            "timed_out": False,
+            "_shards": dict(_SHARDS),
+            "hits": {
+                "total": {"value": len(hits), "relation": "eq"},
+                "max_score": 1.0 if hits else None,
+                "hits": hits,
+            },
+        }
+
+    def _clear_scroll(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        scroll_ids = json.loads(body)["scroll_id"] if body else params["scroll_id"]
+        if isinstance(scroll_ids, str):
+            scroll_ids = scroll_ids.split(",")
+        with self._lock:
+            freed = [self._scrolls.pop(id, None) for id in scroll_ids]
+        num_freed = sum(1 for scroll in freed if scroll is not None)
+        return 200 if num_freed else 404, {"succeeded": True, "num_freed": num_freed}
+
+    def _open_pit(
+        self, params: Dict[str, str], body: bytes, index: str
+    ) -> Tuple[int, Any]:
+        if "keep_alive" not in params:
+            raise ApiException(
+                400, "action_request_validation_exception", "[keep_alive] is missing"
+            )
+        with self._lock:
+            pit_id = base64.b64encode(f"pit:{len(self._pits)}".encode()).decode()
+            self._pits[pit_id] = self._docs(index)
+        return 200, {"id": pit_id}
+
+    def _close_pit(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        with self._lock:
+            freed = self._pits.pop(json.loads(body)["id"], None) is not None
+        return 200 if freed else 404, {"succeeded": True, "num_freed": int(freed)}
+
+    def _msearch(
+        self, params: Dict[str, str], body: bytes, index: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        lines = [line for line in body.splitlines() if line.strip()]
+        responses = []
+        for header, search in zip(lines[::2], lines[1::2]):
+            target = json.loads(header).get("index", index)
+            if isinstance(target, list):
+                target = ",".join(target)
+            try:
+                _, response = self._search({}, search, target)
+                response["status"] = 200
+            except ApiException as e:
+                response = e.body()
+            responses.append(response)
+        return 200, {"took": 0, "responses": responses}
+
+    def _mget(
+        self, params: Dict[str, str], body: bytes, index: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        request = json.loads(body)
+        specs = request.get("docs") or [{"_id": id} for id in request.get("ids", ())]
+        docs = []
+        with self._lock:
+            for spec in specs:
+                name = spec.get("_index", index)
+                doc = self.indices.get(name, {}).get(spec["_id"])
+                if doc is None:
+                    docs.append({"_index": name, "_id": spec["_id"], "found": False})
+                else:
+                    docs.append(_get_result(doc))
+        return 200, {"docs": docs}
+
+    def _count(
+        self, params: Dict[str, str], body: bytes, index: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        query = json.loads(body).get("query") if body else None
+        with self._lock:
+            count = sum(1 for doc in self._docs(index) if _matches(doc, query))
+        return 200, {"count": count, "_shards": dict(_SHARDS)}
+
+    def _esql(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """Supports queries made of 'FROM', 'KEEP' and 'LIMIT'"""
+        request = json.loads(body)
+        commands = [command.strip() for command in request["query"].split("|")]
+        source, *commands = commands
+        match = re.match(r"(?i)^FROM\s+(\S+(?:\s*,\s*\S+)*)$", source)
+        if match is None:
+            raise ApiException(400, "parsing_exception", "query must start with FROM")
+        with self._lock:
+            rows = [
+                _flatten(doc.source)
+                for doc in self._docs(match.group(1).replace(" ", ""))
+            ]
+
+        keep, limit = None, 1000
+        for command in commands:
+            name, _, args = command.partition(" ")
+            if name.upper() == "KEEP":
+                keep = [column.strip() for column in args.split(",")]
+            elif name.upper() == "LIMIT":
+                limit = int(args)
+            else:
+                raise ApiException(
+                    400, "verification_exception", f"unsupported command [{name}]"
+                )
+        rows = rows[:limit]
+
+        columns: Dict[str, str] = {}
+        for row in rows:
+            for column, value in row.items():
+                if columns.get(column) in (None, "null"):
+                    columns[column] = _esql_type(value)
+        names = sorted(columns) if keep is None else keep
+        values = [[row.get(name) for name in names] for row in rows]
+        response: Dict[str, Any] = {
+            "took": 0,
+            "columns": [
+                {"name": name, "type": columns.get(name, "null")} for name in names
+            ],
+        }
+        if params.get("format") == "arrow":
+            return 200, _arrow_stream(names, values, self.arrow_batch_size)
+        if request.get("columnar"):
+            response["values"] = [list(column) for column in zip(*values)]
+        else:
+            response["values"] = values
+        return 200, response
+
+    def _data_streams(
+        self, params: Dict[str, str], body: bytes, name: str
+    ) -> Tuple[int, Any]:
+        return 200, {"data_streams": []}
+
+    def _refresh(
+        self, params: Dict[str, str], body: bytes, index: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        return 200, {"_shards": dict(_SHARDS)}
+
+    def _get(
+        self, params: Dict[str, str], body: bytes, index: str, id: str
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            doc = self.indices.get(index, {}).get(id)
+        if doc is None:
+            return 404, {"_index": index, "_id": id, "found": False}
+        return 200, _get_result(doc)
+
+    def _index(
+        self, params: Dict[str, str], body: bytes, index: str, id: Optional[str] = None
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            existing = self.indices.get(index, {}).get(id) if id is not None else None
+            doc = self._put(index, id, json.loads(body))
+        if existing is None:
+            return 201, _write_result(doc, "created", 201)
+        return 200, _write_result(doc, "updated", 200)
+
+    def _create_index(
+        self, params: Dict[str, str], body: bytes, index: str
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            if index in self.indices:
+                raise ApiException(
+                    400,
+                    "resource_already_exists_exception",
+                    f"index [{index}] already exists",
+                )
+            self.indices[index] = {}
+        return 200, {"acknowledged": True, "index": index}
+
+    def _index_exists(
+        self, params: Dict[str, str], body: bytes, index: str
+    ) -> Tuple[int, Any]:
+        return (200 if index in self.indices else 404), {}
+
+    def _delete_index(
+        self, params: Dict[str, str], body: bytes, index: str
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            for name in self._resolve(index):
+                del self.indices[name]
+        return 200, {"acknowledged": True}
+
+
+class FakeNode(BaseNode):
+    """Node sending requests to a :class:`FakeServer`,
+    created with :attr:`FakeServer.node_class`.
+    """
+
+    server: FakeServer
+
+    def perform_request(
+        self, method, target, body=None, headers=None, request_timeout=None
+    ):
+        start = time.perf_counter()
+        status, response_headers, data, delay = self.server.handle(
+            method, target, body, dict(self.headers, **(headers or {}))
+        )
+        time.sleep(delay)
+        return _node_response(self, status, response_headers, data, start)
+
+
+class AsyncFakeNode(BaseAsyncNode):
+    """Async node sending requests to a :class:`FakeServer`,
+    created with :attr:`FakeServer.async_node_class`.
+    """
+
+    server: FakeServer
+
+    async def perform_request(
+        self, method, target, body=None, headers=None, request_timeout=None
+    ):
+        start = time.perf_counter()
+        status, response_headers, data, delay = self.server.handle(
+            method, target, body, dict(self.headers, **(headers or {}))
+        )
+        await asyncio.sleep(delay)
+        return _node_response(self, status, response_headers, data, start)
+
+    async def close(self):
+        pass
+
+
+def _node_response(node, status, headers, data, start):
+    return NodeApiResponse(
+        ApiResponseMeta(
+            status=status,
+            headers=HttpHeaders(headers),
+            http_version="1.1",
+            duration=time.perf_counter() - start,
+            node=node.config,
+        ),
+        data,
+    )
+
+
+def _arrow_stream(names: List[str], values: List[List[Any]], batch_size: int) -> _Body:
+    import pyarrow as pa
+
+    table = pa.table(
+        {name: list(column) for name, column in zip(names, zip(*values))}
+        if values
+        else {name: pa.array([], pa.null()) for name in names}
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=batch_size)
+    return _Body("application/vnd.apache.arrow.stream", sink.getvalue().to_pybytes())
+
+
+def _error(error_type: str, reason: str) -> Dict[str, Any]:
+    return {"type": error_type, "reason": reason}
+
+
+def _write_result(
+    doc: _Doc, result: str, status: int, version: Optional[int] = None
+) -> Dict[str, Any]:
+    return {
+        "_index": doc.index,
+        "_id": doc.id,
+        "_version": version or doc.version,
+        "result": result,
+        "_shards": {"total": 1, "successful": 1, "failed": 0},
+        "_seq_no": doc.seq_no,
+        "_primary_term": 1,
+        "status": status,
+    }
+
+
+def _get_result(doc: _Doc) -> Dict[str, Any]:
+    return {
+        "_index": doc.index,
+        "_id": doc.id,
+        "_version": doc.version,
+        "_seq_no": doc.seq_no,
+        "_primary_term": 1,
+        "found": True,
+        "_source": doc.source,
+    }
+
+
+def _field(source: Dict[str, Any], field: str) -> Any:
+    value: Any = source
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _matches(doc: _Doc, query: Optional[Dict[str, Any]]) -> bool:
+    """Supports 'match_all', 'ids', 'term', 'terms', 'exists', 'range' and 'bool'"""
+    if not query:
+        return True
+    ((query_type, spec),) = query.items()
+    if query_type == "match_all":
+        return True
+    if query_type == "ids":
+        return doc.id in spec["values"]
+    if query_type in ("term", "match"):
+        ((field, value),) = spec.items()
+        if isinstance(value, dict):
+            value = value.get("value", value.get("query"))
+        actual = doc.id if field == "_id" else _field(doc.source, field)
+        return actual == value or (isinstance(actual, list) and value in actual)
+    if query_type == "terms":
+        ((field, values),) = spec.items()
+        return _field(doc.source, field) in values
+    if query_type == "exists":
+        return _field(doc.source, spec["field"]) is not None
+    if query_type == "range":
+        ((field, bounds),) = spec.items()
+        value = _field(doc.source, field)
+        if value is None:
+            return False
+        operators: Dict[str, Callable[[Any, Any], bool]] = {
+            "gt": lambda a, b: a > b,
+            "gte": lambda a, b: a >= b,
+            "lt": lambda a, b: a < b,
+            "lte": lambda a, b: a <= b,
+        }
+        return all(operators[op](value, bound) for op, bound in bounds.items())
+    if query_type == "bool":
+
+        def clauses(key: str) -> List[Dict[str, Any]]:
+            value = spec.get(key, [])
+            return value if isinstance(value, list) else [value]
+
+        should = clauses("should")
+        return (
+            all(_matches(doc, q) for q in clauses("must") + clauses("filter"))
+            and not any(_matches(doc, q) for q in clauses("must_not"))
+            and (not should or any(_matches(doc, q) for q in should))
+        )
+    raise ApiException(400, "parsing_exception", f"unknown query [{query_type}]")
+
+
+def _sort_fields(sort: Any) -> List[Tuple[str, bool]]:
+    """Returns the (field, descending) pairs of a sort"""
+    if sort is None:
+        return []
+    fields = []
+    for spec in sort if isinstance(sort, list) else [sort]:
+        if isinstance(spec, str):
+            field, _, order = spec.partition(":")
+        else:
+            ((field, order),) = spec.items()
+            if isinstance(order, dict):
+                order = order.get("order", "asc")
+        fields.append((field, order == "desc"))
+    return fields
+
+
+def _sort_value(doc: _Doc, field: str) -> Any:
+    if field in ("_doc", "_shard_doc"):
+        return doc.seq_no
+    if field == "_id":
+        return doc.id
+    return _field(doc.source, field)
+
+
+def _compare(a: List[Any], b: List[Any], sort: List[Tuple[str, bool]]) -> int:
+    for x, y, (_, descending) in zip(a, b, sort):
+        if x == y:
+            continue
+        # Missing values are sorted last in both orders
+        if x is None or y is None:
+            return 1 if x is None else -1
+        result = -1 if x < y else 1
+        return -result if descending else result
+    return 0
+
+
+def _filter_source(source: Dict[str, Any], includes: Any) -> Dict[str, Any]:
+    if includes is True:
+        return source
+    if isinstance(includes, str):
+        includes = [includes]
+    return {key: value for key, value in source.items() if key in includes}
+
+
+def _flatten(source: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    row = {}
+    for key, value in source.items():
+        if isinstance(value, dict):
+            row.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            row[f"{prefix}{key}"] = value
+    return row
+
+
+def _esql_type(value: Any) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    for python_type, esql_type in _ESQL_TYPES:
+        if isinstance(value, python_type):
+            return esql_type
+    return "null"
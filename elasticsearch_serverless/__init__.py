@@ -51,13 +51,33 @@ warnings.warn(
 )
 
 from ._async.client import AsyncElasticsearch as AsyncElasticsearch
+from ._circuit_breaker import CircuitBreaker
+from ._concurrency import AdaptiveConcurrencyLimiter
+from ._hedging import HedgingPolicy
+from ._hooks import RequestContext, RequestHooks
+from ._lazy import LazyObjectApiResponse
+from ._metrics import MetricsRegistry
+from ._prepared import Param, PreparedRequest
+from ._retry import RetryPolicy
+from ._slowlog import SlowRequestLog
 from ._sync.client import Elasticsearch as Elasticsearch
+from ._timings import RequestTimings
+from ._traffic import (
+    ReplayReport,
+    TrafficRecord,
+    TrafficRecorder,
+    async_replay_traffic,
+    read_traffic,
+    replay_traffic,
+)
 from .exceptions import ElasticsearchDeprecationWarning  # noqa: F401
 from .exceptions import (
     ApiError,
     AuthenticationException,
     AuthorizationException,
     BadRequestError,
+    CircuitBreakerError,
+    ConcurrencyLimitError,
     ConflictError,
     ConnectionError,
     ConnectionTimeout,
@@ -76,20 +96,45 @@ try:
 except ImportError:
     OrjsonSerializer = None  # type: ignore[assignment,misc]
 
+try:
+    from .serializer import MsgspecSerializer
+except ImportError:
+    MsgspecSerializer = None  # type: ignore[assignment,misc]
+
 # Only raise one warning per deprecation message so as not
 # to spam up the user if the same action is done multiple times.
 warnings.simplefilter("default", category=ElasticsearchWarning, append=True)
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
     "ApiError",
     "AsyncElasticsearch",
     "BadRequestError",
+    "CircuitBreaker",
+    "CircuitBreakerError",
     "Elasticsearch",
+    "HedgingPolicy",
     "JsonSerializer",
+    "LazyObjectApiResponse",
+    "MetricsRegistry",
+    "Param",
+    "PreparedRequest",
+    "RequestContext",
+    "RequestHooks",
+    "ReplayReport",
+    "RequestTimings",
+    "RetryPolicy",
     "SerializationError",
+    "SlowRequestLog",
+    "TrafficRecord",
+    "TrafficRecorder",
     "TransportError",
+    "async_replay_traffic",
+    "read_traffic",
+    "replay_traffic",
     "NotFoundError",
     "ConflictError",
+    "ConcurrencyLimitError",
     "RequestError",
     "ConnectionError",
     "SSLError",
@@ -101,6 +146,8 @@ __all__ = [
 ]
 if OrjsonSerializer is not None:
     __all__.append("OrjsonSerializer")
+if MsgspecSerializer is not None:
+    __all__.append("MsgspecSerializer")
 
 fixup_module_metadata(__name__, globals())
 del fixup_module_metadata
@@ -33,6 +33,7 @@ from typing import (
     Union,
 )
 
+from .._retry import RetryPolicy, _parse_retry_after
 from ..exceptions import ApiError, NotFoundError, TransportError
 from ..helpers.actions import (
     _TYPE_BULK_ACTION,
@@ -42,9 +43,11 @@ from ..helpers.actions import (
     _ActionChunker,
     _process_bulk_chunk_error,
     _process_bulk_chunk_success,
+    _record_batches,
+    _retry_decision,
     expand_action,
 )
-from ..helpers.errors import ScanError
+from ..helpers.errors import BulkIndexError, ScanError
 from ..serializer import Serializer
 from .client import AsyncElasticsearch  # noqa
 
@@ -173,6 +176,7 @@ async def async_streaming_bulk(
     max_backoff: float = 600,
     yield_ok: bool = True,
     ignore_status: Union[int, Collection[int]] = (),
+    retry_policy: Optional[RetryPolicy] = None,
     *args: Any,
     **kwargs: Any,
 ) -> AsyncIterable[Tuple[bool, Dict[str, Any]]]:
@@ -206,10 +210,16 @@ async def async_streaming_bulk(
         retry. Any subsequent retries will be powers of ``initial_backoff *
         2**retry_number``
     :arg max_backoff: maximum number of seconds a retry will wait
+    :arg retry_policy: :class:`~elasticsearch_serverless.RetryPolicy` used
+        instead of ``max_retries``, ``initial_backoff`` and ``max_backoff``.
+        Documents rejected with any of the policy's ``retry_on_status`` are
+        retried with jittered backoff, honoring ``Retry-After`` headers and
+        the policy's retry budget. Uses the policy for the ``bulk`` endpoint.
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
     """
 
+    otel_metrics = client._otel.metrics
     client = client.options()
     client._client_meta = (("h", "bp"),)
 
@@ -219,6 +229,12 @@ async def async_streaming_bulk(
 
     serializer = client.transport.serializers.get_serializer("application/json")
 
+    retry_on_status: Collection[int] = (429,)
+    if retry_policy is not None:
+        retry_policy = retry_policy.for_endpoint("bulk")
+        max_retries = retry_policy.max_retries
+        retry_on_status = retry_policy.retry_on_status
+
     bulk_data: List[
         Union[
             Tuple[_TYPE_BULK_ACTION_HEADER],
@@ -229,6 +245,10 @@ async def async_streaming_bulk(
     async for bulk_data, bulk_actions in _chunk_actions(
         map_actions(), chunk_size, max_chunk_bytes, serializer
     ):
+        backoff: Optional[float] = None
+        retry_after: Optional[float] = None
+        if retry_policy is not None:
+            retry_policy.record_request()
         for attempt in range(max_retries + 1):
             to_retry: List[bytes] = []
             to_retry_data: List[
@@ -238,10 +258,17 @@ async def async_streaming_bulk(
                 ]
             ] = []
             if attempt:
-                await asyncio.sleep(
-                    min(max_backoff, initial_backoff * 2 ** (attempt - 1))
-                )
+                if retry_policy is None:
+                    await asyncio.sleep(
+                        min(max_backoff, initial_backoff * 2 ** (attempt - 1))
+                    )
+                else:
+                    backoff = retry_policy.backoff(backoff, retry_after)
+                    await asyncio.sleep(backoff)
+            retry_after = None
+            can_retry = _retry_decision(retry_policy, attempt < max_retries)
 
+            indexed = failed = retried = 0
             try:
                 data: Union[
                     Tuple[_TYPE_BULK_ACTION_HEADER],
@@ -264,31 +291,42 @@ async def async_streaming_bulk(
                 ):
                     if not ok:
                         action, info = info.popitem()
-                        # retry if retries enabled, we get 429, and we are not
-                        # in the last attempt
-                        if (
-                            max_retries
-                            and info["status"] == 429
-                            and (attempt + 1) <= max_retries
-                        ):
+                        # retry if retries enabled, we get a retryable status, and we
+                        # are not in the last attempt
+                        if info["status"] in retry_on_status and can_retry():
                             # _process_bulk_chunk expects strings so we need to
                             # re-serialize the data
                             to_retry.extend(map(serializer.dumps, data))
                             to_retry_data.append(data)
+                            retried += 1
                         else:
+                            failed += 1
                             yield ok, {action: info}
-                    elif yield_ok:
-                        yield ok, info
-
+                    else:
+                        indexed += 1
+                        if yield_ok:
+                            yield ok, info
+
+            except BulkIndexError as e:
+                failed += len(e.errors)
+                raise
             except ApiError as e:
-                # suppress 429 errors since we will retry them
-                if attempt == max_retries or e.status_code != 429:
+                # suppress retryable errors since we will retry them
+                if e.status_code not in retry_on_status or not can_retry():
+                    failed = len(bulk_data)
                     raise
+                retry_after = _parse_retry_after(e.meta.headers.get("retry-after"))
+                retried = len(bulk_data)
             else:
                 if not to_retry:
                     break
                 # retry only subset of documents that didn't succeed
                 bulk_actions, bulk_data = to_retry, to_retry_data
+            finally:
+                if otel_metrics is not None:
+                    otel_metrics.bulk_results(
+                        "helpers.async_streaming_bulk", indexed, failed, retried
+                    )
 
 
 async def async_bulk(
@@ -358,6 +396,7 @@ async def async_scan(
     request_timeout: Optional[float] = None,
     clear_scroll: bool = True,
     scroll_kwargs: Optional[MutableMapping[str, Any]] = None,
+    stream_hits: bool = False,
     **kwargs: Any,
 ) -> AsyncIterable[Dict[str, Any]]:
     """
@@ -388,6 +427,9 @@ async def async_scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~elasticsearch.AsyncElasticsearch.scroll`
+    :arg stream_hits: decode the hits of each page one at a time while
+        they're yielded instead of all at once, lowering the peak memory
+        of large pages. See the ``stream_path`` option of the client.
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~elasticsearch.AsyncElasticsearch.search` call:
@@ -420,9 +462,10 @@ async def async_scan(
                 pass
         return transport_kwargs
 
-    client = client.options(
-        request_timeout=request_timeout, **pop_transport_kwargs(kwargs)
-    )
+    transport_kwargs = pop_transport_kwargs(kwargs)
+    if stream_hits:
+        transport_kwargs["stream_path"] = ("hits", "hits")
+    client = client.options(request_timeout=request_timeout, **transport_kwargs)
     client._client_meta = (("h", "s"),)
 
     # Setting query={"from": ...} would make 'from' be used
@@ -586,3 +629,21 @@ async def async_reindex(
         chunk_size=chunk_size,
         **kwargs,
     )
+
+
+async def async_esql_record_batches(
+    client: AsyncElasticsearch, query: str, **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Runs an ES|QL query and yields the ``pyarrow.RecordBatch`` objects of its
+    Arrow response, see :func:`~elasticsearch.helpers.esql_record_batches`.
+
+    :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
+    :arg query: the ES|QL query
+
+    Any additional keyword arguments will be passed to
+    :meth:`~elasticsearch.AsyncElasticsearch.esql.query`, requires pyarrow.
+    """
+    resp = await client.esql.query(query=query, format="arrow", **kwargs)
+    for batch in _record_batches(resp.body):
+        yield batch
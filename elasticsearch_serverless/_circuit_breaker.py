@@ -0,0 +1,236 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Collection, Deque
+
+from elastic_transport import ConnectionError, ConnectionTimeout, TransportApiResponse
+
+from .exceptions import CircuitBreakerError
+
+__all__ = ["CircuitBreaker"]
+
+logger = logging.getLogger("elasticsearch")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops sending requests to the project while it's failing so that
+    callers fail immediately instead of waiting for timeouts and retries.
+
+    The breaker starts ``closed`` and records the outcome of every request.
+    A request fails when it raises a connection error or timeout or when the
+    response has one of the ``failure_status`` codes. The breaker opens after
+    ``failure_threshold`` consecutive failures, or when at least
+    ``error_rate_threshold`` of the last ``window_size`` requests failed
+    and at least ``min_requests`` requests were recorded.
+
+    While ``open`` requests raise a
+    :class:`~elasticsearch_serverless.exceptions.CircuitBreakerError` without
+    being sent. After ``reset_timeout`` seconds the breaker is ``half_open``
+    and lets ``half_open_max_requests`` probe requests through: the breaker
+    closes once they all succeed and opens again for another ``reset_timeout``
+    as soon as one of them fails.
+
+    .. code-block:: python
+
+        client = Elasticsearch(
+            ...,
+            circuit_breaker=CircuitBreaker(failure_threshold=5, reset_timeout=10)
+        )
+
+    :arg failure_threshold: Number of consecutive failed requests which open
+        the breaker.
+    :arg error_rate_threshold: Ratio of failed requests in the window which
+        opens the breaker.
+    :arg window_size: Number of the most recent requests used to compute the
+        error rate.
+    :arg min_requests: Minimum number of requests in the window before the
+        error rate is used.
+    :arg reset_timeout: Number of seconds the breaker stays open before
+        probing the project.
+    :arg half_open_max_requests: Number of probe requests sent while half open.
+    :arg failure_status: HTTP status codes counted as failures.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        window_size: int = 100,
+        min_requests: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_max_requests: int = 1,
+        failure_status: Collection[int] = (500, 502, 503, 504),
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("'failure_threshold' must be greater than 0")
+        if not 0 < error_rate_threshold <= 1:
+            raise ValueError("'error_rate_threshold' must be between 0 and 1")
+        if half_open_max_requests < 1:
+            raise ValueError("'half_open_max_requests' must be greater than 0")
+
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.half_open_max_requests = half_open_max_requests
+        self.failure_status = frozenset(failure_status)
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+        #: Number of requests which failed because the breaker was open.
+        self.rejected_requests = 0
+
+    @property
+    def state(self) -> str:
+        """Either ``closed``, ``open`` or ``half_open``"""
+        with self._lock:
+            if (
+                self._state == OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                return HALF_OPEN
+            return self._state
+
+    def reset(self) -> None:
+        """Closes the breaker and forgets all recorded requests"""
+        with self._lock:
+            self._close()
+
+    def _before_request(self) -> bool:
+        """Raises an error if the request can't be sent. Otherwise returns
+        whether the request is a probe request of the half open breaker.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if (
+                self._state == OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self._state = HALF_OPEN
+                self._probes = self._probe_successes = 0
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_requests:
+                self._probes += 1
+                return True
+            self.rejected_requests += 1
+            state = self._state
+        raise CircuitBreakerError(
+            f"Circuit breaker is {state.replace('_', ' ')}, the request wasn't sent"
+        )
+
+    def _record(self, success: bool, probe: bool) -> None:
+        with self._lock:
+            if probe:
+                if self._state != HALF_OPEN:
+                    return
+                if not success:
+                    self._open("probe request failed")
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_requests:
+                    logger.info("Circuit breaker closed, probe requests succeeded")
+                    self._close()
+                return
+            if self._state != CLOSED:
+                return
+
+            if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+                self._failures -= 1
+            self._outcomes.append(success)
+            if success:
+                self._consecutive_failures = 0
+                return
+            self._failures += 1
+            self._consecutive_failures += 1
+
+            recorded = len(self._outcomes)
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open(f"{self._consecutive_failures} consecutive requests failed")
+            elif (
+                recorded >= self.min_requests
+                and self._failures >= self.error_rate_threshold * recorded
+            ):
+                self._open(f"{self._failures} of the last {recorded} requests failed")
+
+    def _release_probe(self) -> None:
+        """Releases the slot of a probe request which didn't complete"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes -= 1
+
+    def _open(self, reason: str) -> None:
+        logger.warning(
+            "Circuit breaker opened for %.1fs: %s", self.reset_timeout, reason
+        )
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._outcomes.clear()
+        self._failures = 0
+
+
+def _circuit(
+    breaker: CircuitBreaker, perform: Callable[[], TransportApiResponse]
+) -> TransportApiResponse:
+    probe = breaker._before_request()
+    try:
+        response = perform()
+    except (ConnectionError, ConnectionTimeout):
+        breaker._record(False, probe)
+        raise
+    except BaseException:
+        if probe:
+            breaker._release_probe()
+        raise
+    breaker._record(response[0].status not in breaker.failure_status, probe)
+    return response
+
+
+async def _async_circuit(
+    breaker: CircuitBreaker, perform: Callable[[], Awaitable[TransportApiResponse]]
+) -> TransportApiResponse:
+    probe = breaker._before_request()
+    try:
+        response = await perform()
+    except (ConnectionError, ConnectionTimeout):
+        breaker._record(False, probe)
+        raise
+    except BaseException:
+        if probe:
+            breaker._release_probe()
+        raise
+    breaker._record(response[0].status not in breaker.failure_status, probe)
+    return response
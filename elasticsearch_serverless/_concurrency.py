@@ -0,0 +1,285 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Awaitable, Callable, Collection, Deque, Optional
+
+from elastic_transport import ConnectionTimeout, TransportApiResponse
+
+from .exceptions import ConcurrencyLimitError
+
+__all__ = ["AdaptiveConcurrencyLimiter"]
+
+
+class _Waiter:
+    __slots__ = ("notify", "granted")
+
+    def __init__(self, notify: Callable[[], object]) -> None:
+        self.notify = notify
+        self.granted = False
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of requests in flight from a client and adapts
+    the limit to the observed latency and to ``429 Too Many Requests``
+    and ``503 Service Unavailable`` responses.
+
+    The limit follows a gradient: while the latency of requests stays
+    close to the long-term average latency the limit grows, and once
+    requests start queueing on the server and latency rises the limit
+    shrinks. A throttled response immediately multiplies the limit by
+    ``backoff_ratio``. Requests over the limit wait in a queue for a
+    request in flight to complete, or fail fast with a
+    :class:`~elasticsearch_serverless.exceptions.ConcurrencyLimitError`
+    when the queue is full or the request waited for ``queue_timeout``.
+
+    .. code-block:: python
+
+        client = Elasticsearch(
+            ...,
+            concurrency_limiter=AdaptiveConcurrencyLimiter(max_limit=64)
+        )
+
+    One limiter can be shared by multiple clients, including synchronous
+    and asynchronous clients, to limit their combined traffic.
+
+    :arg initial_limit: Limit before any request completed.
+    :arg min_limit: Lowest value the limit is lowered to.
+    :arg max_limit: Highest value the limit is raised to.
+    :arg smoothing: Weight of each new sample when updating the limit.
+    :arg tolerance: Ratio of the latency to the long-term latency
+        which is tolerated before the limit is lowered.
+    :arg backoff_ratio: Ratio the limit is multiplied by after a
+        throttled response or a timeout.
+    :arg long_window: Number of samples averaged by the long-term latency.
+    :arg max_queue_size: Number of requests which can wait for the limit,
+        further requests fail immediately. Set to ``0`` to never queue.
+        Defaults to an unbounded queue.
+    :arg queue_timeout: Number of seconds a request waits for the limit
+        before failing. Defaults to waiting until the request is sent.
+    :arg throttle_status: HTTP status codes of throttled responses.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        backoff_ratio: float = 0.9,
+        long_window: int = 600,
+        max_queue_size: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        throttle_status: Collection[int] = (429, 503),
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 1 <= 'min_limit' <= 'initial_limit' <= 'max_limit'"
+            )
+        if not 0 < smoothing <= 1:
+            raise ValueError("'smoothing' must be between 0 and 1")
+        if tolerance < 1:
+            raise ValueError("'tolerance' must be greater than or equal to 1")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("'backoff_ratio' must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.throttle_status = frozenset(throttle_status)
+
+        self._limit = float(initial_limit)
+        self._long_rtt: Optional[float] = None
+        self._long_alpha = 2.0 / (long_window + 1)
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+        #: Number of requests which failed because the limit was reached.
+        self.rejected_requests = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests in flight"""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for the limit"""
+        return len(self._waiters)
+
+    def _enqueue(self, waiter: _Waiter) -> bool:
+        """Takes a slot for the request if one is available and returns ``True``,
+        otherwise queues the waiter which is notified once it's been granted a slot.
+        """
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return True
+            if (
+                self.max_queue_size is not None
+                and len(self._waiters) >= self.max_queue_size
+            ):
+                self.rejected_requests += 1
+                raise ConcurrencyLimitError(
+                    f"Concurrency limit of {int(self._limit)} requests reached "
+                    f"and {len(self._waiters)} requests are already queued"
+                )
+            self._waiters.append(waiter)
+            return False
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Removes a waiter which stopped waiting from the queue. Returns
+        ``True`` if the waiter was granted a slot in the meantime.
+        """
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    def _release(self, latency: Optional[float], throttled: bool) -> None:
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            if throttled:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            elif latency is not None:
+                self._update(latency, in_flight)
+
+            # Hand the free slots directly to the queued requests.
+            while self._waiters and self._in_flight < int(self._limit):
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                self._in_flight += 1
+                waiter.notify()
+
+    def _update(self, rtt: float, in_flight: int) -> None:
+        if self._long_rtt is None:
+            self._long_rtt = rtt
+        else:
+            self._long_rtt += (rtt - self._long_rtt) * self._long_alpha
+            # Let the long-term latency recover quickly after a
+            # period of high latency, e.g. after an overload.
+            if self._long_rtt > rtt * 2:
+                self._long_rtt *= 0.95
+
+        # Don't raise the limit when requests aren't using it,
+        # otherwise it grows without bounds while idle.
+        if in_flight * 2 < self._limit:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / max(rtt, 1e-9)))
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        self._limit = min(
+            self.max_limit,
+            max(
+                self.min_limit,
+                self._limit * (1 - self.smoothing) + new_limit * self.smoothing,
+            ),
+        )
+
+
+def _queue_timeout_error(limiter: AdaptiveConcurrencyLimiter) -> ConcurrencyLimitError:
+    with limiter._lock:
+        limiter.rejected_requests += 1
+    return ConcurrencyLimitError(
+        f"Timed out after {limiter.queue_timeout}s waiting for the "
+        f"concurrency limit of {limiter.limit} requests"
+    )
+
+
+def _limit(
+    limiter: AdaptiveConcurrencyLimiter,
+    perform: Callable[[], TransportApiResponse],
+) -> TransportApiResponse:
+    event = threading.Event()
+    waiter = _Waiter(event.set)
+    if not limiter._enqueue(waiter):
+        if not event.wait(limiter.queue_timeout) and not limiter._abandon(waiter):
+            raise _queue_timeout_error(limiter)
+
+    start = time.perf_counter()
+    try:
+        response = perform()
+    except ConnectionTimeout:
+        limiter._release(None, throttled=True)
+        raise
+    except BaseException:
+        limiter._release(None, throttled=False)
+        raise
+    limiter._release(
+        time.perf_counter() - start,
+        throttled=response[0].status in limiter.throttle_status,
+    )
+    return response
+
+
+def _set_result(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def _async_limit(
+    limiter: AdaptiveConcurrencyLimiter,
+    perform: Callable[[], Awaitable[TransportApiResponse]],
+) -> TransportApiResponse:
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[None]" = loop.create_future()
+    # The slot may be released from another thread or event loop.
+    waiter = _Waiter(partial(loop.call_soon_threadsafe, _set_result, future))
+    if not limiter._enqueue(waiter):
+        try:
+            await asyncio.wait_for(future, limiter.queue_timeout)
+        except asyncio.TimeoutError:
+            if not limiter._abandon(waiter):
+                raise _queue_timeout_error(limiter) from None
+        except asyncio.CancelledError:
+            if limiter._abandon(waiter):
+                limiter._release(None, throttled=False)
+            raise
+
+    start = time.perf_counter()
+    try:
+        response = await perform()
+    except ConnectionTimeout:
+        limiter._release(None, throttled=True)
+        raise
+    except BaseException:
+        limiter._release(None, throttled=False)
+        raise
+    limiter._release(
+        time.perf_counter() - start,
+        throttled=response[0].status in limiter.throttle_status,
+    )
+    return response
@@ -0,0 +1,307 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Awaitable,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+__all__ = ["HedgingPolicy"]
+
+T = TypeVar("T")
+
+# Endpoints which only read data and are safe to send more than once.
+DEFAULT_HEDGE_ENDPOINTS = frozenset(("search", "get", "mget"))
+
+
+class _LatencyWindow:
+    """Sliding window of the most recent latencies of one endpoint.
+    The percentile is only recomputed every few samples as sorting
+    the window is much more expensive than recording a sample.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+        self._stale = 0
+        self._cached: Optional[float] = None
+        self._recompute_every = max(1, size // 20)
+
+    def record(self, latency: float) -> None:
+        self.samples.append(latency)
+        self._stale += 1
+
+    def percentile(self, percentile: float) -> float:
+        if self._cached is None or self._stale >= self._recompute_every:
+            ordered = sorted(self.samples)
+            self._cached = ordered[
+                min(len(ordered) - 1, int(percentile * len(ordered)))
+            ]
+            self._stale = 0
+        return self._cached
+
+
+class HedgingPolicy:
+    """Sends a second copy of an idempotent request when the first one
+    hasn't returned a response after a delay. The first response wins
+    and the other request is cancelled.
+
+    The delay is either fixed or the observed ``percentile`` latency of
+    the endpoint. Extra load is capped by a budget where each request
+    adds ``max_hedge_ratio`` of a token and each hedged request costs
+    one token, so ``max_hedge_ratio=0.05`` allows at most 5% of requests
+    to be hedged.
+
+    .. code-block:: python
+
+        client = Elasticsearch(
+            ...,
+            hedging_policy=HedgingPolicy(percentile=0.95, max_hedge_ratio=0.05)
+        )
+
+    :arg delay: Fixed number of seconds to wait before hedging a request.
+        If not set the delay is the observed ``percentile`` latency.
+    :arg percentile: Latency percentile of the endpoint to use as the delay.
+    :arg min_samples: Number of latencies to observe for an endpoint
+        before requests to the endpoint are hedged. Unused with ``delay``.
+    :arg window_size: Number of the most recent latencies kept per endpoint.
+    :arg max_hedge_ratio: Maximum ratio of requests which can be hedged.
+    :arg endpoints: Endpoint IDs which are hedged, these must be idempotent.
+    :arg max_workers: Maximum number of threads used to send concurrent
+        requests with the synchronous client. While all threads are busy,
+        requests are sent on the caller's thread without hedging. Requests
+        with the synchronous client can't be interrupted so a losing request
+        which is already in flight completes in the background and its
+        response is discarded.
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 100,
+        window_size: int = 1000,
+        max_hedge_ratio: float = 0.05,
+        endpoints: Collection[str] = DEFAULT_HEDGE_ENDPOINTS,
+        max_workers: int = 32,
+    ) -> None:
+        if delay is not None and delay < 0:
+            raise ValueError("'delay' must be greater than or equal to 0")
+        if not 0 < percentile < 1:
+            raise ValueError("'percentile' must be between 0 and 1")
+        if not 0 <= max_hedge_ratio <= 1:
+            raise ValueError("'max_hedge_ratio' must be between 0 and 1")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.max_hedge_ratio = max_hedge_ratio
+        self.endpoints = frozenset(endpoints)
+        self.max_workers = max_workers
+
+        # Allow a small burst of hedged requests after a quiet period.
+        self._max_tokens = max(1.0, 10 * max_hedge_ratio)
+        self._tokens = 0.0
+        self._latencies: Dict[str, _LatencyWindow] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._busy_workers = 0
+
+        #: Number of requests which were sent a second time.
+        self.hedged_requests = 0
+        #: Number of hedged requests where the second request won.
+        self.hedged_wins = 0
+
+    def hedge_delay(self, endpoint_id: str) -> Optional[float]:
+        """Returns the number of seconds to wait before hedging a request
+        to the endpoint or ``None`` if the request shouldn't be hedged.
+        """
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self.max_hedge_ratio)
+            if self.delay is not None:
+                return self.delay
+            window = self._latencies.get(endpoint_id)
+            if window is None or len(window.samples) < self.min_samples:
+                return None
+            return window.percentile(self.percentile)
+
+    def acquire_hedge(self) -> bool:
+        """Takes a token from the budget if one is available"""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.hedged_requests += 1
+            return True
+
+    def record(self, endpoint_id: str, latency: float) -> None:
+        """Records the latency of a request which returned a response"""
+        if self.delay is not None:
+            return
+        with self._lock:
+            try:
+                window = self._latencies[endpoint_id]
+            except KeyError:
+                window = self._latencies[endpoint_id] = _LatencyWindow(self.window_size)
+            window.record(latency)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="elasticsearch-hedging",
+                    )
+        return self._executor
+
+    def _reserve_worker(self) -> bool:
+        """Reserves a thread of the executor if one is free, so
+        requests never wait in the queue of the executor.
+        """
+        with self._lock:
+            if self._busy_workers >= self.max_workers:
+                return False
+            self._busy_workers += 1
+            return True
+
+    def _release_worker(self) -> None:
+        with self._lock:
+            self._busy_workers -= 1
+
+
+def _hedge(
+    policy: HedgingPolicy, endpoint_id: Optional[str], perform: Callable[[], T]
+) -> T:
+    if endpoint_id is None or endpoint_id not in policy.endpoints:
+        return perform()
+
+    def attempt() -> T:
+        start = time.perf_counter()
+        result = perform()
+        policy.record(endpoint_id, time.perf_counter() - start)
+        return result
+
+    delay = policy.hedge_delay(endpoint_id)
+    # Hedging doesn't limit the concurrency of the client, requests
+    # are sent on the caller's thread while all the threads are busy.
+    if delay is None or not policy._reserve_worker():
+        return attempt()
+
+    started = threading.Event()
+
+    def worker_attempt() -> T:
+        started.set()
+        try:
+            return attempt()
+        finally:
+            policy._release_worker()
+
+    # Attempts run in the context of the caller, like without hedging.
+    executor = policy._get_executor()
+    primary = executor.submit(contextvars.copy_context().run, worker_attempt)
+    # The delay starts once the request is sent.
+    started.wait()
+    done, _ = wait((primary,), timeout=delay)
+    if done or not policy._reserve_worker():
+        return primary.result()
+    if not policy.acquire_hedge():
+        policy._release_worker()
+        return primary.result()
+
+    hedge = executor.submit(contextvars.copy_context().run, worker_attempt)
+    pending: Set["Future[T]"] = {primary, hedge}
+    errors: List[BaseException] = []
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                errors.append(error)
+                continue
+            for loser in pending:
+                if loser.cancel():
+                    policy._release_worker()
+            if future is hedge:
+                with policy._lock:
+                    policy.hedged_wins += 1
+            return future.result()
+    # Both requests failed, raise the error of the first one.
+    raise errors[0]
+
+
+async def _async_hedge(
+    policy: HedgingPolicy,
+    endpoint_id: Optional[str],
+    perform: Callable[[], Awaitable[T]],
+) -> T:
+    if endpoint_id is None or endpoint_id not in policy.endpoints:
+        return await perform()
+
+    async def attempt() -> T:
+        start = time.perf_counter()
+        result = await perform()
+        policy.record(endpoint_id, time.perf_counter() - start)
+        return result
+
+    delay = policy.hedge_delay(endpoint_id)
+    if delay is None:
+        return await attempt()
+
+    primary = asyncio.ensure_future(attempt())
+    pending: Set["asyncio.Future[T]"] = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done or not policy.acquire_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(attempt())
+        pending.add(hedge)
+        errors: List[BaseException] = []
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                    continue
+                if future is hedge:
+                    with policy._lock:
+                        policy.hedged_wins += 1
+                return future.result()
+        # Both requests failed, raise the error of the first one.
+        raise errors[0]
+    finally:
+        # Cancel the losing request, also when the caller is cancelled.
+        for loser in pending:
+            loser.cancel()
@@ -0,0 +1,218 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from elastic_transport import ApiResponse, ApiResponseMeta, TransportApiResponse
+
+from ._retry import _RetryCallback
+from ._timings import RequestTimings
+from .exceptions import ApiError
+
+__all__ = ["RequestContext", "RequestHooks"]
+
+logger = logging.getLogger("elasticsearch")
+
+#: Events hooks can be registered for
+HOOK_EVENTS = ("before_request", "after_response", "on_error", "on_retry")
+
+
+class RequestContext:
+    """A request seen by :class:`~elasticsearch_serverless.RequestHooks`.
+
+    The same context is passed to every hook of a request. Hooks can keep
+    their own state, e.g. the start time of a profiler, in :attr:`data`.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "endpoint_id",
+        "path_parts",
+        "start",
+        "headers",
+        "body",
+        "request_bytes",
+        "response_bytes",
+        "status",
+        "duration",
+        "retries",
+        "timings",
+        "data",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        endpoint_id: Optional[str],
+        path_parts: Mapping[str, Any],
+    ) -> None:
+        self.method = method
+        #: Path of the request with the query string
+        self.path = path
+        self.endpoint_id = endpoint_id
+        self.path_parts = path_parts
+        #: 'time.perf_counter()' when the request started
+        self.start = time.perf_counter()
+        #: Headers of the request, including the client's default headers
+        self.headers: Mapping[str, str] = {}
+        #: Serialized request body, 'None' without a body
+        self.body: Optional[Any] = None
+        #: Size of the serialized request body, 0 without a body
+        self.request_bytes = 0
+        #: Size of the response body from the 'Content-Length' header
+        self.response_bytes = 0
+        #: HTTP status of the response, 'None' before a response is received
+        self.status: Optional[int] = None
+        #: Seconds from the start of the request to the response or error
+        self.duration = 0.0
+        #: Number of retries made by the client's RetryPolicy so far
+        self.retries = 0
+        self.timings: Optional[RequestTimings] = None
+        self.data: Dict[str, Any] = {}
+
+    def _finish(self, meta: Optional[ApiResponseMeta]) -> None:
+        self.duration = time.perf_counter() - self.start
+        if meta is not None:
+            self.status = meta.status
+            self.timings = RequestTimings.from_response(meta)
+            try:
+                self.response_bytes = int(meta.headers.get("content-length") or 0)
+            except ValueError:
+                pass
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestContext method={self.method!r} path={self.path!r} "
+            f"endpoint_id={self.endpoint_id!r} status={self.status!r}>"
+        )
+
+
+class RequestHooks:
+    """Hooks called by the client for every request, e.g. to build
+    sampling profilers or slow request logs:
+
+    * ``before_request(context)`` once the request body is serialized
+    * ``after_response(context, response)`` with the successful response
+    * ``on_error(context, error)`` when the request raised an error,
+      including :class:`~elasticsearch_serverless.ApiError` for error responses
+    * ``on_retry(context, outcome)`` before a request is retried by the
+      client's :class:`~elasticsearch_serverless.RetryPolicy`, with the
+      response or error of the failed attempt
+
+    Every hook receives the :class:`~elasticsearch_serverless.RequestContext`
+    of the request. Errors raised by hooks are logged and don't fail the
+    request. Hooks are kept by clients returned from ``.options()``.
+
+    .. code-block:: python
+
+        hooks = RequestHooks()
+
+        @hooks.register("after_response")
+        def log_slow_requests(context, response):
+            if context.duration > 1:
+                print(context.endpoint_id, context.duration)
+
+        client = Elasticsearch(..., hooks=hooks)
+    """
+
+    def __init__(self) -> None:
+        self._hooks: Dict[str, Tuple[Callable[..., Any], ...]] = {
+            event: () for event in HOOK_EVENTS
+        }
+        self._lock = threading.Lock()
+
+    def register(self, event: str, hook: Optional[Callable[..., Any]] = None) -> Any:
+        """Registers a hook for an event. Without a hook returns a decorator
+        which registers the decorated function.
+        """
+        if event not in self._hooks:
+            raise ValueError(f"'event' must be one of {', '.join(HOOK_EVENTS)}")
+        if hook is None:
+
+            def decorator(hook: Callable[..., Any]) -> Callable[..., Any]:
+                self.register(event, hook)
+                return hook
+
+            return decorator
+
+        # Hooks are replaced instead of mutated so requests don't need the lock.
+        with self._lock:
+            self._hooks[event] = self._hooks[event] + (hook,)
+        return hook
+
+    def unregister(self, event: str, hook: Callable[..., Any]) -> None:
+        """Removes a hook registered for an event"""
+        with self._lock:
+            hooks = list(self._hooks[event])
+            hooks.remove(hook)
+            self._hooks[event] = tuple(hooks)
+
+    def _call(self, hooks: Iterable[Callable[..., Any]], *args: Any) -> None:
+        for hook in hooks:
+            try:
+                hook(*args)
+            except Exception:
+                logger.warning("Request hook %r failed", hook, exc_info=True)
+
+    def _before_request(self, context: RequestContext) -> None:
+        self._call(self._hooks["before_request"], context)
+
+    def _after_response(
+        self, context: RequestContext, response: ApiResponse[Any]
+    ) -> None:
+        hooks = self._hooks["after_response"]
+        if hooks:
+            context._finish(response.meta)
+            self._call(hooks, context, response)
+
+    def _on_error(self, context: RequestContext, error: BaseException) -> None:
+        hooks = self._hooks["on_error"]
+        if hooks:
+            context._finish(error.meta if isinstance(error, ApiError) else None)
+            self._call(hooks, context, error)
+
+    def _retry_callback(
+        self, context: RequestContext, callback: Optional[_RetryCallback]
+    ) -> Optional[_RetryCallback]:
+        """Returns the callback of the retry policy, calling
+        the 'on_retry' hooks after the given callback.
+        """
+        hooks = self._hooks["on_retry"]
+        if not hooks:
+            return callback
+
+        def on_retry(outcome: Union[TransportApiResponse, Exception]) -> None:
+            if callback is not None:
+                callback(outcome)
+            context.retries += 1
+            self._call(hooks, context, outcome)
+
+        return on_retry
@@ -0,0 +1,110 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import re
+from typing import Any, Callable, Optional
+
+from elastic_transport import (
+    ApiResponse,
+    ApiResponseMeta,
+    ObjectApiResponse,
+    SerializerCollection,
+)
+
+from .serializer import _response_decoder
+
+__all__ = ["LazyObjectApiResponse"]
+
+_OBJECT_START = re.compile(rb"[ \t\n\r]*\{")
+# Slot of 'ApiResponse' holding the body, wrapped by the lazy responses
+_body_slot: Any = ApiResponse.__dict__["_body"]
+
+
+class _RawBody:
+    """Undecoded body of a JSON object response"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+
+def _keep_raw(data: bytes) -> _RawBody:
+    # Other JSON values are decoded as usual
+    # so the type of the response is known.
+    if _OBJECT_START.match(data) is None:
+        raise ValueError("Only JSON objects are decoded lazily")
+    return _RawBody(data)
+
+
+def _decode_raw(
+    serializers: SerializerCollection,
+    mimetype: Optional[str],
+    decoder: Optional[Callable[[bytes], Any]],
+    data: bytes,
+) -> Any:
+    if decoder is None:
+        return serializers.loads(data, mimetype)
+    token = _response_decoder.set(decoder)
+    try:
+        return serializers.loads(data, mimetype)
+    finally:
+        _response_decoder.reset(token)
+
+
+class LazyObjectApiResponse(ObjectApiResponse[Any]):
+    """Response to a JSON object which is decoded on the first access to its
+    body, e.g. through :attr:`body` or ``response["hits"]``, returned by
+    clients with the ``lazy_body`` option. Checking the :attr:`meta` of the
+    response doesn't decode it and :attr:`raw_bytes` is the body received
+    from Elasticsearch, which can be passed on without being encoded again.
+    """
+
+    def __init__(
+        self,
+        raw_bytes: bytes,
+        decode: Callable[[bytes], Any],
+        meta: ApiResponseMeta,
+    ) -> None:
+        super().__init__(body=_RawBody(raw_bytes), meta=meta)
+        self._decode = decode
+
+    _raw_bytes: bytes
+
+    @property
+    def _body(self) -> Any:
+        body = _body_slot.__get__(self)
+        if isinstance(body, _RawBody):
+            body = self._decode(body.data)
+            _body_slot.__set__(self, body)
+        return body
+
+    @_body.setter
+    def _body(self, body: Any) -> None:
+        if isinstance(body, _RawBody):
+            self._raw_bytes = body.data
+        _body_slot.__set__(self, body)
+
+    @property
+    def raw_bytes(self) -> bytes:
+        """Body of the response as received, without decoding it"""
+        return self._raw_bytes
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the body was decoded"""
+        return not isinstance(_body_slot.__get__(self), _RawBody)
@@ -0,0 +1,411 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import threading
+import time
+from bisect import bisect_left
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from elastic_transport import TransportApiResponse
+
+from ._timings import RequestTimings
+
+__all__ = ["MetricsRegistry"]
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_Key = Tuple[str, str]
+
+# Phases of a request recorded from the RequestTimings of responses
+_PHASES = ("serialize", "transport", "deserialize", "server")
+
+
+def _status_class(status: Optional[int]) -> str:
+    """Returns the status class of a response, e.g. ``2xx``,
+    or ``error`` for requests which didn't receive a response.
+    """
+    if status is None:
+        return "error"
+    return f"{status // 100}xx"
+
+
+class _Series:
+    """Metrics of one endpoint and status class in one shard"""
+
+    __slots__ = (
+        "count",
+        "sum",
+        "buckets",
+        "request_bytes",
+        "response_bytes",
+        "retries",
+        "throttled",
+        "phases",
+    )
+
+    def __init__(self, num_buckets: int) -> None:
+        self.count = 0
+        self.sum = 0.0
+        # The last bucket is '+Inf'
+        self.buckets = [0] * (num_buckets + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.throttled = 0
+        self.phases = [0.0] * len(_PHASES)
+
+    def merge(self, other: "_Series") -> None:
+        self.count += other.count
+        self.sum += other.sum
+        self.buckets = [x + y for x, y in zip(self.buckets, other.buckets)]
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        self.retries += other.retries
+        self.throttled += other.throttled
+        self.phases = [x + y for x, y in zip(self.phases, other.phases)]
+
+
+class MetricsRegistry:
+    """Records metrics of the requests sent by a client per endpoint ID
+    and status class (``2xx``, ``4xx``, ``5xx``, ... or ``error`` when no
+    response was received):
+
+    * a histogram of request latencies, including retries
+    * the number of bytes of request bodies and response bodies. The
+      response size is read from the ``Content-Length`` header, so it's
+      the compressed size of compressed responses and ``0`` for responses
+      without the header, e.g. chunked responses
+    * the number of retries made by the client's
+      :class:`~elasticsearch_serverless.RetryPolicy`, by the status class
+      of the attempt which was retried
+    * the number of ``429 Too Many Requests`` responses returned to the
+      client and retried by its ``RetryPolicy``
+
+    Retries made by the transport, with the ``max_retries`` and
+    ``retry_on_status`` options of clients without a ``RetryPolicy``,
+    happen within one request of the registry: they aren't counted as
+    retries and the ``429`` responses they retry aren't counted either.
+    Use a ``RetryPolicy`` to count every retry.
+    * the time spent serializing request bodies, in the transport, and
+      deserializing response bodies by the client, and the ``took`` time
+      reported by Elasticsearch, see
+      :class:`~elasticsearch_serverless.RequestTimings`
+
+    Every thread records into its own shard without taking a lock and the
+    shards are merged when the metrics are read with :meth:`snapshot` or
+    :meth:`to_openmetrics`.
+
+    .. code-block:: python
+
+        metrics = MetricsRegistry()
+        client = Elasticsearch(..., metrics_registry=metrics)
+
+        # Expose to Prometheus
+        body = metrics.to_openmetrics()
+
+    :arg buckets: Upper bounds in seconds of the latency histogram buckets.
+    :arg namespace: Prefix of the metric names in the OpenMetrics exposition.
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        namespace: str = "elasticsearch_client",
+    ) -> None:
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError("'buckets' must be a non-empty sorted list of bounds")
+        self.buckets = tuple(float(bucket) for bucket in buckets)
+        self.namespace = namespace
+        self._local = threading.local()
+        self._shards: List[Dict[_Key, _Series]] = []
+        self._lock = threading.Lock()
+
+    def _series(self, endpoint_id: Optional[str], status_class: str) -> _Series:
+        try:
+            shard: Dict[_Key, _Series] = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        key = (endpoint_id or "unknown", status_class)
+        try:
+            return shard[key]
+        except KeyError:
+            series = shard[key] = _Series(len(self.buckets))
+            return series
+
+    def _record_request(
+        self,
+        endpoint_id: Optional[str],
+        status: Optional[int],
+        duration: float,
+        request_bytes: int,
+        response_bytes: int,
+        timings: Optional[RequestTimings] = None,
+    ) -> None:
+        series = self._series(endpoint_id, _status_class(status))
+        series.count += 1
+        series.sum += duration
+        series.buckets[bisect_left(self.buckets, duration)] += 1
+        series.request_bytes += request_bytes
+        series.response_bytes += response_bytes
+        if status == 429:
+            series.throttled += 1
+        if timings is not None:
+            phases = series.phases
+            phases[0] += timings.serialize
+            phases[1] += timings.transport
+            phases[2] += timings.deserialize
+            if timings.server is not None:
+                phases[3] += timings.server
+
+    def _record_retry(
+        self,
+        endpoint_id: Optional[str],
+        outcome: Union[TransportApiResponse, Exception],
+    ) -> None:
+        status = None if isinstance(outcome, Exception) else outcome[0].status
+        series = self._series(endpoint_id, _status_class(status))
+        series.retries += 1
+        if status == 429:
+            series.throttled += 1
+
+    def _merged(self) -> Dict[_Key, _Series]:
+        with self._lock:
+            shards = list(self._shards)
+        merged: Dict[_Key, _Series] = {}
+        for shard in shards:
+            # Copying the items of a dict is atomic, the
+            # owner thread may be adding series meanwhile.
+            for key, series in list(shard.items()):
+                try:
+                    total = merged[key]
+                except KeyError:
+                    total = merged[key] = _Series(len(self.buckets))
+                total.merge(series)
+        return merged
+
+    def reset(self) -> None:
+        """Forgets all recorded metrics"""
+        self._local = threading.local()
+        with self._lock:
+            self._shards = []
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Returns the metrics as a dictionary keyed by endpoint ID and status class:
+
+        .. code-block:: python
+
+            {
+                "search": {
+                    "2xx": {
+                        "requests": 10,
+                        "latency": {"sum": 0.4, "buckets": {0.005: 0, ..., inf: 10}},
+                        "request_bytes": 512,
+                        "response_bytes": 20480,
+                        "retries": 0,
+                        "throttled": 0,
+                        "timings": {
+                            "serialize": 0.001,
+                            "transport": 0.35,
+                            "deserialize": 0.04,
+                            "server": 0.3,
+                        },
+                    }
+                }
+            }
+
+        Latency buckets are cumulative like in the OpenMetrics exposition.
+        Timings are the total seconds spent in each phase of the requests.
+        """
+        snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (endpoint_id, status_class), series in sorted(self._merged().items()):
+            snapshot.setdefault(endpoint_id, {})[status_class] = {
+                "requests": series.count,
+                "latency": {
+                    "sum": series.sum,
+                    "buckets": dict(
+                        zip(self.buckets + (float("inf"),), _cumulative(series.buckets))
+                    ),
+                },
+                "request_bytes": series.request_bytes,
+                "response_bytes": series.response_bytes,
+                "retries": series.retries,
+                "throttled": series.throttled,
+                "timings": dict(zip(_PHASES, series.phases)),
+            }
+        return snapshot
+
+    def to_openmetrics(self) -> str:
+        """Returns the metrics in the OpenMetrics text format"""
+        merged = sorted(self._merged().items())
+        ns = self.namespace
+        lines: List[str] = []
+
+        name = f"{ns}_request_duration_seconds"
+        lines.extend(
+            (
+                f"# TYPE {name} histogram",
+                f"# UNIT {name} seconds",
+                f"# HELP {name} Duration of requests including retries.",
+            )
+        )
+        bounds = [_format_float(bucket) for bucket in self.buckets] + ["+Inf"]
+        for key, series in merged:
+            labels = _labels(key)
+            for bound, count in zip(bounds, _cumulative(series.buckets)):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_count{{{labels}}} {series.count}")
+            lines.append(f"{name}_sum{{{labels}}} {_format_float(series.sum)}")
+
+        for metric, unit, description, attr in (
+            ("request_body", "bytes", "Size of request bodies.", "request_bytes"),
+            ("response_body", "bytes", "Size of response bodies.", "response_bytes"),
+            ("retries", "", "Retries by the status of the retried attempt.", "retries"),
+            (
+                "throttled_responses",
+                "",
+                "429 Too Many Requests responses.",
+                "throttled",
+            ),
+        ):
+            name = f"{ns}_{metric}_{unit}" if unit else f"{ns}_{metric}"
+            lines.append(f"# TYPE {name} counter")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            lines.append(f"# HELP {name} {description}")
+            for key, series in merged:
+                lines.append(f"{name}_total{{{_labels(key)}}} {getattr(series, attr)}")
+
+        name = f"{ns}_request_phase_seconds"
+        lines.extend(
+            (
+                f"# TYPE {name} counter",
+                f"# UNIT {name} seconds",
+                f"# HELP {name} Time spent in each phase of requests.",
+            )
+        )
+        for key, series in merged:
+            labels = _labels(key)
+            for phase, seconds in zip(_PHASES, series.phases):
+                lines.append(
+                    f'{name}_total{{{labels},phase="{phase}"}} {_format_float(seconds)}'
+                )
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _cumulative(buckets: List[int]) -> List[int]:
+    total = 0
+    cumulative = []
+    for count in buckets:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _labels(key: _Key) -> str:
+    endpoint_id, status_class = key
+    return f'endpoint="{endpoint_id}",status_class="{status_class}"'
+
+
+def _response_bytes(response: TransportApiResponse) -> int:
+    try:
+        return int(response[0].headers.get("content-length") or 0)
+    except ValueError:
+        return 0
+
+
+def _measure(
+    registry: MetricsRegistry,
+    endpoint_id: Optional[str],
+    request_bytes: int,
+    perform: Callable[[], TransportApiResponse],
+) -> TransportApiResponse:
+    start = time.perf_counter()
+    try:
+        response = perform()
+    except Exception:
+        registry._record_request(
+            endpoint_id, None, time.perf_counter() - start, request_bytes, 0
+        )
+        raise
+    registry._record_request(
+        endpoint_id,
+        response[0].status,
+        time.perf_counter() - start,
+        request_bytes,
+        _response_bytes(response),
+        RequestTimings.from_response(response[0]),
+    )
+    return response
+
+
+async def _async_measure(
+    registry: MetricsRegistry,
+    endpoint_id: Optional[str],
+    request_bytes: int,
+    perform: Callable[[], Awaitable[TransportApiResponse]],
+) -> TransportApiResponse:
+    start = time.perf_counter()
+    try:
+        response = await perform()
+    except Exception:
+        registry._record_request(
+            endpoint_id, None, time.perf_counter() - start, request_bytes, 0
+        )
+        raise
+    registry._record_request(
+        endpoint_id,
+        response[0].status,
+        time.perf_counter() - start,
+        request_bytes,
+        _response_bytes(response),
+        RequestTimings.from_response(response[0]),
+    )
+    return response
@@ -19,13 +19,17 @@ from __future__ import annotations
 
 import contextlib
 import os
+import random
+import threading
+import time
 from typing import TYPE_CHECKING, Generator, Mapping
 
 if TYPE_CHECKING:
     from typing import Literal
 
 try:
-    from opentelemetry import trace
+    from opentelemetry import metrics, trace
+    from opentelemetry.trace import Status, StatusCode
 
     _tracer: trace.Tracer | None = trace.get_tracer("elasticsearch-api")
 except ImportError:
@@ -41,6 +45,136 @@ ENABLED_ENV_VAR = "OTEL_PYTHON_INSTRUMENTATION_ELASTICSEARCH_ENABLED"
 # Default is 'omit' as 'raw' has security implications.
 BODY_STRATEGY_ENV_VAR = "OTEL_PYTHON_INSTRUMENTATION_ELASTICSEARCH_CAPTURE_SEARCH_QUERY"
 DEFAULT_BODY_STRATEGY = "omit"
+# Valid values for the metrics config are 'true' and 'false'. Default is 'false'.
+METRICS_ENABLED_ENV_VAR = "OTEL_PYTHON_INSTRUMENTATION_ELASTICSEARCH_METRICS_ENABLED"
+# Ratio of the requests which are traced, decided before the span is created.
+# Valid values are between '0' and '1'. Default is '1'.
+SAMPLE_RATE_ENV_VAR = "OTEL_PYTHON_INSTRUMENTATION_ELASTICSEARCH_SAMPLE_RATE"
+# Ratio of the chunks of a helper, e.g. bulk requests or scroll pages, which are
+# traced with their own span. Valid values are between '0' and '1'. Default is '1'.
+CHUNK_SAMPLING_ENV_VAR = (
+    "OTEL_PYTHON_INSTRUMENTATION_ELASTICSEARCH_HELPERS_CHUNK_SAMPLING_RATE"
+)
+
+
+def _rate_from_env(name: str) -> float:
+    value = os.environ.get(name, "1")
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = -1.0
+    if not 0 <= rate <= 1:
+        raise ValueError(
+            f"The {name} environment variable must be a number "
+            f"between 0 and 1, got {value!r}"
+        )
+    return rate
+
+
+# The sampling rates are read once instead of by every client.
+_SAMPLE_RATE = _rate_from_env(SAMPLE_RATE_ENV_VAR)
+_CHUNK_SAMPLING_RATE = _rate_from_env(CHUNK_SAMPLING_ENV_VAR)
+
+# Attributes of the helper span computed from the totals of its chunks
+_THROUGHPUT_ATTRIBUTES = {
+    "db.elasticsearch.bulk.docs": "db.elasticsearch.bulk.docs_per_second",
+    "db.elasticsearch.bulk.bytes": "db.elasticsearch.bulk.bytes_per_second",
+    "db.elasticsearch.scroll.hits": "db.elasticsearch.scroll.hits_per_second",
+}
+
+
+class OpenTelemetryMetrics:
+    """Instruments of the metrics emitted by the client"""
+
+    def __init__(self, meter: metrics.Meter):
+        self.request_duration = meter.create_histogram(
+            "db.client.operation.duration",
+            unit="s",
+            description="Duration of Elasticsearch requests, including retries.",
+        )
+        self.active_requests = meter.create_up_down_counter(
+            "elasticsearch.client.active_requests",
+            unit="{request}",
+            description="Number of Elasticsearch requests in flight.",
+        )
+        self.bulk_docs_indexed = meter.create_counter(
+            "elasticsearch.client.bulk.docs.indexed",
+            unit="{document}",
+            description="Documents successfully indexed by the bulk helpers.",
+        )
+        self.bulk_docs_failed = meter.create_counter(
+            "elasticsearch.client.bulk.docs.failed",
+            unit="{document}",
+            description="Documents which failed to be indexed by the bulk helpers.",
+        )
+        self.bulk_docs_retried = meter.create_counter(
+            "elasticsearch.client.bulk.docs.retried",
+            unit="{document}",
+            description="Documents retried by the bulk helpers.",
+        )
+
+    def request_started(self, endpoint_id: str | None) -> float:
+        self.active_requests.add(1, _operation_attributes(endpoint_id))
+        return time.perf_counter()
+
+    def request_finished(
+        self, endpoint_id: str | None, start: float, error_type: str | None
+    ) -> None:
+        attributes = _operation_attributes(endpoint_id)
+        self.active_requests.add(-1, attributes)
+        if error_type is not None:
+            attributes = {**attributes, "error.type": error_type}
+        self.request_duration.record(time.perf_counter() - start, attributes)
+
+    def bulk_results(
+        self, helper: str, indexed: int, failed: int, retried: int
+    ) -> None:
+        attributes = _operation_attributes(helper)
+        if indexed:
+            self.bulk_docs_indexed.add(indexed, attributes)
+        if failed:
+            self.bulk_docs_failed.add(failed, attributes)
+        if retried:
+            self.bulk_docs_retried.add(retried, attributes)
+
+
+def _operation_attributes(endpoint_id: str | None) -> dict[str, str]:
+    if endpoint_id is None:
+        return {"db.system": "elasticsearch"}
+    return {"db.system": "elasticsearch", "db.operation": endpoint_id}
+
+
+# Instruments are shared by all clients, they're only created
+# once metrics are enabled to not cost anything otherwise.
+_metrics: OpenTelemetryMetrics | None = None
+
+
+def _get_metrics() -> OpenTelemetryMetrics:
+    global _metrics
+    if _metrics is None:
+        _metrics = OpenTelemetryMetrics(metrics.get_meter("elasticsearch-api"))
+    return _metrics
+
+
+# Span of requests which aren't traced, its methods don't do anything.
+DISABLED_SPAN = OpenTelemetrySpan(None)
+
+
+class OpenTelemetryHelperSpan(OpenTelemetrySpan):
+    """Span of a helper or of one chunk of a helper which sums numeric
+    attributes, e.g. the number of documents, until the span ends.
+    Totals can be added from several threads, e.g. by ``parallel_bulk``.
+    """
+
+    def __init__(self, otel_span: trace.Span | None):
+        super().__init__(otel_span)
+        self.totals: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, value: float) -> None:
+        if self.otel_span is not None:
+            with self._lock:
+                self.totals[key] = self.totals.get(key, 0) + value
 
 
 class OpenTelemetry:
@@ -50,12 +184,41 @@ class OpenTelemetry:
         tracer: trace.Tracer | None = None,
         # TODO import Literal at the top-level when dropping Python 3.7
         body_strategy: 'Literal["omit", "raw"]' | None = None,
+        metrics_enabled: bool | None = None,
+        meter: metrics.Meter | None = None,
+        chunk_sampling_rate: float | None = None,
+        sample_rate: float | None = None,
     ):
         if enabled is None:
             enabled = os.environ.get(ENABLED_ENV_VAR, "true") == "true"
         self.tracer = tracer or _tracer
         self.enabled = enabled and self.tracer is not None
 
+        # Metrics are None unless enabled so the client only
+        # needs to check for None before recording metrics.
+        self.metrics: OpenTelemetryMetrics | None = None
+        if metrics_enabled is None:
+            metrics_enabled = os.environ.get(METRICS_ENABLED_ENV_VAR, "false") == "true"
+        if metrics_enabled and enabled and _tracer is not None:
+            self.metrics = (
+                OpenTelemetryMetrics(meter) if meter is not None else _get_metrics()
+            )
+
+        if sample_rate is None:
+            sample_rate = _SAMPLE_RATE
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("'sample_rate' must be between 0 and 1")
+        self.sample_rate = sample_rate
+
+        if chunk_sampling_rate is None:
+            chunk_sampling_rate = _CHUNK_SAMPLING_RATE
+        if not 0 <= chunk_sampling_rate <= 1:
+            raise ValueError("'chunk_sampling_rate' must be between 0 and 1")
+        # Every n-th chunk is traced, spreading the spans evenly over long runs.
+        self.chunk_sampling_interval = (
+            round(1 / chunk_sampling_rate) if chunk_sampling_rate else 0
+        )
+
         if body_strategy is not None:
             self.body_strategy = body_strategy
         else:
@@ -64,6 +227,14 @@ class OpenTelemetry:
             )  # type: ignore[assignment]
             assert self.body_strategy in ("omit", "raw")
 
+    def sampled(self) -> bool:
+        """Returns whether a request is traced. Called before
+        the span and its attributes are created.
+        """
+        return self.enabled and (
+            self.sample_rate >= 1 or random.random() < self.sample_rate
+        )
+
     @contextlib.contextmanager
     def span(
         self,
@@ -73,11 +244,16 @@ class OpenTelemetry:
         path_parts: Mapping[str, str],
     ) -> Generator[OpenTelemetrySpan, None, None]:
         if not self.enabled or self.tracer is None:
-            yield OpenTelemetrySpan(None)
+            yield DISABLED_SPAN
             return
 
         span_name = endpoint_id or method
         with self.tracer.start_as_current_span(span_name) as otel_span:
+            # Spans dropped by the tracer's sampler don't need attributes
+            if not otel_span.is_recording():
+                yield DISABLED_SPAN
+                return
+
             otel_span.set_attribute("http.request.method", method)
             otel_span.set_attribute("db.system", "elasticsearch")
             if endpoint_id is not None:
@@ -92,9 +268,11 @@ class OpenTelemetry:
             )
 
     @contextlib.contextmanager
-    def helpers_span(self, span_name: str) -> Generator[OpenTelemetrySpan, None, None]:
+    def helpers_span(
+        self, span_name: str
+    ) -> Generator[OpenTelemetryHelperSpan, None, None]:
         if not self.enabled or self.tracer is None:
-            yield OpenTelemetrySpan(None)
+            yield OpenTelemetryHelperSpan(None)
             return
 
         with self.tracer.start_as_current_span(span_name) as otel_span:
@@ -102,7 +280,64 @@ class OpenTelemetry:
             otel_span.set_attribute("db.operation", span_name)
             # Without a request method, Elastic APM does not display the traces
             otel_span.set_attribute("http.request.method", "null")
-            yield OpenTelemetrySpan(otel_span)
+            span = OpenTelemetryHelperSpan(otel_span)
+            start = time.perf_counter()
+            try:
+                yield span
+            finally:
+                duration = time.perf_counter() - start
+                for key, value in span.totals.items():
+                    otel_span.set_attribute(key, value)
+                    if key in _THROUGHPUT_ATTRIBUTES and duration > 0:
+                        otel_span.set_attribute(
+                            _THROUGHPUT_ATTRIBUTES[key], value / duration
+                        )
+
+    @contextlib.contextmanager
+    def chunk_span(
+        self, parent: OpenTelemetryHelperSpan, span_name: str, index: int
+    ) -> Generator[OpenTelemetryHelperSpan, None, None]:
+        """Traces one chunk of a helper, e.g. a bulk request with its retries,
+        as a child of the helper span. The totals of the chunk are added to
+        the helper span whether the chunk is sampled or not.
+        """
+        if parent.otel_span is None or self.tracer is None:
+            yield parent
+            return
+
+        if (
+            not self.chunk_sampling_interval
+            or index % self.chunk_sampling_interval != 0
+        ):
+            # Requests of unsampled chunks are children of the helper span
+            span = OpenTelemetryHelperSpan(parent.otel_span)
+            try:
+                yield span
+            finally:
+                for key, value in span.totals.items():
+                    parent.add(key, value)
+            return
+
+        # The span isn't made current as the helpers yield while it's open.
+        otel_span = self.tracer.start_span(
+            span_name, context=trace.set_span_in_context(parent.otel_span)
+        )
+        otel_span.set_attribute("db.system", "elasticsearch")
+        otel_span.set_attribute("db.operation", span_name)
+        otel_span.set_attribute("http.request.method", "null")
+        otel_span.set_attribute("db.elasticsearch.helpers.chunk", index)
+        span = OpenTelemetryHelperSpan(otel_span)
+        try:
+            yield span
+        except Exception as e:
+            otel_span.record_exception(e)
+            otel_span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            for key, value in span.totals.items():
+                otel_span.set_attribute(key, value)
+                parent.add(key, value)
+            otel_span.end()
 
     @contextlib.contextmanager
     def use_span(self, span: OpenTelemetrySpan) -> Generator[None, None, None]:
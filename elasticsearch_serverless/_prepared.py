@@ -0,0 +1,251 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import re
+import uuid
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from elastic_transport import Serializer
+
+from ._utils import SKIP_IN_PATH, _quote
+
+__all__ = ["Param", "PreparedRequest"]
+
+_T = TypeVar("_T")
+
+
+class Param:
+    """Named substitution slot within a prepared request.
+
+    ``Param`` instances can be used in place of any value of a body
+    template, as a query parameter value or as the ``index`` of a
+    prepared request. Values are given by name when the prepared
+    request is performed:
+
+    .. code-block:: python
+
+        prepared = client.prepare_search(
+            index="books",
+            body_template={"query": {"match": {"title": Param("title")}}},
+        )
+        client.perform_prepared(prepared, title="python")
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        if not name or not isinstance(name, str):
+            raise ValueError("'name' must be a non-empty string")
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
+
+
+class PreparedRequest:
+    """A request whose target, headers and body are serialized once
+    so that only the values of its :class:`Param` slots need to be
+    serialized each time the request is performed.
+
+    Instances are created by the ``prepare_*()`` methods of the client
+    and performed with ``perform_prepared()``.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        path: Sequence[Union[str, Param]],
+        *,
+        endpoint_id: str,
+        serializer: Serializer,
+        headers: Mapping[str, str],
+        params: Optional[Mapping[str, Any]] = None,
+        body: Optional[Any] = None,
+        ndjson: bool = False,
+        path_parts: Optional[Mapping[str, Union[str, Param]]] = None,
+    ) -> None:
+        self.method = method
+        self.endpoint_id = endpoint_id
+        self.headers = dict(headers)
+        self._serializer = serializer
+        self._path_parts = dict(path_parts or {})
+
+        # Compiled templates are kept as the literal fragments and the
+        # names of the slots spliced in between each pair of fragments.
+        self._target, self._target_slots = _compile_target(path)
+        # Static query parameters are quoted once, 'Param' query
+        # parameters are kept in place to be quoted per request.
+        self._query: List[Tuple[str, Union[str, Param]]] = [
+            (key, value if isinstance(value, Param) else _quote(value))
+            for key, value in (params or {}).items()
+            if value is not None
+        ]
+        self._body: Optional[Tuple[List[bytes], List[str]]] = None
+        if body is not None:
+            self._body = _compile_body(body, serializer, ndjson=ndjson)
+
+        self.slots: FrozenSet[str] = frozenset(self._target_slots).union(
+            [value.name for _, value in self._query if isinstance(value, Param)],
+            self._body[1] if self._body is not None else (),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__}({self.method} {self.endpoint_id}, "
+            f"slots={sorted(self.slots)})>"
+        )
+
+    def render(
+        self, values: Mapping[str, Any]
+    ) -> Tuple[str, Dict[str, Any], Optional[bytes]]:
+        """Splices ``values`` into the slots of the request and returns
+        the request target, path parts and serialized body.
+        """
+        missing = self.slots.difference(values)
+        if missing:
+            raise TypeError(
+                f"Missing values for prepared request parameters: {', '.join(sorted(missing))}"
+            )
+        unknown = set(values).difference(self.slots)
+        if unknown:
+            raise TypeError(
+                f"Unknown prepared request parameters: {', '.join(sorted(unknown))}"
+            )
+
+        target = "".join(
+            _splice(
+                self._target,
+                [
+                    _quote(_path_value(name, values[name]))
+                    for name in self._target_slots
+                ],
+            )
+        )
+        # Query parameters given a value of None are omitted, like
+        # the query parameters of the regular API methods.
+        query = []
+        for key, value in self._query:
+            if isinstance(value, Param):
+                if values[value.name] is None:
+                    continue
+                value = _quote(values[value.name])
+            query.append(f"{key}={value}")
+        if query:
+            target += "?" + "&".join(query)
+        path_parts = {
+            key: (
+                _quote(_path_value(value.name, values[value.name]))
+                if isinstance(value, Param)
+                else value
+            )
+            for key, value in self._path_parts.items()
+        }
+
+        body: Optional[bytes] = None
+        if self._body is not None:
+            literals, slots = self._body
+            parts: List[bytes] = _splice(
+                literals,
+                [_dumps_value(self._serializer, values[name]) for name in slots],
+            )
+            body = b"".join(parts)
+        return target, path_parts, body
+
+
+def _path_value(name: str, value: Any) -> Any:
+    if value in SKIP_IN_PATH:
+        raise ValueError(
+            f"Empty value passed for path parameter '{name}' of a prepared request"
+        )
+    return value
+
+
+def _splice(literals: List[_T], values: List[_T]) -> List[_T]:
+    parts = [literals[0]]
+    for value, literal in zip(values, literals[1:]):
+        parts.extend((value, literal))
+    return parts
+
+
+def _compile_target(
+    target: Iterable[Union[str, Param]],
+) -> Tuple[List[str], List[str]]:
+    literals = [""]
+    slots = []
+    for part in target:
+        if isinstance(part, Param):
+            slots.append(part.name)
+            literals.append("")
+        else:
+            literals[-1] += part
+    return literals, slots
+
+
+def _compile_body(
+    body: Any, serializer: Serializer, ndjson: bool
+) -> Tuple[List[bytes], List[str]]:
+    # Every 'Param' is replaced by a unique marker string before the body
+    # is serialized and the serialized markers are then split back out.
+    markers: Dict[str, str] = {}
+    prefix = f"__prepared_{uuid.uuid4().hex}_"
+
+    def substitute(value: Any) -> Any:
+        if isinstance(value, Param):
+            marker = f"{prefix}{len(markers)}__"
+            markers[marker] = value.name
+            return marker
+        elif isinstance(value, Mapping):
+            return {key: substitute(item) for key, item in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return [substitute(item) for item in value]
+        return value
+
+    raw: bytes
+    if ndjson:
+        if isinstance(body, (str, bytes)):
+            raise ValueError("The body template of NDJSON requests must be a sequence")
+        raw = b"".join(
+            [serializer.dumps(substitute(line)).rstrip(b"\n") + b"\n" for line in body]
+        )
+    else:
+        raw = serializer.dumps(substitute(body))
+
+    if not markers:
+        return [raw], []
+    pattern = re.compile(
+        b'"(' + b"|".join(re.escape(marker.encode()) for marker in markers) + b')"'
+    )
+    fragments = pattern.split(raw)
+    return fragments[::2], [markers[marker.decode()] for marker in fragments[1::2]]
+
+
+def _dumps_value(serializer: Serializer, value: Any) -> bytes:
+    # Wrap the value in a list so strings and bytes are encoded as
+    # JSON values instead of being treated as a pre-serialized body.
+    return serializer.dumps([value])[1:-1]
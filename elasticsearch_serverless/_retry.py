@@ -0,0 +1,304 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    Mapping,
+    Optional,
+    Union,
+)
+
+from elastic_transport import (
+    ConnectionError,
+    ConnectionTimeout,
+    TlsError,
+    TransportApiResponse,
+)
+
+__all__ = ["RetryPolicy"]
+
+# Called with the response or error of an attempt before it's retried.
+_RetryCallback = Callable[[Union[TransportApiResponse, Exception]], None]
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses the value of a ``Retry-After`` header which is either
+    a number of seconds or an HTTP date into a number of seconds.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RetryBudget:
+    """Token bucket where every request adds ``ratio`` of a token
+    and every retry takes one token.
+    """
+
+    def __init__(self, ratio: Optional[float], burst: float) -> None:
+        self.ratio = ratio
+        self.max_tokens = burst
+        self.tokens = burst
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        if self.ratio is None:
+            return
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.ratio is None:
+            return True
+        with self._lock:
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
+
+
+class RetryPolicy:
+    """Retries requests which failed with a connection error or a retryable
+    status code, waiting between attempts with decorrelated jitter so that
+    clients rejected at the same time don't retry at the same time.
+
+    Each wait is a random duration between ``initial_backoff`` and three times
+    the previous wait, capped at ``max_backoff``. When the response has a
+    ``Retry-After`` header the client waits at least that long, up to
+    ``max_retry_after`` seconds.
+
+    Retries are limited by a budget shared by all requests using the policy:
+    every request adds ``budget_ratio`` of a token to the budget and every
+    retry takes one token, so with ``budget_ratio=0.1`` at most 10% of requests
+    are retried once the initial ``budget_burst`` tokens are spent. This
+    prevents retries from multiplying traffic while the service is overloaded.
+
+    .. code-block:: python
+
+        client = Elasticsearch(
+            ...,
+            retry_policy=RetryPolicy(
+                max_retries=3,
+                endpoint_overrides={"search": {"max_retries": 1}},
+            ),
+        )
+
+    :arg max_retries: Maximum number of times a request is retried.
+    :arg retry_on_status: HTTP status codes which are retried.
+    :arg retry_on_timeout: Whether requests which timed out are retried.
+    :arg initial_backoff: Minimum number of seconds to wait before a retry.
+    :arg max_backoff: Maximum number of seconds to wait before a retry
+        unless the server requested a longer wait with ``Retry-After``.
+    :arg max_retry_after: Maximum number of seconds to wait for a
+        ``Retry-After`` header.
+    :arg budget_ratio: Ratio of requests which can be retried. Set to
+        ``None`` to retry without a budget.
+    :arg budget_burst: Maximum number of tokens in the budget, which
+        is also the number of retries allowed before any request was sent.
+    :arg endpoint_overrides: Mapping of endpoint IDs to the parameters of
+        this policy which are different for the endpoint. All endpoints
+        share the budget of this policy.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 3,
+        retry_on_status: Collection[int] = (429, 502, 503, 504),
+        retry_on_timeout: bool = False,
+        initial_backoff: float = 0.1,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 60.0,
+        budget_ratio: Optional[float] = 0.1,
+        budget_burst: float = 10.0,
+        endpoint_overrides: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        _budget: Optional[_RetryBudget] = None,
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError("'max_retries' must be greater than or equal to 0")
+        if not 0 < initial_backoff <= max_backoff:
+            raise ValueError(
+                "Backoffs must satisfy 0 < 'initial_backoff' <= 'max_backoff'"
+            )
+        if budget_ratio is not None and not 0 < budget_ratio <= 1:
+            raise ValueError("'budget_ratio' must be between 0 and 1")
+
+        self.max_retries = max_retries
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_on_timeout = retry_on_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self._budget = _budget or _RetryBudget(budget_ratio, budget_burst)
+
+        self._endpoint_policies: Dict[str, RetryPolicy] = {}
+        if endpoint_overrides:
+            defaults = {
+                "max_retries": max_retries,
+                "retry_on_status": retry_on_status,
+                "retry_on_timeout": retry_on_timeout,
+                "initial_backoff": initial_backoff,
+                "max_backoff": max_backoff,
+                "max_retry_after": max_retry_after,
+            }
+            for endpoint_id, overrides in endpoint_overrides.items():
+                self._endpoint_policies[endpoint_id] = RetryPolicy(
+                    **{**defaults, **overrides}, _budget=self._budget
+                )
+
+    def for_endpoint(self, endpoint_id: Optional[str]) -> "RetryPolicy":
+        """Returns the policy to use for requests to the endpoint"""
+        if endpoint_id is None:
+            return self
+        return self._endpoint_policies.get(endpoint_id, self)
+
+    def record_request(self) -> None:
+        """Adds the share of one request to the retry budget. Called once
+        per request before its first attempt, e.g. by the bulk helpers
+        for each chunk.
+        """
+        self._budget.deposit()
+
+    def acquire_retry(self) -> bool:
+        """Takes the token of one retry from the retry budget and returns
+        ``False``, without taking anything, when the budget is spent. The
+        request must only be retried if this returned ``True``, so calling
+        it is the decision to retry.
+        """
+        return self._budget.withdraw()
+
+    def backoff(self, previous: Optional[float], retry_after: Optional[float]) -> float:
+        """Returns the number of seconds to wait before the next retry
+        given the previous wait and the ``Retry-After`` of the response.
+        """
+        backoff = min(
+            self.max_backoff,
+            random.uniform(
+                self.initial_backoff, (previous or self.initial_backoff) * 3
+            ),
+        )
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+    def _retry_delay(
+        self, attempt: int, previous: Optional[float], retry_after: Optional[float]
+    ) -> Optional[float]:
+        """Returns the number of seconds to wait before retrying after the
+        given attempt or ``None`` if the request shouldn't be retried.
+        """
+        if attempt >= self.max_retries or not self.acquire_retry():
+            return None
+        return self.backoff(previous, retry_after)
+
+    def _is_retryable_error(self, error: Exception) -> bool:
+        if isinstance(error, ConnectionTimeout):
+            return self.retry_on_timeout
+        return isinstance(error, ConnectionError) and not isinstance(error, TlsError)
+
+
+def _retry(
+    policy: RetryPolicy,
+    endpoint_id: Optional[str],
+    perform: Callable[[], TransportApiResponse],
+    on_retry: Optional[_RetryCallback] = None,
+) -> TransportApiResponse:
+    policy = policy.for_endpoint(endpoint_id)
+    policy.record_request()
+    attempt = 0
+    backoff: Optional[float] = None
+    while True:
+        outcome: Union[TransportApiResponse, Exception]
+        try:
+            outcome = response = perform()
+        except (ConnectionError, ConnectionTimeout) as e:
+            if not policy._is_retryable_error(e):
+                raise
+            backoff = policy._retry_delay(attempt, backoff, None)
+            if backoff is None:
+                raise
+            outcome = e
+        else:
+            meta = response[0]
+            if meta.status not in policy.retry_on_status:
+                return response
+            backoff = policy._retry_delay(
+                attempt, backoff, _parse_retry_after(meta.headers.get("retry-after"))
+            )
+            if backoff is None:
+                return response
+        attempt += 1
+        if on_retry is not None:
+            on_retry(outcome)
+        time.sleep(backoff)
+
+
+async def _async_retry(
+    policy: RetryPolicy,
+    endpoint_id: Optional[str],
+    perform: Callable[[], Awaitable[TransportApiResponse]],
+    on_retry: Optional[_RetryCallback] = None,
+) -> TransportApiResponse:
+    policy = policy.for_endpoint(endpoint_id)
+    policy.record_request()
+    attempt = 0
+    backoff: Optional[float] = None
+    while True:
+        outcome: Union[TransportApiResponse, Exception]
+        try:
+            outcome = response = await perform()
+        except (ConnectionError, ConnectionTimeout) as e:
+            if not policy._is_retryable_error(e):
+                raise
+            backoff = policy._retry_delay(attempt, backoff, None)
+            if backoff is None:
+                raise
+            outcome = e
+        else:
+            meta = response[0]
+            if meta.status not in policy.retry_on_status:
+                return response
+            backoff = policy._retry_delay(
+                attempt, backoff, _parse_retry_after(meta.headers.get("retry-after"))
+            )
+            if backoff is None:
+                return response
+        attempt += 1
+        if on_retry is not None:
+            on_retry(outcome)
+        await asyncio.sleep(backoff)
@@ -0,0 +1,255 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Union
+
+from elastic_transport import ApiResponse
+
+from ._hooks import RequestContext, RequestHooks
+
+if TYPE_CHECKING:
+    from typing import Literal
+
+__all__ = ["SlowRequestLog"]
+
+# Describes how request bodies are captured in the slow request log.
+# Valid values are 'omit', 'redact' and 'raw'.
+# Default is 'omit' as 'raw' has security implications.
+BODY_STRATEGY_ENV_VAR = "ELASTICSEARCH_SLOW_REQUEST_LOG_BODY_STRATEGY"
+DEFAULT_BODY_STRATEGY = "omit"
+
+# Value of the leaves of redacted bodies
+_REDACTED = "?"
+
+
+class SlowRequestLog:
+    """Logs requests which took longer than a threshold from the client's
+    point of view, including the time spent waiting for a connection, in
+    retries and in the client's request policies. These often differ from
+    the server's slowlogs which only see the time spent in Elasticsearch.
+
+    Every slow request is logged with a ``WARNING`` record with the method,
+    path, endpoint ID, body sizes, status, number of retries, the
+    :class:`~elasticsearch_serverless.RequestTimings` and a sample of the
+    request body. The same details are attached to the record as the
+    ``elasticsearch_slow_request`` attribute for structured log handlers.
+
+    The log is installed on :class:`~elasticsearch_serverless.RequestHooks`:
+
+    .. code-block:: python
+
+        hooks = RequestHooks()
+        SlowRequestLog(threshold=0.5, endpoint_thresholds={"bulk": 5}).register(hooks)
+        client = Elasticsearch(..., hooks=hooks)
+
+    :arg threshold: Number of seconds after which a request is slow.
+    :arg endpoint_thresholds: Thresholds of specific endpoint IDs, e.g. ``bulk``.
+    :arg body_strategy: How request bodies are captured, ``omit`` doesn't log
+        bodies, ``redact`` replaces every value in JSON bodies with ``"?"``
+        and keeps their structure, ``raw`` logs bodies as sent. Defaults to the
+        ``ELASTICSEARCH_SLOW_REQUEST_LOG_BODY_STRATEGY`` environment variable
+        or ``omit``.
+    :arg max_body_size: Number of characters of the body sample after which
+        it's truncated.
+    :arg max_logs_per_second: Maximum rate of slow request log records.
+        Slow requests above the rate are counted and the count is logged
+        with the next record.
+    :arg logger: Logger of the records, ``elasticsearch.slow_requests`` by default.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 1.0,
+        endpoint_thresholds: Optional[Mapping[str, float]] = None,
+        body_strategy: 'Optional[Literal["omit", "redact", "raw"]]' = None,
+        max_body_size: int = 1024,
+        max_logs_per_second: float = 10.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if max_logs_per_second <= 0:
+            raise ValueError("'max_logs_per_second' must be greater than 0")
+        if body_strategy is None:
+            body_strategy = os.environ.get(  # type: ignore[assignment]
+                BODY_STRATEGY_ENV_VAR, DEFAULT_BODY_STRATEGY
+            )
+        if body_strategy not in ("omit", "redact", "raw"):
+            raise ValueError("'body_strategy' must be one of 'omit', 'redact', 'raw'")
+
+        self.threshold = threshold
+        self.endpoint_thresholds = dict(endpoint_thresholds or {})
+        self.body_strategy = body_strategy
+        self.max_body_size = max_body_size
+        self.max_logs_per_second = max_logs_per_second
+        self.logger = logger or logging.getLogger("elasticsearch.slow_requests")
+
+        # Token bucket of log records, refilled at 'max_logs_per_second'
+        self._tokens = max_logs_per_second
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        #: Number of slow requests which weren't logged because of the rate limit.
+        self.suppressed = 0
+
+    def register(self, hooks: RequestHooks) -> None:
+        """Logs the slow requests of clients using ``hooks``"""
+        hooks.register("after_response", self._after_response)
+        hooks.register("on_error", self._on_error)
+
+    def _after_response(
+        self, context: RequestContext, response: ApiResponse[Any]
+    ) -> None:
+        if context.duration >= self.endpoint_thresholds.get(
+            context.endpoint_id or "", self.threshold
+        ):
+            self._log(context, None)
+
+    def _on_error(self, context: RequestContext, error: BaseException) -> None:
+        if context.duration >= self.endpoint_thresholds.get(
+            context.endpoint_id or "", self.threshold
+        ):
+            self._log(context, error)
+
+    def _acquire(self) -> Optional[int]:
+        """Returns the number of suppressed records since the
+        last record, or 'None' if the record is rate limited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.max_logs_per_second,
+                self._tokens + (now - self._refilled_at) * self.max_logs_per_second,
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                return None
+            self._tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+            return suppressed
+
+    def _log(self, context: RequestContext, error: Optional[BaseException]) -> None:
+        suppressed = self._acquire()
+        if suppressed is None:
+            return
+
+        details: Dict[str, Any] = {
+            "method": context.method,
+            "path": context.path,
+            "endpoint_id": context.endpoint_id,
+            "status": context.status,
+            "duration": context.duration,
+            "retries": context.retries,
+            "request_bytes": context.request_bytes,
+            "response_bytes": context.response_bytes,
+        }
+        if error is not None and context.status is None:
+            details["error"] = type(error).__qualname__
+        timings = context.timings
+        if timings is not None:
+            details.update(
+                serialize=timings.serialize,
+                transport=timings.transport,
+                deserialize=timings.deserialize,
+                server=timings.server,
+            )
+        if self.body_strategy != "omit" and context.body is not None:
+            details["body"] = self._sample(context.body)
+
+        message = "Slow request %s %s [%s]"
+        args: List[Any] = [
+            context.method,
+            context.path,
+            " ".join(
+                f"{key}:{value:.3f}s" if isinstance(value, float) else f"{key}:{value}"
+                for key, value in details.items()
+                if key not in ("method", "path", "body")
+            ),
+        ]
+        if "body" in details:
+            message += " body=%s"
+            args.append(details["body"])
+        if suppressed:
+            message += " (%d slow requests not logged)"
+            args.append(suppressed)
+        self.logger.warning(
+            message, *args, extra={"elasticsearch_slow_request": details}
+        )
+
+    def _sample(self, body: Any) -> str:
+        # Bodies of slow requests, e.g. bulk requests, can be large
+        # so only the lines of the sample are decoded and redacted.
+        if not isinstance(body, (bytes, bytearray, str)):
+            body = repr(body)
+        if self.body_strategy == "redact":
+            lines = []
+            size = 0
+            truncated = False
+            for line in _lines(body):
+                if size > self.max_body_size:
+                    truncated = True
+                    break
+                redacted = _redact_line(line)
+                lines.append(redacted)
+                size += len(redacted) + 1
+            sample = "\n".join(lines)
+            truncated = truncated or len(sample) > self.max_body_size
+        else:
+            truncated = len(body) > self.max_body_size
+            body = body[: self.max_body_size]
+            if isinstance(body, str):
+                sample = body
+            else:
+                sample = body.decode("utf-8", "replace")
+        if truncated:
+            sample = sample[: self.max_body_size] + "..."
+        return sample
+
+
+def _lines(
+    body: Union[bytes, bytearray, str]
+) -> Iterator[Union[bytes, bytearray, str]]:
+    """Yields the lines of a body without splitting the whole body"""
+    newline: Any = "\n" if isinstance(body, str) else b"\n"
+    start = 0
+    while start < len(body):
+        end = body.find(newline, start)
+        if end == -1:
+            end = len(body)
+        yield body[start:end]
+        start = end + 1
+
+
+def _redact_line(line: Union[bytes, bytearray, str]) -> str:
+    try:
+        value = json.loads(line)
+    except ValueError:
+        return _REDACTED
+    return json.dumps(_redact(value), separators=(",", ":"))
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _redact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return _REDACTED
@@ -0,0 +1,322 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import json
+import re
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .exceptions import SerializationError
+
+__all__ = ["StreamedArray"]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+# Returned by '_StreamingParser._next_item()' at the end of the array
+_END = object()
+
+
+class StreamedArray:
+    """Array of a JSON response, e.g. ``hits.hits``, which is decoded one
+    item at a time while it's iterated instead of all at once. Items aren't
+    kept so only the iterated item is held in memory, and the array can
+    only be iterated once.
+
+    Accessing the members of the response which follow the array, e.g.
+    ``aggregations`` after ``hits``, decodes the rest of the array first.
+    The decoded items are then kept for the iteration, as are all items if
+    ``len()`` or indexing is used before iterating.
+    """
+
+    __slots__ = ("_parser", "_items", "_rest", "_iterated", "_empty")
+
+    def __init__(self, parser: "_StreamingParser") -> None:
+        self._parser: Optional[_StreamingParser] = parser
+        # All items, once decoded before the array was iterated
+        self._items: Optional[List[Any]] = None
+        # Items left to iterate, once decoded while the array was iterated
+        self._rest: Optional[List[Any]] = None
+        self._iterated = False
+        parser._skip_whitespace()
+        self._empty = parser.text.startswith("]", parser.pos)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._items is not None:
+            return iter(self._items)
+        if self._iterated:
+            raise RuntimeError("A streamed array can only be iterated once")
+        self._iterated = True
+        return self._stream()
+
+    def __bool__(self) -> bool:
+        if self._items is not None:
+            return bool(self._items)
+        return not self._empty
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._materialize()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StreamedArray):
+            other = other._materialize()
+        return self._materialize() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        if self._items is not None:
+            return repr(self._items)
+        return "<StreamedArray>"
+
+    def _stream(self) -> Iterator[Any]:
+        while self._parser is not None:
+            item = self._parser._next_item()
+            if item is _END:
+                parser, self._parser = self._parser, None
+                parser._finish()
+                return
+            yield item
+            if self._rest is not None:
+                break
+        # The response was decoded while the array was being iterated
+        rest, self._rest = self._rest or [], None
+        yield from rest
+
+    def _drain(self) -> None:
+        assert self._parser is not None
+        items = []
+        while True:
+            item = self._parser._next_item()
+            if item is _END:
+                break
+            items.append(item)
+        if self._iterated:
+            self._rest = items
+        else:
+            self._items = items
+        self._parser = None
+
+    def _materialize(self) -> List[Any]:
+        if self._items is None:
+            if self._iterated:
+                raise TypeError(
+                    "The items of a streamed array aren't kept once it's iterated"
+                )
+            assert self._parser is not None
+            self._parser._finish()
+        assert self._items is not None
+        return self._items
+
+
+class _StreamedObject(Dict[str, Any]):
+    """Object on the path to a streamed array. Its members which
+    follow the array are decoded when they're first accessed.
+    """
+
+    __slots__ = ("_parser",)
+
+    def __init__(self, parser: "_StreamingParser") -> None:
+        super().__init__()
+        self._parser: Optional[_StreamingParser] = parser
+
+    def _complete(self) -> None:
+        parser = self._parser
+        if parser is not None:
+            parser._finish()
+
+    def __missing__(self, key: str) -> Any:
+        self._complete()
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            self._complete()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if not dict.__contains__(self, key):
+            self._complete()
+        return dict.__contains__(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._complete()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self._complete()
+        return dict.__len__(self)
+
+    def __eq__(self, other: object) -> bool:
+        self._complete()
+        return dict.__eq__(self, other)
+
+    def __repr__(self) -> str:
+        self._complete()
+        return dict.__repr__(self)
+
+    def keys(self) -> Any:
+        self._complete()
+        return dict.keys(self)
+
+    def values(self) -> Any:
+        self._complete()
+        return dict.values(self)
+
+    def items(self) -> Any:
+        self._complete()
+        return dict.items(self)
+
+    def copy(self) -> Dict[str, Any]:
+        self._complete()
+        return dict(dict.items(self))
+
+
+class _StreamingParser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+        # Objects along the path whose members following the array
+        # are left to decode, from the outermost to the innermost.
+        self.pending: List[_StreamedObject] = []
+        self.array: Optional[StreamedArray] = None
+
+    def parse(self, path: Sequence[str]) -> Any:
+        root: Any = None
+        parent: Optional[_StreamedObject] = None
+        parent_key = ""
+        for key in path:
+            self._skip_whitespace()
+            if not self.text.startswith("{", self.pos):
+                break
+            self.pos += 1
+            obj = _StreamedObject(self)
+            if parent is None:
+                root = obj
+            else:
+                dict.__setitem__(parent, parent_key, obj)
+            self.pending.append(obj)
+            while True:
+                name = self._next_key()
+                if name is None or name == key:
+                    break
+                dict.__setitem__(obj, name, self._value())
+            if name is None:
+                # The object doesn't have the key of the path
+                self.pending.pop()._parser = None
+                self._finish()
+                return root
+            parent, parent_key = obj, key
+        else:
+            self._skip_whitespace()
+            if self.text.startswith("[", self.pos):
+                self.pos += 1
+                self.array = StreamedArray(self)
+                assert parent is not None
+                dict.__setitem__(parent, parent_key, self.array)
+                return root
+
+        # The path leads to a value which isn't an object or an array
+        value = self._value()
+        if parent is None:
+            root = value
+        else:
+            dict.__setitem__(parent, parent_key, value)
+        self._finish()
+        return root
+
+    def _skip_whitespace(self) -> None:
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()  # type: ignore[union-attr]
+
+    def _value(self) -> Any:
+        self._skip_whitespace()
+        value, self.pos = _DECODER.raw_decode(self.text, self.pos)
+        return value
+
+    def _next_key(self) -> Optional[str]:
+        """Returns the key of the next member of an object
+        or 'None' if there isn't any, at the end of the object.
+        """
+        self._skip_whitespace()
+        if self.text.startswith(",", self.pos):
+            self.pos += 1
+            self._skip_whitespace()
+        elif self.text.startswith("}", self.pos):
+            self.pos += 1
+            return None
+        if not self.text.startswith('"', self.pos):
+            raise ValueError(f"Expecting property name at char {self.pos}")
+        key: str
+        key, self.pos = scanstring(self.text, self.pos + 1)
+        self._skip_whitespace()
+        if not self.text.startswith(":", self.pos):
+            raise ValueError(f"Expecting ':' delimiter at char {self.pos}")
+        self.pos += 1
+        return key
+
+    def _next_item(self) -> Any:
+        try:
+            self._skip_whitespace()
+            if self.text.startswith(",", self.pos):
+                self.pos += 1
+            elif self.text.startswith("]", self.pos):
+                self.pos += 1
+                return _END
+            return self._value()
+        except ValueError as e:
+            raise SerializationError(
+                message=f"Unable to deserialize as JSON at char {self.pos}",
+                errors=(e,),
+            )
+
+    def _finish(self) -> None:
+        """Decodes the rest of the response"""
+        if self.array is not None and self.array._parser is not None:
+            self.array._drain()
+        try:
+            while self.pending:
+                obj = self.pending.pop()
+                while True:
+                    name = self._next_key()
+                    if name is None:
+                        break
+                    dict.__setitem__(obj, name, self._value())
+                obj._parser = None
+            self._skip_whitespace()
+            if self.pos != len(self.text):
+                raise ValueError(f"Extra data at char {self.pos}")
+        except ValueError as e:
+            raise SerializationError(
+                message=f"Unable to deserialize as JSON at char {self.pos}",
+                errors=(e,),
+            )
+        self.text = ""
+
+
+def _decode_streaming(data: bytes, path: Sequence[str]) -> Any:
+    """Decodes a JSON response, streaming the array at 'path'.
+    Raises 'ValueError' if the start of the response isn't valid JSON.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        text = bytes(data).decode("utf-8")
+    else:
+        text = data
+    return _StreamingParser(text).parse(path)
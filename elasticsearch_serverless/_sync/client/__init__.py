@@ -21,6 +21,7 @@ import typing as t
 import warnings
 
 from elastic_transport import (
+    ApiResponse,
     BaseNode,
     BinaryApiResponse,
     HeadApiResponse,
@@ -31,9 +32,23 @@ from elastic_transport import (
 )
 from elastic_transport.client_utils import DEFAULT, DefaultType
 
+from ..._circuit_breaker import CircuitBreaker
+from ..._concurrency import AdaptiveConcurrencyLimiter
+from ..._hedging import HedgingPolicy
+from ..._hooks import RequestHooks
+from ..._metrics import MetricsRegistry
+from ..._otel import OpenTelemetry
+from ..._prepared import Param, PreparedRequest
+from ..._retry import RetryPolicy
+from ..._timings import _time_deserialization
 from ...exceptions import ApiError, TransportError
-from ...serializer import DEFAULT_SERIALIZERS
-from ._base import BaseClient, resolve_auth_headers
+from ...serializer import DEFAULT_SERIALIZERS, _auto_serializers
+from ._base import (
+    BaseClient,
+    resolve_auth_headers,
+    resolve_response_format,
+    resolve_stream_path,
+)
 from .async_search import AsyncSearchClient
 from .cat import CatClient
 from .cluster import ClusterClient
@@ -139,17 +154,28 @@ class Elasticsearch(BaseClient):
         node_pool_class: t.Union[DefaultType, t.Type[NodePool]] = DEFAULT,
         dead_node_backoff_factor: t.Union[DefaultType, float] = DEFAULT,
         max_dead_node_backoff: t.Union[DefaultType, float] = DEFAULT,
-        serializer: t.Optional[Serializer] = None,
+        serializer: t.Optional[t.Union[Serializer, t.Literal["auto"]]] = None,
         serializers: t.Union[DefaultType, t.Mapping[str, Serializer]] = DEFAULT,
         default_mimetype: str = "application/json",
+        response_format: t.Optional[t.Literal["json", "cbor", "smile"]] = None,
         max_retries: t.Union[DefaultType, int] = DEFAULT,
         retry_on_status: t.Union[DefaultType, int, t.Collection[int]] = DEFAULT,
         retry_on_timeout: t.Union[DefaultType, bool] = DEFAULT,
         meta_header: t.Union[DefaultType, bool] = DEFAULT,
         timeout: t.Union[DefaultType, None, float] = DEFAULT,
         http_auth: t.Union[DefaultType, t.Any] = DEFAULT,
+        # Request policies
+        hedging_policy: t.Optional[HedgingPolicy] = None,
+        concurrency_limiter: t.Optional[AdaptiveConcurrencyLimiter] = None,
+        retry_policy: t.Optional[RetryPolicy] = None,
+        circuit_breaker: t.Optional[CircuitBreaker] = None,
+        # Observability
+        metrics_registry: t.Optional[MetricsRegistry] = None,
+        request_timings: bool = False,
+        hooks: t.Optional[RequestHooks] = None,
         # Internal use only
         _transport: t.Optional[Transport] = None,
+        _otel: t.Optional[OpenTelemetry] = None,
     ) -> None:
         if host is not None and hosts is not None:
             raise ValueError("Can't specify both 'host' and 'hosts'")
@@ -181,7 +207,14 @@ class Elasticsearch(BaseClient):
                     "Can't specify both 'serializer' and 'serializers' parameters "
                     "together. Instead only specify one of the other."
                 )
-            serializers = {default_mimetype: serializer}
+            if isinstance(serializer, str):
+                if serializer != "auto":
+                    raise ValueError(
+                        "'serializer' must be a Serializer instance or 'auto'"
+                    )
+                serializers = _auto_serializers()
+            else:
+                serializers = {default_mimetype: serializer}
 
         if _transport is None:
             requests_session_auth = None
@@ -253,8 +286,10 @@ class Elasticsearch(BaseClient):
                 client_meta_service=CLIENT_META_SERVICE,
                 **transport_kwargs,
             )
+            if request_timings or metrics_registry is not None or hooks is not None:
+                _time_deserialization(_transport)
 
-            super().__init__(_transport)
+            super().__init__(_transport, _otel)
 
             # These are set per-request so are stored separately.
             self._request_timeout = request_timeout
@@ -263,9 +298,19 @@ class Elasticsearch(BaseClient):
             if isinstance(retry_on_status, int):
                 retry_on_status = (retry_on_status,)
             self._retry_on_status = retry_on_status
+            self._hedging_policy = hedging_policy
+            self._concurrency_limiter = concurrency_limiter
+            self._retry_policy = retry_policy
+            self._circuit_breaker = circuit_breaker
+            self._metrics_registry = metrics_registry
+            self._request_timings = request_timings
+            self._hooks = hooks
+            self._response_mimetype = resolve_response_format(
+                _transport, response_format
+            )
 
         else:
-            super().__init__(_transport)
+            super().__init__(_transport, _otel)
 
         if headers is not DEFAULT and headers is not None:
             self._headers.update(headers)
@@ -339,8 +384,17 @@ class Elasticsearch(BaseClient):
         max_retries: t.Union[DefaultType, int] = DEFAULT,
         retry_on_status: t.Union[DefaultType, int, t.Collection[int]] = DEFAULT,
         retry_on_timeout: t.Union[DefaultType, bool] = DEFAULT,
+        response_format: t.Union[
+            DefaultType, t.Optional[t.Literal["json", "cbor", "smile"]]
+        ] = DEFAULT,
+        source_type: t.Any = DEFAULT,
+        stream_path: t.Union[
+            DefaultType, t.Optional[t.Union[str, t.Sequence[str]]]
+        ] = DEFAULT,
+        lazy_body: t.Union[DefaultType, bool] = DEFAULT,
     ) -> SelfType:
-        client = type(self)(_transport=self.transport)
+        # The instrumentation is shared instead of being created again.
+        client = type(self)(_transport=self.transport, _otel=self._otel)
 
         resolved_headers = headers if headers is not DEFAULT else None
         resolved_headers = resolve_auth_headers(
@@ -393,8 +447,216 @@ class Elasticsearch(BaseClient):
         else:
             client._retry_on_timeout = self._retry_on_timeout
 
+        if response_format is not DEFAULT:
+            client._response_mimetype = resolve_response_format(
+                self.transport, response_format
+            )
+        else:
+            client._response_mimetype = self._response_mimetype
+
+        if source_type is not DEFAULT:
+            if source_type is None:
+                client._response_types = None
+            else:
+                from ...typed import _response_types
+
+                client._response_types = _response_types(source_type)
+        else:
+            client._response_types = self._response_types
+
+        if stream_path is not DEFAULT:
+            client._stream_path = resolve_stream_path(stream_path)
+        else:
+            client._stream_path = self._stream_path
+
+        if lazy_body is not DEFAULT:
+            if not isinstance(lazy_body, bool):
+                raise TypeError("'lazy_body' must be of type 'bool'")
+            client._lazy_body = lazy_body
+        else:
+            client._lazy_body = self._lazy_body
+
+        client._hedging_policy = self._hedging_policy
+        client._concurrency_limiter = self._concurrency_limiter
+        client._retry_policy = self._retry_policy
+        client._circuit_breaker = self._circuit_breaker
+        client._metrics_registry = self._metrics_registry
+        client._request_timings = self._request_timings
+        client._hooks = self._hooks
+
         return client
 
+    def prepare_search(
+        self,
+        *,
+        index: t.Optional[t.Union[str, t.Sequence[str], Param]] = None,
+        body_template: t.Optional[t.Mapping[str, t.Any]] = None,
+        params: t.Optional[t.Mapping[str, t.Any]] = None,
+    ) -> PreparedRequest:
+        """
+        Prepares a search request so that its target and body are serialized
+        once and only the values of its :class:`~elasticsearch_serverless.Param`
+        slots are serialized when it is performed with :meth:`perform_prepared`.
+
+        .. code-block:: python
+
+            prepared = client.prepare_search(
+                index="books",
+                body_template={
+                    "query": {"match": {"title": Param("title")}},
+                    "size": Param("size"),
+                },
+            )
+            resp = client.perform_prepared(prepared, title="python", size=10)
+
+        :param index: Comma-separated list of data streams, indices, and aliases
+            to search, or a ``Param``.
+        :param body_template: Request body where any value may be a ``Param``.
+        :param params: Query parameters where any value may be a ``Param``.
+        """
+        return self._prepare(
+            "search",
+            "_search",
+            index=index,
+            body_template=body_template,
+            params=params,
+        )
+
+    def prepare_count(
+        self,
+        *,
+        index: t.Optional[t.Union[str, t.Sequence[str], Param]] = None,
+        body_template: t.Optional[t.Mapping[str, t.Any]] = None,
+        params: t.Optional[t.Mapping[str, t.Any]] = None,
+    ) -> PreparedRequest:
+        """
+        Prepares a count request, see :meth:`prepare_search`.
+
+        :param index: Comma-separated list of data streams, indices, and aliases
+            to search, or a ``Param``.
+        :param body_template: Request body where any value may be a ``Param``.
+        :param params: Query parameters where any value may be a ``Param``.
+        """
+        return self._prepare(
+            "count",
+            "_count",
+            index=index,
+            body_template=body_template,
+            params=params,
+        )
+
+    def prepare_msearch(
+        self,
+        *,
+        searches_template: t.Sequence[t.Mapping[str, t.Any]],
+        index: t.Optional[t.Union[str, t.Sequence[str], Param]] = None,
+        params: t.Optional[t.Mapping[str, t.Any]] = None,
+    ) -> PreparedRequest:
+        """
+        Prepares a multi search request, see :meth:`prepare_search`.
+
+        :param searches_template: Alternating headers and bodies of the searches
+            where any value may be a ``Param``.
+        :param index: Comma-separated list of data streams, indices, and aliases
+            to search, or a ``Param``.
+        :param params: Query parameters where any value may be a ``Param``.
+        """
+        return self._prepare(
+            "msearch",
+            "_msearch",
+            index=index,
+            body_template=searches_template,
+            params=params,
+            content_type="application/x-ndjson",
+        )
+
+    def prepare_esql_query(
+        self,
+        *,
+        body_template: t.Mapping[str, t.Any],
+        params: t.Optional[t.Mapping[str, t.Any]] = None,
+    ) -> PreparedRequest:
+        """
+        Prepares an ES|QL query request, see :meth:`prepare_search`.
+
+        .. code-block:: python
+
+            prepared = client.prepare_esql_query(
+                body_template={
+                    "query": "FROM books | WHERE author == ? | LIMIT 10",
+                    "params": [Param("author")],
+                },
+                params={"format": "json"},
+            )
+
+        :param body_template: Request body where any value may be a ``Param``.
+        :param params: Query parameters where any value may be a ``Param``.
+        """
+        return self._prepare(
+            "esql.query",
+            "_query",
+            body_template=body_template,
+            params=params,
+        )
+
+    def _prepare(
+        self,
+        endpoint_id: str,
+        endpoint: str,
+        *,
+        body_template: t.Optional[t.Any],
+        params: t.Optional[t.Mapping[str, t.Any]],
+        index: t.Optional[t.Union[str, t.Sequence[str], Param]] = None,
+        content_type: str = "application/json",
+    ) -> PreparedRequest:
+        path: t.List[t.Union[str, Param]]
+        path_parts: t.Dict[str, t.Union[str, Param]] = {}
+        if isinstance(index, Param):
+            path_parts["index"] = index
+            path = ["/", index, f"/{endpoint}"]
+        elif index not in SKIP_IN_PATH:
+            path_parts["index"] = _quote(index)
+            path = [f'/{path_parts["index"]}/{endpoint}']
+        else:
+            path = [f"/{endpoint}"]
+
+        headers = {"accept": "application/json"}
+        if body_template is not None:
+            headers["content-type"] = content_type
+        return PreparedRequest(
+            "POST",
+            path,
+            endpoint_id=endpoint_id,
+            # NDJSON bodies are serialized line by line with the JSON serializer.
+            serializer=self.transport.serializers.get_serializer("application/json"),
+            headers=headers,
+            params=params,
+            body=body_template,
+            ndjson=content_type == "application/x-ndjson",
+            path_parts=path_parts,
+        )
+
+    def perform_prepared(
+        self, prepared: PreparedRequest, **values: t.Any
+    ) -> ApiResponse[t.Any]:
+        """
+        Performs a request prepared by one of the ``prepare_*()`` methods
+        after splicing ``values`` into its slots. Transport options set
+        with :meth:`options` apply as for any other API.
+
+        :param prepared: Request returned by a ``prepare_*()`` method.
+        :param values: Values for each of the named slots of the request.
+        """
+        target, path_parts, body = prepared.render(values)
+        return self.perform_request(
+            prepared.method,
+            target,
+            headers=prepared.headers,
+            body=body,
+            endpoint_id=prepared.endpoint_id,
+            path_parts=path_parts,
+        )
+
     def close(self) -> None:
         """Closes the Transport and all internal connections"""
         self.transport.close()
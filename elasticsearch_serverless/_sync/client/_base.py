@@ -16,8 +16,20 @@
 #  under the License.
 
 import re
+import time
 import warnings
-from typing import Any, Collection, Iterable, Mapping, Optional, Tuple, Union
+from functools import partial
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from elastic_transport import (
     ApiResponse,
@@ -32,18 +44,36 @@ from elastic_transport import (
 )
 from elastic_transport.client_utils import DEFAULT, DefaultType
 
-from ..._otel import OpenTelemetry
+from ..._circuit_breaker import CircuitBreaker, _circuit
+from ..._concurrency import AdaptiveConcurrencyLimiter, _limit
+from ..._hedging import HedgingPolicy, _hedge
+from ..._hooks import RequestContext, RequestHooks
+from ..._lazy import LazyObjectApiResponse, _decode_raw, _keep_raw, _RawBody
+from ..._metrics import MetricsRegistry, _measure
+from ..._otel import DISABLED_SPAN, OpenTelemetry
+from ..._retry import RetryPolicy, _retry, _RetryCallback
+from ..._streaming import _decode_streaming
+from ..._timings import _time
 from ...compat import warn_stacklevel
 from ...exceptions import (
     HTTP_EXCEPTIONS,
     ApiError,
     ElasticsearchWarning,
+    SerializationError,
     UnsupportedProductError,
 )
+from ...serializer import _response_decoder, _typed_decoder
 from .utils import _base64_auth_header, _quote_query
 
 _WARNING_RE = re.compile(r"\"([^\"]*)\"")
 
+# Mimetypes requested by the 'response_format' option
+_RESPONSE_FORMATS = {
+    "json": "application/json",
+    "cbor": "application/cbor",
+    "smile": "application/smile",
+}
+
 
 def resolve_auth_headers(
     headers: Optional[Mapping[str, str]],
@@ -116,8 +146,46 @@ def resolve_auth_headers(
     return headers
 
 
+def resolve_response_format(
+    transport: Transport, response_format: Optional[str]
+) -> Optional[str]:
+    """Returns the mimetype requested instead of JSON for a response format"""
+    if response_format is None or response_format == "json":
+        return None
+    try:
+        mimetype = _RESPONSE_FORMATS[response_format]
+    except KeyError:
+        raise ValueError(
+            f"'response_format' must be one of {', '.join(map(repr, _RESPONSE_FORMATS))}"
+        ) from None
+    if mimetype not in transport.serializers.serializers:
+        raise ValueError(
+            f"No serializer is configured for the {mimetype!r} mimetype, "
+            f"install the required package or configure one with 'serializers'"
+        )
+    return mimetype
+
+
+def resolve_stream_path(
+    stream_path: Optional[Union[str, Sequence[str]]]
+) -> Optional[Tuple[str, ...]]:
+    """Returns the keys leading to the streamed array of responses,
+    e.g. ``("hits", "hits")`` for ``"hits.hits"``
+    """
+    if stream_path is None:
+        return None
+    path = tuple(
+        stream_path.split(".") if isinstance(stream_path, str) else stream_path
+    )
+    if not path or not all(isinstance(key, str) and key for key in path):
+        raise ValueError("'stream_path' must be a non-empty sequence of keys")
+    return path
+
+
 class BaseClient:
-    def __init__(self, _transport: Transport) -> None:
+    def __init__(
+        self, _transport: Transport, _otel: Optional[OpenTelemetry] = None
+    ) -> None:
         self._transport = _transport
         self._client_meta: Union[DefaultType, Tuple[Tuple[str, str], ...]] = DEFAULT
         self._headers = HttpHeaders()
@@ -126,8 +194,23 @@ class BaseClient:
         self._max_retries: Union[DefaultType, int] = DEFAULT
         self._retry_on_timeout: Union[DefaultType, bool] = DEFAULT
         self._retry_on_status: Union[DefaultType, Collection[int]] = DEFAULT
+        self._hedging_policy: Optional[HedgingPolicy] = None
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        self._circuit_breaker: Optional[CircuitBreaker] = None
+        self._retry_policy: Optional[RetryPolicy] = None
+        self._metrics_registry: Optional[MetricsRegistry] = None
+        self._request_timings = False
+        self._hooks: Optional[RequestHooks] = None
+        # Mimetype requested instead of JSON for the 'response_format' option
+        self._response_mimetype: Optional[str] = None
+        # Typed response of each endpoint for the 'source_type' option
+        self._response_types: Optional[Dict[str, Any]] = None
+        # Path of the array streamed for the 'stream_path' option
+        self._stream_path: Optional[Tuple[str, ...]] = None
+        # Whether JSON object responses are decoded on first access
+        self._lazy_body = False
         self._verified_elasticsearch = False
-        self._otel = OpenTelemetry()
+        self._otel = _otel if _otel is not None else OpenTelemetry()
 
     @property
     def transport(self) -> Transport:
@@ -144,21 +227,58 @@ class BaseClient:
         endpoint_id: Optional[str] = None,
         path_parts: Optional[Mapping[str, Any]] = None,
     ) -> ApiResponse[Any]:
-        with self._otel.span(
-            method,
-            endpoint_id=endpoint_id,
-            path_parts=path_parts or {},
-        ) as otel_span:
-            response = self._perform_request(
-                method,
-                path,
-                params=params,
-                headers=headers,
-                body=body,
-                otel_span=otel_span,
-            )
-            otel_span.set_elastic_cloud_metadata(response.meta.headers)
+        otel_metrics = self._otel.metrics
+        start = 0.0
+        if otel_metrics is not None:
+            start = otel_metrics.request_started(endpoint_id)
+        hooks = self._hooks
+        hook_context = None
+        if hooks is not None:
+            hook_context = RequestContext(method, path, endpoint_id, path_parts or {})
+        error_type = None
+        try:
+            if not self._otel.sampled():
+                # Requests which aren't traced skip the span's context manager.
+                response = self._perform_request(
+                    method,
+                    path,
+                    params=params,
+                    headers=headers,
+                    body=body,
+                    otel_span=DISABLED_SPAN,
+                    endpoint_id=endpoint_id,
+                    hook_context=hook_context,
+                )
+            else:
+                with self._otel.span(
+                    method,
+                    endpoint_id=endpoint_id,
+                    path_parts=path_parts or {},
+                ) as otel_span:
+                    response = self._perform_request(
+                        method,
+                        path,
+                        params=params,
+                        headers=headers,
+                        body=body,
+                        otel_span=otel_span,
+                        endpoint_id=endpoint_id,
+                        hook_context=hook_context,
+                    )
+                    otel_span.set_elastic_cloud_metadata(response.meta.headers)
+            if hooks is not None and hook_context is not None:
+                hooks._after_response(hook_context, response)
             return response
+        except BaseException as e:
+            error_type = (
+                str(e.meta.status) if isinstance(e, ApiError) else type(e).__qualname__
+            )
+            if hooks is not None and hook_context is not None:
+                hooks._on_error(hook_context, e)
+            raise
+        finally:
+            if otel_metrics is not None:
+                otel_metrics.request_finished(endpoint_id, start, error_type)
 
     def _perform_request(
         self,
@@ -171,30 +291,114 @@ class BaseClient:
         otel_span: OpenTelemetrySpan,
         endpoint_id: Optional[str] = None,
         path_parts: Optional[Mapping[str, Any]] = None,
+        hook_context: Optional[RequestContext] = None,
     ) -> ApiResponse[Any]:
         if headers:
             request_headers = self._headers.copy()
             request_headers.update(headers)
         else:
             request_headers = self._headers
+        if (
+            self._response_mimetype is not None
+            and request_headers.get("accept") == "application/json"
+        ):
+            request_headers = request_headers.copy()
+            request_headers["accept"] = self._response_mimetype
 
         if params:
             target = f"{path}?{_quote_query(params)}"
         else:
             target = path
 
-        meta, resp_body = self.transport.perform_request(
+        # Serialize the body here instead of in the transport
+        # to record its size and the time spent serializing it.
+        timed = (
+            self._request_timings
+            or self._metrics_registry is not None
+            or hook_context is not None
+        )
+        request_bytes = 0
+        serialize_time = 0.0
+        if timed and body is not None and "content-type" in request_headers:
+            start = time.perf_counter()
+            body = self.transport.serializers.dumps(
+                body, mimetype=request_headers["content-type"]
+            )
+            serialize_time = time.perf_counter() - start
+            request_bytes = len(body)
+
+        on_retry: Optional[_RetryCallback] = None
+        if self._metrics_registry is not None:
+            on_retry = partial(self._metrics_registry._record_retry, endpoint_id)
+        if self._hooks is not None and hook_context is not None:
+            hook_context.path = target
+            hook_context.headers = request_headers
+            hook_context.request_bytes = request_bytes
+            hook_context.body = body
+            self._hooks._before_request(hook_context)
+            on_retry = self._hooks._retry_callback(hook_context, on_retry)
+
+        perform = partial(
+            self.transport.perform_request,
             method,
             target,
             headers=request_headers,
             body=body,
             request_timeout=self._request_timeout,
-            max_retries=self._max_retries,
+            # A retry policy replaces the retries of the transport.
+            max_retries=0 if self._retry_policy is not None else self._max_retries,
             retry_on_status=self._retry_on_status,
             retry_on_timeout=self._retry_on_timeout,
             client_meta=self._client_meta,
             otel_span=otel_span,
         )
+        if timed:
+            perform = partial(_time, serialize_time, perform)
+        if self._hedging_policy is not None:
+            perform = partial(_hedge, self._hedging_policy, endpoint_id, perform)
+        if self._concurrency_limiter is not None:
+            perform = partial(_limit, self._concurrency_limiter, perform)
+        if self._circuit_breaker is not None:
+            perform = partial(_circuit, self._circuit_breaker, perform)
+        if self._retry_policy is not None:
+            perform = partial(
+                _retry, self._retry_policy, endpoint_id, perform, on_retry
+            )
+        if self._metrics_registry is not None:
+            perform = partial(
+                _measure,
+                self._metrics_registry,
+                endpoint_id,
+                request_bytes,
+                perform,
+            )
+        response_type = None
+        decoder: Any = None
+        if self._response_types is not None and endpoint_id is not None:
+            response_type = self._response_types.get(endpoint_id)
+        if response_type is not None:
+            decoder = _typed_decoder(response_type).decode
+        elif self._stream_path is not None:
+            decoder = partial(_decode_streaming, path=self._stream_path)
+        if self._lazy_body:
+            token = _response_decoder.set(_keep_raw)
+        elif decoder is not None:
+            token = _response_decoder.set(decoder)
+        else:
+            token = None
+        try:
+            meta, resp_body = perform()
+        finally:
+            if token is not None:
+                _response_decoder.reset(token)
+
+        if isinstance(resp_body, _RawBody):
+            decode = partial(
+                _decode_raw, self.transport.serializers, meta.mimetype, decoder
+            )
+            # Error responses are decoded to raise their error.
+            if not 200 <= meta.status < 299:
+                resp_body = decode(resp_body.data)
 
         # HEAD with a 404 is returned as a normal response
         # since this is used as an 'exists' functionality.
@@ -230,6 +434,8 @@ class BaseClient:
                 self._verified_elasticsearch = True
             # Otherwise we only raise an error on 2XX responses.
             elif meta.status >= 200 and meta.status < 300:
+                if isinstance(resp_body, _RawBody):
+                    resp_body = decode(resp_body.data)
                 raise UnsupportedProductError(
                     message=(
                         "The client noticed that the server is not Elasticsearch "
@@ -253,8 +459,21 @@ class BaseClient:
                     stacklevel=stacklevel,
                 )
 
+        # Responses decoded by serializers other than the client's
+        # JSON serializers are converted into the typed response.
+        if (
+            response_type is not None
+            and 200 <= meta.status < 300
+            and isinstance(resp_body, dict)
+        ):
+            resp_body = _convert_response(resp_body, response_type)
+
         if method == "HEAD":
             response = HeadApiResponse(meta=meta)
+        elif isinstance(resp_body, _RawBody):
+            response = LazyObjectApiResponse(  # type: ignore[assignment]
+                resp_body.data, decode, meta
+            )
         elif isinstance(resp_body, dict):
             response = ObjectApiResponse(body=resp_body, meta=meta)  # type: ignore[assignment]
         elif isinstance(resp_body, list):
@@ -272,10 +491,22 @@ class BaseClient:
         return response
 
 
+def _convert_response(body: Any, response_type: Any) -> Any:
+    import msgspec
+
+    try:
+        return msgspec.convert(body, response_type)
+    except msgspec.ValidationError as e:
+        raise SerializationError(
+            message=f"Unable to decode the response as {response_type!r}: {e}",
+            errors=(e,),
+        )
+
+
 class NamespacedClient(BaseClient):
     def __init__(self, client: "BaseClient") -> None:
         self._client = client
-        super().__init__(self._client.transport)
+        super().__init__(self._client.transport, self._client._otel)
 
     def perform_request(
         self,
@@ -18,14 +18,12 @@
 import base64
 import inspect
 import warnings
-from datetime import date, datetime
 from enum import Enum, auto
 from functools import wraps
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
-    Collection,
     Dict,
     List,
     Mapping,
@@ -43,21 +41,19 @@ from elastic_transport.client_utils import (
     client_meta_version,
     create_user_agent,
     parse_cloud_id,
-    percent_encode,
     url_to_node_config,
 )
 
 from elasticsearch_serverless.exceptions import GeneralAvailabilityWarning
 
+from ..._utils import SKIP_IN_PATH as SKIP_IN_PATH  # noqa: F401
+from ..._utils import _quote as _quote
 from ..._version import __versionstr__
 from ...compat import to_bytes, to_str, warn_stacklevel
 
 if TYPE_CHECKING:
     from ._base import NamespacedClient
 
-# parts of URL to be omitted
-SKIP_IN_PATH: Collection[Any] = (None, "", b"", [], ())
-
 # To be passed to 'client_meta_service' on the Transport
 CLIENT_META_SERVICE = ("esv", client_meta_version(__versionstr__))
 
@@ -232,36 +228,6 @@ def _base64_auth_header(auth_value: Union[str, List[str], Tuple[str, str]]) -> s
     return to_str(auth_value)
 
 
-def _escape(value: Any) -> str:
-    """
-    Escape a single value of a URL string or a query parameter. If it is a list
-    or tuple, turn it into a comma-separated string first.
-    """
-
-    # make sequences into comma-separated strings
-    if isinstance(value, (list, tuple)):
-        value = ",".join([_escape(item) for item in value])
-
-    # dates and datetimes into isoformat
-    elif isinstance(value, (date, datetime)):
-        value = value.isoformat()
-
-    # make bools into true/false strings
-    elif isinstance(value, bool):
-        value = str(value).lower()
-
-    elif isinstance(value, bytes):
-        return value.decode("utf-8", "surrogatepass")
-
-    if not isinstance(value, str):
-        return str(value)
-    return value
-
-
-def _quote(value: Any) -> str:
-    return percent_encode(_escape(value), ",*")
-
-
 def _quote_query(query: Mapping[str, Any]) -> str:
     return "&".join([f"{k}={_quote(v)}" for k, v in query.items()])
 
@@ -0,0 +1,190 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+from elastic_transport import (
+    ApiResponse,
+    ApiResponseMeta,
+    SerializerCollection,
+    TransportApiResponse,
+)
+
+from ._lazy import _RawBody
+
+__all__ = ["RequestTimings"]
+
+
+class RequestTimings:
+    """Breakdown in seconds of where the time of a request was spent:
+
+    * ``serialize``: serializing the request body in the client
+    * ``transport``: sending the request and receiving the response, i.e. the
+      network round trip and the time spent by Elasticsearch
+    * ``deserialize``: deserializing the response body in the client,
+      ``0.0`` for bodies decoded lazily on their first access
+    * ``server``: the ``took`` time reported by Elasticsearch in the response
+      body, ``None`` for responses without ``took``
+    * ``network``: ``transport`` minus ``server`` when ``took`` is known
+
+    Timings are recorded when the client is created with
+    ``request_timings=True`` or with a ``metrics_registry`` and are
+    only about the attempt which returned the response:
+
+    .. code-block:: python
+
+        client = Elasticsearch(..., request_timings=True)
+        resp = client.search(index="blogs")
+        timings = RequestTimings.from_response(resp)
+    """
+
+    __slots__ = ("serialize", "transport", "deserialize", "server")
+
+    def __init__(
+        self,
+        serialize: float,
+        transport: float,
+        deserialize: float,
+        server: Optional[float] = None,
+    ) -> None:
+        self.serialize = serialize
+        self.transport = transport
+        self.deserialize = deserialize
+        self.server = server
+
+    @property
+    def network(self) -> Optional[float]:
+        if self.server is None:
+            return None
+        return max(0.0, self.transport - self.server)
+
+    @classmethod
+    def from_response(
+        cls, response: Union[ApiResponse[Any], ApiResponseMeta]
+    ) -> Optional["RequestTimings"]:
+        """Returns the timings of a response, an error's ``meta`` or ``None``
+        when the client didn't record them.
+        """
+        meta = response.meta if isinstance(response, ApiResponse) else response
+        timings: Optional[RequestTimings] = getattr(meta, "timings", None)
+        return timings
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestTimings(serialize={self.serialize!r}, "
+            f"transport={self.transport!r}, deserialize={self.deserialize!r}, "
+            f"server={self.server!r})"
+        )
+
+
+def _took(body: Any) -> Optional[float]:
+    if isinstance(body, dict):
+        took = body.get("took")
+        if isinstance(took, (int, float)) and not isinstance(took, bool):
+            return took / 1000.0
+    return None
+
+
+# Seconds spent deserializing the response of the last attempt,
+# set by '_time()' while the transport performs a request.
+_deserialize_time: ContextVar[Optional[List[float]]] = ContextVar(
+    "_deserialize_time", default=None
+)
+
+
+class _TimedSerializerCollection(SerializerCollection):
+    """Serializers of a transport which record the time spent
+    deserializing responses of requests timed by '_time()'.
+    """
+
+    def __init__(self, serializers: SerializerCollection) -> None:
+        self.serializers = serializers.serializers
+        self.default_serializer = serializers.default_serializer
+
+    def loads(self, data: bytes, mimetype: Optional[str] = None) -> Any:
+        timer = _deserialize_time.get()
+        if timer is None:
+            return super().loads(data, mimetype)
+        start = time.perf_counter()
+        try:
+            body = super().loads(data, mimetype)
+        finally:
+            # Attempts retried by the transport are overwritten.
+            timer[0] = time.perf_counter() - start
+        if isinstance(body, _RawBody):
+            # Lazy bodies are deserialized on their first access.
+            timer[0] = 0.0
+        return body
+
+
+def _time_deserialization(transport: Any) -> None:
+    """Replaces the serializers of a transport with ones recording
+    the time spent deserializing responses. Called once by clients
+    recording timings when they create their transport.
+    """
+    serializers = getattr(transport, "serializers", None)
+    if type(serializers) is SerializerCollection:
+        transport.serializers = _TimedSerializerCollection(serializers)
+
+
+def _attach(
+    response: TransportApiResponse,
+    serialize: float,
+    elapsed: float,
+    deserialize: float,
+) -> TransportApiResponse:
+    meta, body = response
+    # The transport measures the time of the attempt which returned the
+    # response. Earlier attempts and backoff aren't part of any phase.
+    if meta.duration > 0:
+        transport = min(meta.duration, elapsed)
+    else:
+        transport = elapsed - deserialize
+    setattr(
+        meta,
+        "timings",
+        RequestTimings(serialize, transport, deserialize, _took(body)),
+    )
+    return response
+
+
+def _time(
+    serialize: float, perform: Callable[[], TransportApiResponse]
+) -> TransportApiResponse:
+    timer = [0.0]
+    token = _deserialize_time.set(timer)
+    start = time.perf_counter()
+    try:
+        response = perform()
+    finally:
+        _deserialize_time.reset(token)
+    return _attach(response, serialize, time.perf_counter() - start, timer[0])
+
+
+async def _async_time(
+    serialize: float, perform: Callable[[], Awaitable[TransportApiResponse]]
+) -> TransportApiResponse:
+    timer = [0.0]
+    token = _deserialize_time.set(timer)
+    start = time.perf_counter()
+    try:
+        response = await perform()
+    finally:
+        _deserialize_time.reset(token)
+    return _attach(response, serialize, time.perf_counter() - start, timer[0])
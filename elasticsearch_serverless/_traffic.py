@@ -0,0 +1,587 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import gzip
+import json
+import os
+import random
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from elastic_transport import ApiResponse
+
+from ._hooks import RequestContext, RequestHooks
+from .exceptions import ApiError
+
+if TYPE_CHECKING:
+    from ._async.client import AsyncElasticsearch
+    from ._sync.client import Elasticsearch
+
+__all__ = [
+    "TrafficRecord",
+    "TrafficRecorder",
+    "ReplayReport",
+    "read_traffic",
+    "replay_traffic",
+    "async_replay_traffic",
+]
+
+# Headers with credentials which are never recorded
+_AUTH_HEADERS = frozenset(
+    (
+        "authorization",
+        "proxy-authorization",
+        "es-secondary-authorization",
+        "x-api-key",
+        "cookie",
+    )
+)
+
+# Segments start with a magic number and a format version.
+_MAGIC = b"ESTRAFFIC\x01"
+# offset, duration, status, length of the request's JSON metadata, body length
+_RECORD_HEADER = struct.Struct("<dfHII")
+_SEGMENT_SUFFIX = ".traffic.gz"
+# Uncompressed bytes of records which are buffered before they're written
+_BUFFER_BYTES = 1024 * 1024
+
+
+class TrafficRecord:
+    """A request recorded by :class:`~elasticsearch_serverless.TrafficRecorder`"""
+
+    __slots__ = (
+        "offset",
+        "duration",
+        "status",
+        "method",
+        "target",
+        "endpoint_id",
+        "headers",
+        "body",
+    )
+
+    def __init__(
+        self,
+        offset: float,
+        duration: float,
+        status: int,
+        method: str,
+        target: str,
+        endpoint_id: Optional[str],
+        headers: Mapping[str, str],
+        body: Optional[bytes],
+    ) -> None:
+        #: Seconds between the start of the recording and the request
+        self.offset = offset
+        #: Seconds the request took in the recorded client
+        self.duration = duration
+        #: HTTP status of the response, 0 when no response was received
+        self.status = status
+        self.method = method
+        #: Path of the request with the query string
+        self.target = target
+        self.endpoint_id = endpoint_id
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self) -> str:
+        return (
+            f"<TrafficRecord method={self.method!r} target={self.target!r} "
+            f"endpoint_id={self.endpoint_id!r} status={self.status!r}>"
+        )
+
+
+class TrafficRecorder:
+    """Records the requests of clients into compact segment files
+    which can be replayed with :func:`~elasticsearch_serverless.replay_traffic`.
+
+    Every request is recorded with its method, path, endpoint ID, headers
+    without credentials, serialized body, offset from the start of the
+    recording, duration and response status. Records are buffered and
+    written sorted by their offset to gzip compressed segments, a new
+    segment is started after ``max_segment_bytes``.
+
+    The recorder is installed on :class:`~elasticsearch_serverless.RequestHooks`:
+
+    .. code-block:: python
+
+        hooks = RequestHooks()
+        with TrafficRecorder("traffic/", sample_rate=0.1) as recorder:
+            recorder.register(hooks)
+            client = Elasticsearch(..., hooks=hooks)
+            ...
+
+    :arg directory: Directory of the segment files, created if it doesn't exist.
+    :arg sample_rate: Ratio of the requests which are recorded.
+    :arg max_segment_bytes: Number of uncompressed bytes after
+        which the next segment is started.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        *,
+        sample_rate: float = 1.0,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("'sample_rate' must be between 0 and 1")
+        if max_segment_bytes <= 0:
+            raise ValueError("'max_segment_bytes' must be greater than 0")
+
+        self.directory = os.fspath(directory)
+        self.sample_rate = sample_rate
+        self.max_segment_bytes = max_segment_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        #: Number of recorded requests
+        self.records = 0
+        #: Segment files written so far
+        self.segments: List[str] = []
+        self._start = time.perf_counter()
+        self._segment: Optional[gzip.GzipFile] = None
+        self._segment_bytes = 0
+        self._buffer: List[Tuple[float, bytes]] = []
+        self._buffer_bytes = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        # Held while compressing, so '_lock' is only held by
+        # requests to add their record to the buffer.
+        self._write_lock = threading.Lock()
+
+    def register(self, hooks: RequestHooks) -> None:
+        """Records the requests of clients using ``hooks``"""
+        hooks.register("after_response", self._after_response)
+        hooks.register("on_error", self._on_error)
+
+    def _after_response(
+        self, context: RequestContext, response: ApiResponse[Any]
+    ) -> None:
+        self.record(context)
+
+    def _on_error(self, context: RequestContext, error: BaseException) -> None:
+        self.record(context)
+
+    def record(self, context: RequestContext) -> None:
+        """Records a finished request"""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+
+        metadata = json.dumps(
+            {
+                "method": context.method,
+                "target": context.path,
+                "endpoint_id": context.endpoint_id,
+                "headers": {
+                    key: value
+                    for key, value in context.headers.items()
+                    if key.lower() not in _AUTH_HEADERS
+                },
+            },
+            separators=(",", ":"),
+        ).encode()
+        body = _body_bytes(context.body) or b""
+        offset = context.start - self._start
+        data = b"".join(
+            (
+                _RECORD_HEADER.pack(
+                    offset,
+                    context.duration,
+                    context.status or 0,
+                    len(metadata),
+                    len(body),
+                ),
+                metadata,
+                body,
+            )
+        )
+
+        with self._lock:
+            if self._closed:
+                return
+            self._buffer.append((offset, data))
+            self._buffer_bytes += len(data)
+            self.records += 1
+            if self._buffer_bytes < min(self.max_segment_bytes, _BUFFER_BYTES):
+                return
+            buffer = self._take_buffer()
+        with self._write_lock:
+            self._write(buffer)
+
+    def _take_buffer(self) -> List[Tuple[float, bytes]]:
+        buffer = self._buffer
+        self._buffer = []
+        self._buffer_bytes = 0
+        return buffer
+
+    def _write(self, buffer: List[Tuple[float, bytes]]) -> None:
+        # Requests are recorded when they finish, so a slow request
+        # is recorded after the requests which started after it.
+        buffer.sort(key=lambda item: item[0])
+        if self._segment is None or self._segment_bytes >= self.max_segment_bytes:
+            self._next_segment()
+        assert self._segment is not None
+        for _, data in buffer:
+            self._segment.write(data)
+            self._segment_bytes += len(data)
+        # A buffer taken before the recorder was closed is written
+        # after the current segment was closed.
+        if self._closed:
+            self._close_segment()
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _next_segment(self) -> None:
+        self._close_segment()
+        path = os.path.join(
+            self.directory, f"segment-{len(self.segments):06d}{_SEGMENT_SUFFIX}"
+        )
+        self._segment = gzip.open(path, "wb")
+        self._segment.write(_MAGIC)
+        self._segment_bytes = len(_MAGIC)
+        self.segments.append(path)
+
+    def close(self) -> None:
+        """Closes the current segment, further requests aren't recorded"""
+        with self._lock:
+            self._closed = True
+            buffer = self._take_buffer()
+        with self._write_lock:
+            if buffer:
+                self._write(buffer)
+            self._close_segment()
+
+    def __enter__(self) -> "TrafficRecorder":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+def _body_bytes(body: Any) -> Optional[bytes]:
+    if body is None or isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8", "surrogatepass")
+    # Bodies without a 'content-type' header aren't serialized by the client.
+    return json.dumps(body, default=str).encode()
+
+
+def read_traffic(
+    path: Union[str, "os.PathLike[str]"],
+) -> Iterator[TrafficRecord]:
+    """Reads the records of a segment file or of all segments in a
+    directory. A segment which wasn't closed, e.g. after a crash, is
+    read up to its last complete record.
+    """
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        paths = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.endswith(_SEGMENT_SUFFIX)
+        )
+    else:
+        paths = [path]
+
+    for segment_path in paths:
+        with gzip.open(segment_path, "rb") as segment:
+            if segment.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{segment_path!r} isn't a traffic segment file")
+            try:
+                while True:
+                    header = segment.read(_RECORD_HEADER.size)
+                    if len(header) < _RECORD_HEADER.size:
+                        break
+                    offset, duration, status, metadata_size, body_size = (
+                        _RECORD_HEADER.unpack(header)
+                    )
+                    metadata = json.loads(segment.read(metadata_size))
+                    body = segment.read(body_size) if body_size else None
+                    if body is not None and len(body) < body_size:
+                        break
+                    yield TrafficRecord(
+                        offset=offset,
+                        duration=duration,
+                        status=status,
+                        method=metadata["method"],
+                        target=metadata["target"],
+                        endpoint_id=metadata["endpoint_id"],
+                        headers=metadata["headers"],
+                        body=body,
+                    )
+            except (EOFError, ValueError):
+                # Truncated segment
+                break
+
+
+class ReplayReport:
+    """Latencies and statuses of replayed requests, per endpoint ID.
+
+    ``str(report)`` formats the latency distribution of every endpoint
+    next to the latencies which were recorded.
+    """
+
+    def __init__(self) -> None:
+        #: Latencies of the replayed requests in seconds
+        self.latencies: Dict[str, List[float]] = {}
+        #: Latencies of the same requests in the recording
+        self.recorded_latencies: Dict[str, List[float]] = {}
+        #: Number of responses per status, errors without a response are
+        #: counted by the name of the exception
+        self.statuses: Dict[Union[int, str], int] = {}
+        #: Seconds by which requests started later than scheduled
+        self.lag: List[float] = []
+        #: Seconds from the first request to the last response
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def requests(self) -> int:
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    def percentiles(
+        self,
+        endpoint_id: Optional[str] = None,
+        percentiles: Sequence[float] = (50, 90, 99),
+        recorded: bool = False,
+    ) -> Dict[float, float]:
+        """Returns the latency percentiles of an endpoint, or of all requests"""
+        latencies = self.recorded_latencies if recorded else self.latencies
+        if endpoint_id is None:
+            values = [value for values in latencies.values() for value in values]
+        else:
+            values = latencies.get(endpoint_id, [])
+        return {
+            percentile: _percentile(sorted(values), percentile)
+            for percentile in percentiles
+        }
+
+    def _add(
+        self,
+        record: TrafficRecord,
+        status: Union[int, str],
+        latency: float,
+        lag: float,
+    ) -> None:
+        endpoint_id = record.endpoint_id or "unknown"
+        with self._lock:
+            self.latencies.setdefault(endpoint_id, []).append(latency)
+            self.recorded_latencies.setdefault(endpoint_id, []).append(record.duration)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.lag.append(lag)
+
+    def __str__(self) -> str:
+        lines = [
+            f"{'endpoint':<24} {'requests':>8} {'p50':>9} {'p90':>9} {'p99':>9} "
+            f"{'max':>9} {'rec p50':>9} {'rec p99':>9}"
+        ]
+        for endpoint_id in sorted(self.latencies) + [None]:
+            name = endpoint_id or "total"
+            replayed = self.percentiles(endpoint_id, (50, 90, 99, 100))
+            recorded = self.percentiles(endpoint_id, (50, 99), recorded=True)
+            count = (
+                len(self.latencies[endpoint_id])
+                if endpoint_id is not None
+                else self.requests
+            )
+            lines.append(
+                f"{name:<24} {count:>8} "
+                + " ".join(
+                    f"{value * 1000:>7.1f}ms"
+                    for value in list(replayed.values()) + list(recorded.values())
+                )
+            )
+        statuses = ", ".join(
+            f"{status}: {count}"
+            for status, count in sorted(self.statuses.items(), key=str)
+        )
+        throughput = self.requests / self.duration if self.duration else 0.0
+        lag = max(self.lag) if self.lag else 0.0
+        lines.append(
+            f"statuses: {statuses}; {throughput:.1f} requests/s; "
+            f"max lag {lag * 1000:.1f}ms"
+        )
+        return "\n".join(lines)
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percentile // 100))
+    return values[int(rank) - 1]
+
+
+def _records(
+    records: Union[str, "os.PathLike[str]", Iterable[TrafficRecord]],
+) -> Iterable[TrafficRecord]:
+    if isinstance(records, (str, os.PathLike)):
+        return read_traffic(records)
+    return records
+
+
+def _sorted_records(
+    records: Union[str, "os.PathLike[str]", Iterable[TrafficRecord]],
+) -> List[TrafficRecord]:
+    # Requests are recorded when they finish, not in the order they started.
+    return sorted(_records(records), key=lambda record: record.offset)
+
+
+def _request_kwargs(record: TrafficRecord) -> Dict[str, Any]:
+    return {
+        "headers": record.headers,
+        "body": record.body,
+        "endpoint_id": record.endpoint_id,
+    }
+
+
+def replay_traffic(
+    client: "Elasticsearch",
+    records: Union[str, "os.PathLike[str]", Iterable[TrafficRecord]],
+    *,
+    concurrency: int = 1,
+    speed: Optional[float] = 1.0,
+) -> ReplayReport:
+    """Replays recorded requests with a client and reports their latencies.
+
+    Records are sorted by their offsets, and requests are started at
+    their recorded offsets divided by ``speed``, e.g. ``speed=2`` replays the traffic twice as fast. With ``speed=None``
+    every request is started as soon as one of the ``concurrency`` threads
+    is available. Requests which can't start on time because all threads
+    are busy are counted in :attr:`ReplayReport.lag`.
+
+    :arg client: Client sending the requests, e.g. to a stand-in cluster.
+    :arg records: Directory or segment file of a recording, or records.
+    :arg concurrency: Maximum number of requests in flight.
+    :arg speed: Factor by which the recorded offsets are sped up.
+    """
+    if concurrency < 1:
+        raise ValueError("'concurrency' must be at least 1")
+    if speed is not None and speed <= 0:
+        raise ValueError("'speed' must be greater than 0")
+
+    report = ReplayReport()
+    slots = threading.Semaphore(concurrency)
+
+    def send(record: TrafficRecord, scheduled: float) -> None:
+        try:
+            start = time.perf_counter()
+            try:
+                response = client.perform_request(
+                    record.method, record.target, **_request_kwargs(record)
+                )
+                status: Union[int, str] = response.meta.status
+            except ApiError as e:
+                status = e.status_code
+            except Exception as e:
+                status = type(e).__qualname__
+            latency = time.perf_counter() - start
+            report._add(record, status, latency, max(0.0, start - scheduled))
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    sorted_records = _sorted_records(records)
+    first_offset = sorted_records[0].offset if sorted_records else 0.0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for record in sorted_records:
+            scheduled = start
+            if speed is not None:
+                scheduled += (record.offset - first_offset) / speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            slots.acquire()
+            executor.submit(send, record, scheduled)
+    report.duration = time.perf_counter() - start
+    return report
+
+
+async def async_replay_traffic(
+    client: "AsyncElasticsearch",
+    records: Union[str, "os.PathLike[str]", Iterable[TrafficRecord]],
+    *,
+    concurrency: int = 1,
+    speed: Optional[float] = 1.0,
+) -> ReplayReport:
+    """Replays recorded requests with an async client and reports
+    their latencies, see :func:`~elasticsearch_serverless.replay_traffic`.
+    """
+    if concurrency < 1:
+        raise ValueError("'concurrency' must be at least 1")
+    if speed is not None and speed <= 0:
+        raise ValueError("'speed' must be greater than 0")
+
+    report = ReplayReport()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send(record: TrafficRecord, scheduled: float) -> None:
+        try:
+            start = time.perf_counter()
+            try:
+                response = await client.perform_request(
+                    record.method, record.target, **_request_kwargs(record)
+                )
+                status: Union[int, str] = response.meta.status
+            except ApiError as e:
+                status = e.status_code
+            except Exception as e:
+                status = type(e).__qualname__
+            latency = time.perf_counter() - start
+            report._add(record, status, latency, max(0.0, start - scheduled))
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    sorted_records = _sorted_records(records)
+    first_offset = sorted_records[0].offset if sorted_records else 0.0
+    tasks = set()
+    for record in sorted_records:
+        scheduled = start
+        if speed is not None:
+            scheduled += (record.offset - first_offset) / speed
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await slots.acquire()
+        task = asyncio.ensure_future(send(record, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    report.duration = time.perf_counter() - start
+    return report
@@ -16,7 +16,13 @@
 #  under the License.
 
 import re
-from typing import Any, Dict
+from datetime import date, datetime
+from typing import Any, Collection, Dict
+
+from elastic_transport.client_utils import percent_encode
+
+# parts of URL to be omitted
+SKIP_IN_PATH: Collection[Any] = (None, "", b"", [], ())
 
 
 def fixup_module_metadata(module_name: str, namespace: Dict[str, Any]) -> None:
@@ -32,3 +38,33 @@ def fixup_module_metadata(module_name: str, namespace: Dict[str, Any]) -> None:
     for objname in namespace["__all__"]:
         obj = namespace[objname]
         fix_one(obj)
+
+
+def _escape(value: Any) -> str:
+    """
+    Escape a single value of a URL string or a query parameter. If it is a list
+    or tuple, turn it into a comma-separated string first.
+    """
+
+    # make sequences into comma-separated strings
+    if isinstance(value, (list, tuple)):
+        value = ",".join([_escape(item) for item in value])
+
+    # dates and datetimes into isoformat
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+
+    # make bools into true/false strings
+    elif isinstance(value, bool):
+        value = str(value).lower()
+
+    elif isinstance(value, bytes):
+        return value.decode("utf-8", "surrogatepass")
+
+    if not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _quote(value: Any) -> str:
+    return percent_encode(_escape(value), ",*")
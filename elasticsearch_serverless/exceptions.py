@@ -36,6 +36,8 @@ __all__ = [
     "NotFoundError",
     "ConflictError",
     "BadRequestError",
+    "ConcurrencyLimitError",
+    "CircuitBreakerError",
 ]
 
 
@@ -109,6 +111,18 @@ class AuthorizationException(ApiError):
     """Exception representing a 403 status code."""
 
 
+class ConcurrencyLimitError(TransportError):
+    """Error which is raised when a request can't be sent because the
+    client's concurrency limit is reached and the request can't be queued.
+    """
+
+
+class CircuitBreakerError(TransportError):
+    """Error which is raised when a request isn't sent because
+    the client's circuit breaker is open.
+    """
+
+
 class ElasticsearchWarning(TransportWarning):
     """Warning that is raised when a deprecated option
     or incorrect usage is flagged via the 'Warning' HTTP header.
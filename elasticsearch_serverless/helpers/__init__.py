@@ -15,11 +15,26 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
-from .._async.helpers import async_bulk, async_reindex, async_scan, async_streaming_bulk
+from .._async.helpers import (
+    async_bulk,
+    async_esql_record_batches,
+    async_reindex,
+    async_scan,
+    async_streaming_bulk,
+)
 from .._utils import fixup_module_metadata
 from .actions import _chunk_actions  # noqa: F401
 from .actions import _process_bulk_chunk  # noqa: F401
-from .actions import bulk, expand_action, parallel_bulk, reindex, scan, streaming_bulk
+from .actions import (
+    bulk,
+    dataframe_actions,
+    esql_record_batches,
+    expand_action,
+    parallel_bulk,
+    reindex,
+    scan,
+    streaming_bulk,
+)
 from .errors import BulkIndexError, ScanError
 
 __all__ = [
@@ -31,10 +46,13 @@ __all__ = [
     "parallel_bulk",
     "scan",
     "reindex",
+    "esql_record_batches",
+    "dataframe_actions",
     "async_scan",
     "async_bulk",
     "async_reindex",
     "async_streaming_bulk",
+    "async_esql_record_batches",
 ]
 
 fixup_module_metadata(__name__, globals())
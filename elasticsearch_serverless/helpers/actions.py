@@ -15,6 +15,7 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
 import logging
 import time
 from operator import methodcaller
@@ -34,12 +35,16 @@ from typing import (
     Union,
 )
 
-from elastic_transport import OpenTelemetrySpan
+from elastic_transport import ApiResponseMeta, ObjectApiResponse
 
 from .. import Elasticsearch
+from .._otel import OpenTelemetryHelperSpan
+from .._retry import RetryPolicy, _parse_retry_after
+from .._streaming import StreamedArray
+from .._timings import RequestTimings
 from ..compat import to_bytes
 from ..exceptions import ApiError, NotFoundError, TransportError
-from ..serializer import Serializer
+from ..serializer import Serializer, _json_serializer
 from .errors import BulkIndexError, ScanError
 
 logger = logging.getLogger("elasticsearch.helpers")
@@ -61,19 +66,22 @@ def expand_action(data: _TYPE_BULK_ACTION) -> _TYPE_BULK_ACTION_HEADER_AND_BODY:
     # when given a string, assume user wants to index raw json
     if isinstance(data, (bytes, str)):
         return {"index": {}}, to_bytes(data, "utf-8")
+    # actions of 'dataframe_actions()' are already expanded and serialized
+    if isinstance(data, _FrameAction):
+        return data.expanded
 
     # make sure we don't alter the action
     data = data.copy()
     op_type: str = data.pop("_op_type", "index")
     action: Dict[str, Any] = {op_type: {}}
 
-    # If '_source' is a dict use it for source
-    # otherwise if op_type == 'update' then
-    # '_source' should be in the metadata.
+    # If '_source' is a dict or a serialized document use it for
+    # source otherwise if op_type == 'update' then '_source'
+    # should be in the metadata.
     if (
         op_type == "update"
         and "_source" in data
-        and not isinstance(data["_source"], Mapping)
+        and not isinstance(data["_source"], (Mapping, bytes))
     ):
         action[op_type]["_source"] = data.pop("_source")
 
@@ -154,7 +162,10 @@ class _ActionChunker:
         ret = None
         raw_action = action
         raw_data = data
-        action_bytes = to_bytes(self.serializer.dumps(action), "utf-8")
+        if isinstance(action, _SerializedHeader):
+            action_bytes = action.raw
+        else:
+            action_bytes = to_bytes(self.serializer.dumps(action), "utf-8")
         # +1 to account for the trailing new line character
         cur_size = len(action_bytes) + 1
 
@@ -315,6 +326,35 @@ def _process_bulk_chunk_error(
             yield False, err
 
 
+def _retry_decision(
+    retry_policy: Optional[RetryPolicy], retryable: bool
+) -> Callable[[], bool]:
+    """Returns the function deciding whether an attempt of a bulk chunk is
+    retried. With a retry policy the decision takes a token of its budget
+    the first time the function is called, i.e. once the attempt has a
+    document to retry, so that chunks retried at the same time by other
+    threads can't spend more than the budget.
+    """
+    if retry_policy is None or not retryable:
+        return lambda: retryable
+    decision: List[bool] = []
+
+    def can_retry() -> bool:
+        if not decision:
+            decision.append(retry_policy.acquire_retry())
+        return decision[0]
+
+    return can_retry
+
+
+def _add_timings(span: OpenTelemetryHelperSpan, meta: ApiResponseMeta) -> None:
+    timings = RequestTimings.from_response(meta)
+    if timings is not None:
+        span.add("db.elasticsearch.client.serialize", timings.serialize)
+        span.add("db.elasticsearch.client.transport", timings.transport)
+        span.add("db.elasticsearch.client.deserialize", timings.deserialize)
+
+
 def _process_bulk_chunk(
     client: Elasticsearch,
     bulk_actions: List[bytes],
@@ -324,7 +364,7 @@ def _process_bulk_chunk(
             Tuple[_TYPE_BULK_ACTION_HEADER, _TYPE_BULK_ACTION_BODY],
         ]
     ],
-    otel_span: OpenTelemetrySpan,
+    otel_span: OpenTelemetryHelperSpan,
     raise_on_exception: bool = True,
     raise_on_error: bool = True,
     ignore_status: Union[int, Collection[int]] = (),
@@ -342,6 +382,7 @@ def _process_bulk_chunk(
             # send the actual request
             resp = client.bulk(*args, operations=bulk_actions, **kwargs)  # type: ignore[arg-type]
         except ApiError as e:
+            _add_timings(otel_span, e.meta)
             gen = _process_bulk_chunk_error(
                 error=e,
                 bulk_data=bulk_data,
@@ -350,6 +391,10 @@ def _process_bulk_chunk(
                 raise_on_error=raise_on_error,
             )
         else:
+            _add_timings(otel_span, resp.meta)
+            took = resp.body.get("took")
+            if took is not None:
+                otel_span.add("db.elasticsearch.took", took)
             gen = _process_bulk_chunk_success(
                 resp=resp.body,
                 bulk_data=bulk_data,
@@ -375,6 +420,7 @@ def streaming_bulk(
     yield_ok: bool = True,
     ignore_status: Union[int, Collection[int]] = (),
     span_name: str = "helpers.streaming_bulk",
+    retry_policy: Optional[RetryPolicy] = None,
     *args: Any,
     **kwargs: Any,
 ) -> Iterable[Tuple[bool, Dict[str, Any]]]:
@@ -408,15 +454,27 @@ def streaming_bulk(
         retry. Any subsequent retries will be powers of ``initial_backoff *
         2**retry_number``
     :arg max_backoff: maximum number of seconds a retry will wait
+    :arg retry_policy: :class:`~elasticsearch_serverless.RetryPolicy` used
+        instead of ``max_retries``, ``initial_backoff`` and ``max_backoff``.
+        Documents rejected with any of the policy's ``retry_on_status`` are
+        retried with jittered backoff, honoring ``Retry-After`` headers and
+        the policy's retry budget. Uses the policy for the ``bulk`` endpoint.
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
     """
     with client._otel.helpers_span(span_name) as otel_span:
+        otel_metrics = client._otel.metrics
         client = client.options()
         client._client_meta = (("h", "bp"),)
 
         serializer = client.transport.serializers.get_serializer("application/json")
 
+        retry_on_status: Collection[int] = (429,)
+        if retry_policy is not None:
+            retry_policy = retry_policy.for_endpoint("bulk")
+            max_retries = retry_policy.max_retries
+            retry_on_status = retry_policy.retry_on_status
+
         bulk_data: List[
             Union[
                 Tuple[_TYPE_BULK_ACTION_HEADER],
@@ -424,65 +482,104 @@ def streaming_bulk(
             ]
         ]
         bulk_actions: List[bytes]
-        for bulk_data, bulk_actions in _chunk_actions(
-            map(expand_action_callback, actions),
-            chunk_size,
-            max_chunk_bytes,
-            serializer,
+        for chunk, (bulk_data, bulk_actions) in enumerate(
+            _chunk_actions(
+                map(expand_action_callback, actions),
+                chunk_size,
+                max_chunk_bytes,
+                serializer,
+            )
         ):
-            for attempt in range(max_retries + 1):
-                to_retry: List[bytes] = []
-                to_retry_data: List[
-                    Union[
-                        Tuple[_TYPE_BULK_ACTION_HEADER],
-                        Tuple[_TYPE_BULK_ACTION_HEADER, _TYPE_BULK_ACTION_BODY],
-                    ]
-                ] = []
-                if attempt:
-                    time.sleep(min(max_backoff, initial_backoff * 2 ** (attempt - 1)))
-
-                try:
-                    for data, (ok, info) in zip(
-                        bulk_data,
-                        _process_bulk_chunk(
-                            client,
-                            bulk_actions,
+            with client._otel.chunk_span(
+                otel_span, f"{span_name}.chunk", chunk
+            ) as chunk_span:
+                chunk_span.add("db.elasticsearch.bulk.docs", len(bulk_data))
+                chunk_span.add(
+                    "db.elasticsearch.bulk.bytes",
+                    sum(map(len, bulk_actions)) + len(bulk_actions),
+                )
+                backoff: Optional[float] = None
+                retry_after: Optional[float] = None
+                if retry_policy is not None:
+                    retry_policy.record_request()
+                for attempt in range(max_retries + 1):
+                    to_retry: List[bytes] = []
+                    to_retry_data: List[
+                        Union[
+                            Tuple[_TYPE_BULK_ACTION_HEADER],
+                            Tuple[_TYPE_BULK_ACTION_HEADER, _TYPE_BULK_ACTION_BODY],
+                        ]
+                    ] = []
+                    if attempt:
+                        if retry_policy is None:
+                            delay = min(
+                                max_backoff, initial_backoff * 2 ** (attempt - 1)
+                            )
+                        else:
+                            backoff = delay = retry_policy.backoff(backoff, retry_after)
+                        chunk_span.add("db.elasticsearch.bulk.backoff", delay)
+                        time.sleep(delay)
+                    retry_after = None
+                    can_retry = _retry_decision(retry_policy, attempt < max_retries)
+
+                    indexed = failed = retried = 0
+                    try:
+                        for data, (ok, info) in zip(
                             bulk_data,
-                            otel_span,
-                            raise_on_exception,
-                            raise_on_error,
-                            ignore_status,
-                            *args,
-                            **kwargs,
-                        ),
-                    ):
-                        if not ok:
-                            action, info = info.popitem()
-                            # retry if retries enabled, we get 429, and we are not
-                            # in the last attempt
-                            if (
-                                max_retries
-                                and info["status"] == 429
-                                and (attempt + 1) <= max_retries
-                            ):
-                                # _process_bulk_chunk expects bytes so we need to
-                                # re-serialize the data
-                                to_retry.extend(map(serializer.dumps, data))
-                                to_retry_data.append(data)
+                            _process_bulk_chunk(
+                                client,
+                                bulk_actions,
+                                bulk_data,
+                                chunk_span,
+                                raise_on_exception,
+                                raise_on_error,
+                                ignore_status,
+                                *args,
+                                **kwargs,
+                            ),
+                        ):
+                            if not ok:
+                                action, info = info.popitem()
+                                # retry if retries enabled, we get a retryable status, and we
+                                # are not in the last attempt
+                                if info["status"] in retry_on_status and can_retry():
+                                    # _process_bulk_chunk expects bytes so we need to
+                                    # re-serialize the data
+                                    to_retry.extend(map(serializer.dumps, data))
+                                    to_retry_data.append(data)
+                                    retried += 1
+                                else:
+                                    failed += 1
+                                    yield ok, {action: info}
                             else:
-                                yield ok, {action: info}
-                        elif yield_ok:
-                            yield ok, info
+                                indexed += 1
+                                if yield_ok:
+                                    yield ok, info
 
-                except ApiError as e:
-                    # suppress 429 errors since we will retry them
-                    if attempt == max_retries or e.status_code != 429:
+                    except BulkIndexError as e:
+                        failed += len(e.errors)
                         raise
-                else:
-                    if not to_retry:
-                        break
-                    # retry only subset of documents that didn't succeed
-                    bulk_actions, bulk_data = to_retry, to_retry_data
+                    except ApiError as e:
+                        # suppress retryable errors since we will retry them
+                        if e.status_code not in retry_on_status or not can_retry():
+                            failed = len(bulk_data)
+                            raise
+                        retry_after = _parse_retry_after(
+                            e.meta.headers.get("retry-after")
+                        )
+                        retried = len(bulk_data)
+                    else:
+                        if not to_retry:
+                            break
+                        # retry only subset of documents that didn't succeed
+                        bulk_actions, bulk_data = to_retry, to_retry_data
+                    finally:
+                        chunk_span.add("db.elasticsearch.bulk.docs.failed", failed)
+                        chunk_span.add("db.elasticsearch.bulk.docs.retried", retried)
+                        if otel_metrics is not None:
+                            otel_metrics.bulk_results(
+                                span_name, indexed, failed, retried
+                            )
 
 
 def bulk(
@@ -600,25 +697,70 @@ def parallel_bulk(
             self._quick_put = self._inqueue.put
 
     with client._otel.helpers_span("helpers.parallel_bulk") as otel_span:
+        otel_metrics = client._otel.metrics
         pool = BlockingPool(thread_count)
 
+        def process_chunk(
+            indexed_chunk: Tuple[
+                int,
+                Tuple[
+                    List[
+                        Union[
+                            Tuple[_TYPE_BULK_ACTION_HEADER],
+                            Tuple[_TYPE_BULK_ACTION_HEADER, _TYPE_BULK_ACTION_BODY],
+                        ]
+                    ],
+                    List[bytes],
+                ],
+            ]
+        ) -> List[Tuple[bool, Any]]:
+            chunk, (bulk_data, bulk_actions) = indexed_chunk
+            with client._otel.chunk_span(
+                otel_span, "helpers.parallel_bulk.chunk", chunk
+            ) as chunk_span:
+                chunk_span.add("db.elasticsearch.bulk.docs", len(bulk_data))
+                chunk_span.add(
+                    "db.elasticsearch.bulk.bytes",
+                    sum(map(len, bulk_actions)) + len(bulk_actions),
+                )
+                failed = 0
+                try:
+                    result = list(
+                        _process_bulk_chunk(
+                            client,
+                            bulk_actions,
+                            bulk_data,
+                            chunk_span,
+                            ignore_status=ignore_status,  # type: ignore[misc]
+                            *args,
+                            **kwargs,
+                        )
+                    )
+                    failed = sum(1 for ok, _ in result if not ok)
+                    return result
+                except BulkIndexError as e:
+                    failed = len(e.errors)
+                    raise
+                except ApiError:
+                    failed = len(bulk_data)
+                    raise
+                finally:
+                    chunk_span.add("db.elasticsearch.bulk.docs.failed", failed)
+
         try:
             for result in pool.imap(
-                lambda bulk_chunk: list(
-                    _process_bulk_chunk(
-                        client,
-                        bulk_chunk[1],
-                        bulk_chunk[0],
-                        otel_span=otel_span,
-                        ignore_status=ignore_status,  # type: ignore[misc]
-                        *args,
-                        **kwargs,
+                process_chunk,
+                enumerate(
+                    _chunk_actions(
+                        expanded_actions, chunk_size, max_chunk_bytes, serializer
                     )
                 ),
-                _chunk_actions(
-                    expanded_actions, chunk_size, max_chunk_bytes, serializer
-                ),
             ):
+                if otel_metrics is not None:
+                    indexed = sum(1 for ok, _ in result if ok)
+                    otel_metrics.bulk_results(
+                        "helpers.parallel_bulk", indexed, len(result) - indexed, 0
+                    )
                 yield from result
 
         finally:
@@ -626,6 +768,18 @@ def parallel_bulk(
             pool.join()
 
 
+def _add_page_attributes(
+    span: OpenTelemetryHelperSpan, resp: ObjectApiResponse[Any]
+) -> None:
+    hits = resp["hits"]["hits"]
+    # Counting streamed hits would decode all of them at once.
+    if not isinstance(hits, StreamedArray):
+        span.add("db.elasticsearch.scroll.hits", len(hits))
+    if "took" in resp:
+        span.add("db.elasticsearch.took", resp["took"])
+    _add_timings(span, resp.meta)
+
+
 def scan(
     client: Elasticsearch,
     query: Optional[Any] = None,
@@ -636,6 +790,7 @@ def scan(
     request_timeout: Optional[float] = None,
     clear_scroll: bool = True,
     scroll_kwargs: Optional[MutableMapping[str, Any]] = None,
+    stream_hits: bool = False,
     **kwargs: Any,
 ) -> Iterable[Dict[str, Any]]:
     """
@@ -666,6 +821,9 @@ def scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~elasticsearch.Elasticsearch.scroll`
+    :arg stream_hits: decode the hits of each page one at a time while
+        they're yielded instead of all at once, lowering the peak memory
+        of large pages. See the ``stream_path`` option of the client.
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~elasticsearch.Elasticsearch.search` call::
@@ -696,77 +854,89 @@ def scan(
                 pass
         return transport_kwargs
 
-    client = client.options(
-        request_timeout=request_timeout, **pop_transport_kwargs(kwargs)
-    )
-    client._client_meta = (("h", "s"),)
-
-    # Setting query={"from": ...} would make 'from' be used
-    # as a keyword argument instead of 'from_'. We handle that here.
-    def normalize_from_keyword(kw: MutableMapping[str, Any]) -> None:
-        if "from" in kw:
-            kw["from_"] = kw.pop("from")
-
-    normalize_from_keyword(kwargs)
-    try:
-        search_kwargs = query.copy() if query else {}
-        normalize_from_keyword(search_kwargs)
-        search_kwargs.update(kwargs)
-        search_kwargs["scroll"] = scroll
-        search_kwargs["size"] = size
-        resp = client.search(**search_kwargs)
-
-    # Try the old deprecated way if we fail immediately on parameters.
-    except TypeError:
-        search_kwargs = kwargs.copy()
-        search_kwargs["scroll"] = scroll
-        search_kwargs["size"] = size
-        resp = client.search(body=query, **search_kwargs)
-
-    scroll_id = resp.get("_scroll_id")
-    scroll_transport_kwargs = pop_transport_kwargs(scroll_kwargs)
-    if scroll_transport_kwargs:
-        scroll_client = client.options(**scroll_transport_kwargs)
-    else:
-        scroll_client = client
+    with client._otel.helpers_span("helpers.scan") as otel_span:
+        transport_kwargs = pop_transport_kwargs(kwargs)
+        if stream_hits:
+            transport_kwargs["stream_path"] = ("hits", "hits")
+        client = client.options(request_timeout=request_timeout, **transport_kwargs)
+        client._client_meta = (("h", "s"),)
+
+        # Setting query={"from": ...} would make 'from' be used
+        # as a keyword argument instead of 'from_'. We handle that here.
+        def normalize_from_keyword(kw: MutableMapping[str, Any]) -> None:
+            if "from" in kw:
+                kw["from_"] = kw.pop("from")
+
+        normalize_from_keyword(kwargs)
+        with client._otel.chunk_span(otel_span, "helpers.scan.page", 0) as page_span:
+            with client._otel.use_span(page_span):
+                try:
+                    search_kwargs = query.copy() if query else {}
+                    normalize_from_keyword(search_kwargs)
+                    search_kwargs.update(kwargs)
+                    search_kwargs["scroll"] = scroll
+                    search_kwargs["size"] = size
+                    resp = client.search(**search_kwargs)
+
+                # Try the old deprecated way if we fail immediately on parameters.
+                except TypeError:
+                    search_kwargs = kwargs.copy()
+                    search_kwargs["scroll"] = scroll
+                    search_kwargs["size"] = size
+                    resp = client.search(body=query, **search_kwargs)
+            _add_page_attributes(page_span, resp)
+
+        scroll_id = resp.get("_scroll_id")
+        scroll_transport_kwargs = pop_transport_kwargs(scroll_kwargs)
+        if scroll_transport_kwargs:
+            scroll_client = client.options(**scroll_transport_kwargs)
+        else:
+            scroll_client = client
 
-    try:
-        while scroll_id and resp["hits"]["hits"]:
-            yield from resp["hits"]["hits"]
-
-            # Default to 0 if the value isn't included in the response
-            shards_info: Dict[str, int] = resp["_shards"]
-            shards_successful = shards_info.get("successful", 0)
-            shards_skipped = shards_info.get("skipped", 0)
-            shards_total = shards_info.get("total", 0)
-
-            # check if we have any errors
-            if (shards_successful + shards_skipped) < shards_total:
-                shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
-                logger.warning(
-                    shards_message,
-                    shards_successful,
-                    shards_skipped,
-                    shards_total,
-                )
-                if raise_on_error:
-                    raise ScanError(
-                        scroll_id,
-                        shards_message
-                        % (
-                            shards_successful,
-                            shards_skipped,
-                            shards_total,
-                        ),
+        page = 0
+        try:
+            while scroll_id and resp["hits"]["hits"]:
+                yield from resp["hits"]["hits"]
+
+                # Default to 0 if the value isn't included in the response
+                shards_info: Dict[str, int] = resp["_shards"]
+                shards_successful = shards_info.get("successful", 0)
+                shards_skipped = shards_info.get("skipped", 0)
+                shards_total = shards_info.get("total", 0)
+
+                # check if we have any errors
+                if (shards_successful + shards_skipped) < shards_total:
+                    shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
+                    logger.warning(
+                        shards_message,
+                        shards_successful,
+                        shards_skipped,
+                        shards_total,
                     )
-            resp = scroll_client.scroll(
-                scroll_id=scroll_id, scroll=scroll, **scroll_kwargs
-            )
-            scroll_id = resp.get("_scroll_id")
+                    if raise_on_error:
+                        raise ScanError(
+                            scroll_id,
+                            shards_message
+                            % (
+                                shards_successful,
+                                shards_skipped,
+                                shards_total,
+                            ),
+                        )
+                page += 1
+                with client._otel.chunk_span(
+                    otel_span, "helpers.scan.page", page
+                ) as page_span:
+                    with client._otel.use_span(page_span):
+                        resp = scroll_client.scroll(
+                            scroll_id=scroll_id, scroll=scroll, **scroll_kwargs
+                        )
+                    _add_page_attributes(page_span, resp)
+                scroll_id = resp.get("_scroll_id")
 
-    finally:
-        if scroll_id and clear_scroll:
-            client.options(ignore_status=404).clear_scroll(scroll_id=scroll_id)
+        finally:
+            if scroll_id and clear_scroll:
+                client.options(ignore_status=404).clear_scroll(scroll_id=scroll_id)
 
 
 def reindex(
@@ -857,3 +1027,285 @@ def reindex(
         chunk_size=chunk_size,
         **kwargs,
     )
+
+
+def esql_record_batches(
+    client: Elasticsearch, query: str, **kwargs: Any
+) -> Iterator[Any]:
+    """
+    Runs an ES|QL query and yields the ``pyarrow.RecordBatch`` objects of its
+    Arrow response. With a client whose ``PyArrowSerializer`` has
+    ``streaming=True`` the batches are decoded one at a time, otherwise they're
+    the batches of the decoded table. Batches convert to pandas with
+    ``batch.to_pandas()`` and to polars with ``polars.from_arrow(batch)``
+    without copying the data of most column types.
+
+    .. code-block:: python
+
+        for batch in esql_record_batches(client, "FROM logs | LIMIT 1000000"):
+            process(batch.to_pandas())
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg query: the ES|QL query
+
+    Any additional keyword arguments will be passed to
+    :meth:`~elasticsearch.Elasticsearch.esql.query`, requires pyarrow.
+    """
+    resp = client.esql.query(query=query, format="arrow", **kwargs)
+    yield from _record_batches(resp.body)
+
+
+def _record_batches(body: Any) -> Iterator[Any]:
+    # A table is returned by the default 'PyArrowSerializer'
+    # and a record batch reader with 'streaming=True'.
+    if hasattr(body, "to_batches"):
+        yield from body.to_batches()
+    else:
+        with body:
+            yield from body
+
+
+def dataframe_actions(
+    frame: Any,
+    index: Optional[str] = None,
+    index_column: Optional[str] = None,
+    id_column: Optional[str] = None,
+    op_type: str = "index",
+    op_type_column: Optional[str] = None,
+    batch_size: int = 10000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turns the rows of a ``pandas.DataFrame``, a ``polars.DataFrame`` or a
+    ``pyarrow.Table`` into actions for the bulk helpers. The documents are
+    serialized to JSON column by column instead of row by row, which is
+    several times faster than serializing a dictionary per row.
+
+    .. code-block:: python
+
+        bulk(es, dataframe_actions(df, index="books", id_column="isbn"))
+
+    Missing values, like ``NaN``, ``NaT``, ``None`` and ``pd.NA``, are
+    serialized as ``null``, and so are infinite floats. ``None`` and
+    ``pd.NA`` are serialized like by the JSON serializers, and ``NaN`` and
+    infinite floats like by ``OrjsonSerializer``, since ``JsonSerializer``
+    writes them as ``NaN`` and ``Infinity`` which Elasticsearch rejects. The
+    serializers raise ``SerializationError`` for ``NaT`` values instead.
+    Datetimes without a timezone are serialized in ISO 8601 with the
+    precision of their column.
+    The columns used for the index, id and operation of the documents aren't
+    included in the documents.
+
+    :arg frame: the ``pandas.DataFrame``, ``polars.DataFrame`` or
+        ``pyarrow.Table`` to index, requires numpy
+    :arg index: index of all documents
+    :arg index_column: column with the index of each document
+    :arg id_column: column with the ``_id`` of each document, documents with
+        a missing id get an id generated by Elasticsearch
+    :arg op_type: operation of all documents, ``index`` by default,
+        ``create``, ``update`` to update documents with the values of the
+        row or ``delete``
+    :arg op_type_column: column with the operation of each document
+    :arg batch_size: number of rows serialized at once
+    """
+    table = _frame_table(frame)
+    meta_columns = {index_column, id_column, op_type_column}
+    names = [name for name in table.names if name not in meta_columns]
+    template = _document_template(names)
+
+    for start in range(0, table.num_rows, batch_size):
+        stop = min(start + batch_size, table.num_rows)
+        fragments = [
+            _json_fragments(*table.column(name, start, stop)) for name in names
+        ]
+        indices = _meta_values(table, index_column, start, stop)
+        ids = _meta_values(table, id_column, start, stop)
+        op_types = _meta_values(table, op_type_column, start, stop)
+
+        rows = zip(*fragments) if names else [()] * (stop - start)
+        for i, row in enumerate(rows):
+            row_op_type = op_types[i] if op_types is not None else op_type
+            meta: Dict[str, Any] = {}
+            members = []
+            row_index = indices[i] if indices is not None else index
+            if row_index is not None:
+                meta["_index"] = row_index
+                members.append('"_index":' + _encode_string(row_index))
+            if ids is not None and ids[i] is not None:
+                meta["_id"] = ids[i]
+                members.append('"_id":' + _encode_string(ids[i]))
+            header = _SerializedHeader({row_op_type: meta})
+            header.raw = (
+                "{%s:{%s}}" % (_encode_string(row_op_type), ",".join(members))
+            ).encode("utf-8", "surrogatepass")
+
+            body: Optional[bytes] = None
+            if row_op_type == "update":
+                body = b'{"doc":%s}' % _encode_document(template, row)
+            elif row_op_type != "delete":
+                body = _encode_document(template, row)
+            action = _FrameAction(_op_type=row_op_type, **meta)
+            if body is not None:
+                action["_source"] = body
+            action.expanded = (header, body)
+            yield action
+
+
+class _FrameAction(Dict[str, Any]):
+    """Action of 'dataframe_actions()' along with its expanded header and body"""
+
+    __slots__ = ("expanded",)
+    expanded: _TYPE_BULK_ACTION_HEADER_AND_BODY
+
+
+class _SerializedHeader(Dict[str, Any]):
+    """Action line of a bulk request along with its serialized JSON"""
+
+    __slots__ = ("raw",)
+    raw: bytes
+
+
+def _encode_document(template: str, row: Tuple[str, ...]) -> bytes:
+    return (template % row).encode("utf-8", "surrogatepass")
+
+
+class _FrameTable:
+    """Columns of a pandas DataFrame or a pyarrow Table as numpy
+    arrays or lists, along with the mask of their missing values.
+    """
+
+    def __init__(self, frame: Any, arrow: bool) -> None:
+        self.frame = frame
+        self.arrow = arrow
+        self.names: List[Any] = list(frame.column_names if arrow else frame.columns)
+        self.num_rows: int = frame.num_rows if arrow else len(frame)
+
+    def column(self, name: Any, start: int, stop: int) -> Tuple[Any, Any]:
+        if self.arrow:
+            return _arrow_column(self.frame.column(name).slice(start, stop - start))
+        return _pandas_column(self.frame[name].iloc[start:stop])
+
+
+def _frame_table(frame: Any) -> _FrameTable:
+    module = type(frame).__module__.split(".")[0]
+    if module == "pandas":
+        return _FrameTable(frame, arrow=False)
+    elif module == "polars":
+        return _FrameTable(frame.to_arrow(), arrow=True)
+    elif module == "pyarrow":
+        return _FrameTable(frame, arrow=True)
+    raise TypeError(
+        "'frame' must be a pandas DataFrame, a polars DataFrame or a pyarrow Table"
+    )
+
+
+def _pandas_column(series: Any) -> Tuple[Any, Any]:
+    import numpy as np
+
+    mask = series.isna().to_numpy()
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufM":
+        values = series.to_numpy()
+    # Nullable extension dtypes, e.g. 'Int64', 'Float64' and 'boolean'
+    elif getattr(dtype, "numpy_dtype", None) is not None and (
+        dtype.numpy_dtype.kind in "biuf"
+    ):
+        values = series.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+    else:
+        values = series.tolist()
+    return values, mask if mask.any() else None
+
+
+def _arrow_column(column: Any) -> Tuple[Any, Any]:
+    import pyarrow as pa
+
+    mask = (
+        column.is_null().to_numpy(zero_copy_only=False) if column.null_count else None
+    )
+    kind = column.type
+    if (
+        pa.types.is_integer(kind)
+        or pa.types.is_floating(kind)
+        or pa.types.is_boolean(kind)
+        or (pa.types.is_timestamp(kind) and kind.tz is None)
+        or pa.types.is_date(kind)
+    ):
+        if mask is not None:
+            fill = False if pa.types.is_boolean(kind) else 0
+            column = column.fill_null(pa.scalar(fill, type=kind))
+        values = column.to_numpy(zero_copy_only=False)
+        # Dates are converted to datetime64[ms]
+        if pa.types.is_date(kind):
+            values = values.astype("datetime64[D]")
+    else:
+        values = column.to_pylist()
+    return values, mask
+
+
+def _json_fragments(values: Any, mask: Any) -> List[str]:
+    """Serializes the values of a column to JSON"""
+    import numpy as np
+
+    kind = values.dtype.kind if isinstance(values, np.ndarray) else "O"
+    if kind in "iu":
+        fragments = values.astype(str)
+    elif kind == "f":
+        # 'str()' of floats is their shortest representation,
+        # which is valid JSON except for NaN and infinity.
+        finite = np.isfinite(values)
+        if not finite.all():
+            mask = ~finite if mask is None else mask | ~finite
+        fragments = values.astype(str)
+    elif kind == "b":
+        fragments = np.where(values, "true", "false")
+    elif kind == "M":
+        missing = np.isnat(values)
+        if missing.any():
+            mask = missing if mask is None else mask | missing
+        fragments = np.char.add(np.char.add('"', np.datetime_as_string(values)), '"')
+    else:
+        encode = _fragment_encoder.encode
+        if mask is None:
+            return [encode(value) for value in values]
+        return [
+            "null" if missing else encode(value) for value, missing in zip(values, mask)
+        ]
+
+    if mask is not None:
+        fragments = np.where(mask, "null", fragments)
+    return fragments.tolist()  # type: ignore[no-any-return]
+
+
+def _meta_values(
+    table: _FrameTable, name: Optional[str], start: int, stop: int
+) -> Optional[List[Any]]:
+    """Values of a column used for the metadata of documents,
+    'None' for missing values.
+    """
+    if name is None:
+        return None
+    values, mask = table.column(name, start, stop)
+    values = values.tolist() if not isinstance(values, list) else values
+    values = [
+        value if isinstance(value, str) or value is None else str(value)
+        for value in values
+    ]
+    if mask is not None:
+        values = [None if missing else value for value, missing in zip(values, mask)]
+    return values
+
+
+def _document_template(names: List[Any]) -> str:
+    """Format string of the JSON documents of rows
+    given the JSON fragments of their values.
+    """
+    members = (
+        _fragment_encoder.encode(str(name)).replace("%", "%%") + ":%s" for name in names
+    )
+    return "{" + ",".join(members) + "}"
+
+
+_encode_string: Callable[[str], str] = json.encoder.encode_basestring
+# Same output as 'JsonSerializer' for the values of columns
+_fragment_encoder = json.JSONEncoder(
+    default=_json_serializer.default, ensure_ascii=False, separators=(",", ":")
+)
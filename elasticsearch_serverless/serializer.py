@@ -15,10 +15,13 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import re
+import sys
 import uuid
+from contextvars import ContextVar
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, ClassVar, Dict, Tuple
+from typing import Any, Callable, ClassVar, Dict, Optional
 
 from elastic_transport import JsonSerializer as _JsonSerializer
 from elastic_transport import NdjsonSerializer as _NdjsonSerializer
@@ -42,12 +45,28 @@ __all__ = [
 ]
 
 try:
+    import orjson
     from elastic_transport import OrjsonSerializer as _OrjsonSerializer
 
     __all__.append("OrjsonSerializer")
 except ImportError:
+    orjson = None  # type: ignore[assignment]
     _OrjsonSerializer = None  # type: ignore[assignment,misc]
 
+try:
+    import msgspec
+
+    __all__.append("MsgspecSerializer")
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    import cbor2
+
+    __all__.append("CborSerializer")
+except ImportError:
+    cbor2 = None  # type: ignore[assignment]
+
 try:
     import pyarrow as pa
 
@@ -56,42 +75,143 @@ except ImportError:
     pa = None
 
 
+# Decoder of JSON responses used instead of the serializer's own, set by
+# clients while performing requests with the 'source_type' or 'stream_path'
+# options. Responses the decoder can't decode are decoded as usual.
+_response_decoder: ContextVar[Optional[Callable[[bytes], Any]]] = ContextVar(
+    "_response_decoder", default=None
+)
+
+
 class JsonSerializer(_JsonSerializer):
+    """JSON serializer relying on the standard library json module.
+
+    With ``hex_byte_vectors=True`` one-dimensional numpy arrays of ``int8``
+    values are serialized as hex strings, which Elasticsearch accepts for
+    ``dense_vector`` fields with the ``byte`` and ``bit`` element types and
+    which are about half the size of a JSON array.
+    """
+
     mimetype: ClassVar[str] = "application/json"
+    hex_byte_vectors: bool = False
 
-    def default(self, data: Any) -> Any:
-        if isinstance(data, TIME_TYPES):
-            # Little hack to avoid importing pandas but to not
-            # return 'NaT' string for pd.NaT as that's not a valid
-            # Elasticsearch date.
-            formatted_data = data.isoformat()
-            if formatted_data != "NaT":
-                return formatted_data
-
-        if isinstance(data, uuid.UUID):
-            return str(data)
-        elif isinstance(data, FLOAT_TYPES):
-            return float(data)
-
-        # This is kept for backwards compatibility even
-        # if 'INTEGER_TYPES' isn't used by default anymore.
-        elif INTEGER_TYPES and isinstance(data, INTEGER_TYPES):
-            return int(data)
-
-        # Special cases for numpy and pandas types
-        # These are expensive to import so we try them last.
-        serialized, value = _attempt_serialize_numpy_or_pandas(data)
-        if serialized:
-            return value
+    def __init__(self, *, hex_byte_vectors: bool = False) -> None:
+        self.hex_byte_vectors = hex_byte_vectors
 
-        raise TypeError(f"Unable to serialize {data!r} (type: {type(data)})")
+    def loads(self, data: bytes) -> Any:
+        decoder = _response_decoder.get()
+        if decoder is not None:
+            try:
+                return decoder(data)
+            # Error responses don't match the decoder and are decoded as usual.
+            except ValueError:
+                pass
+        return super().loads(data)
+
+    def default(self, data: Any) -> Any:
+        if self.hex_byte_vectors:
+            byte_vector = _hex_byte_vector(data)
+            if byte_vector is not None:
+                return byte_vector
+
+        # Converters are looked up by the exact type of the value
+        # and resolved with 'isinstance()' checks on first sight.
+        data_type = type(data)
+        converter = _converters.get(data_type)
+        if converter is None:
+            converter = _resolve_converter(data_type)
+            if converter is None:
+                raise TypeError(f"Unable to serialize {data!r} (type: {type(data)})")
+            _converters[data_type] = converter
+        return converter(data)
+
+    @staticmethod
+    def register_type(data_type: type, converter: Callable[[Any], Any]) -> None:
+        """Registers how values of a type, and of its subclasses, which
+        can't be serialized natively are converted, e.g. to a string.
+        Registered types take precedence over the built-in conversions:
+
+        .. code-block:: python
+
+            JsonSerializer.register_type(ipaddress.IPv4Address, str)
+
+        The registry is global to the process, not to a serializer or a
+        client: the conversion is used by every JSON and NDJSON serializer
+        of every client, including the ones created before the call. Use a
+        serializer with its own ``default()`` to convert a type differently
+        for one client.
+        """
+        _registered_converters[data_type] = converter
+        _converters.clear()
+        _orjson_converters.clear()
 
 
 if _OrjsonSerializer is not None:
 
     class OrjsonSerializer(JsonSerializer, _OrjsonSerializer):
+        """JSON serializer relying on the orjson package.
+
+        Dates, datetimes, UUIDs, numpy scalars and numpy arrays are serialized
+        natively by orjson, like dictionaries with non-string keys. Numeric
+        numpy arrays which aren't contiguous and numeric pandas series are
+        handed back to orjson as contiguous arrays instead of lists.
+        """
+
+        # Options producing the same JSON as 'JsonSerializer'
+        # for the values it supports.
+        option: int = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+        def __init__(self, *, hex_byte_vectors: bool = False) -> None:
+            super().__init__(hex_byte_vectors=hex_byte_vectors)
+            if hex_byte_vectors:
+                # Arrays are handed to 'default()' to find the byte vectors.
+                self.option = self.option & ~orjson.OPT_SERIALIZE_NUMPY
+
+        def json_dumps(self, data: Any) -> bytes:
+            return orjson.dumps(data, default=self.default, option=self.option)
+
         def default(self, data: Any) -> Any:
-            return JsonSerializer.default(self, data)
+            if self.hex_byte_vectors and _is_array(data):
+                byte_vector = _hex_byte_vector(data)
+                if byte_vector is not None:
+                    return byte_vector
+                return _array_tolist(data)
+
+            data_type = type(data)
+            converter = _orjson_converters.get(data_type)
+            if converter is None:
+                converter = _resolve_converter(data_type, native_numpy=True)
+                if converter is None:
+                    raise TypeError(
+                        f"Unable to serialize {data!r} (type: {type(data)})"
+                    )
+                _orjson_converters[data_type] = converter
+            return converter(data)
+
+
+if msgspec is not None:
+
+    class MsgspecSerializer(JsonSerializer):
+        """JSON serializer relying on the msgspec package.
+
+        Dates, datetimes, UUIDs and decimals are serialized natively by
+        msgspec, datetimes in UTC with a ``Z`` suffix instead of ``+00:00``,
+        and conversions registered for these types aren't used. Other values,
+        like numpy and pandas values, are converted like with ``JsonSerializer``.
+        """
+
+        def __init__(self, *, hex_byte_vectors: bool = False) -> None:
+            super().__init__(hex_byte_vectors=hex_byte_vectors)
+            self._encoder = msgspec.json.Encoder(
+                enc_hook=self.default, decimal_format="number"
+            )
+            self._decoder = msgspec.json.Decoder()
+
+        def json_dumps(self, data: Any) -> bytes:
+            return self._encoder.encode(data)
+
+        def json_loads(self, data: bytes) -> Any:
+            return self._decoder.decode(data)
 
 
 class NdjsonSerializer(JsonSerializer, _NdjsonSerializer):
@@ -101,6 +221,47 @@ class NdjsonSerializer(JsonSerializer, _NdjsonSerializer):
         return JsonSerializer.default(self, data)
 
 
+if _OrjsonSerializer is not None:
+
+    # Numbers orjson writes differently than the standard library, in
+    # the output of '_AutoOrjsonSerializer': exponents without a sign or
+    # leading zeros, e.g. '1e16' for '1e+16', values below 1e-4 without
+    # an exponent, e.g. '0.00001' for '1e-05', and 'null' for NaN and
+    # infinity. Strings containing these are matched as well.
+    _orjson_divergent_numbers = re.compile(
+        rb"(?:^|[:,\[])(?:-?[0-9]+(?:\.[0-9]+)?e|-?0\.0000|null)"
+    )
+
+    class _AutoOrjsonSerializer(OrjsonSerializer):
+        # Produces the same JSON as 'JsonSerializer' for every value it
+        # accepts, as used with 'serializer="auto"'. Datetimes, numpy values
+        # and any other value which isn't a plain JSON type are converted
+        # by 'JsonSerializer.default()'. Documents orjson refuses, like
+        # integers above 64 bits and strings with lone surrogates, and
+        # documents with numbers orjson writes differently are serialized
+        # by the standard library instead.
+        option: int = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+        def json_dumps(self, data: Any) -> bytes:
+            try:
+                encoded = orjson.dumps(data, default=self.default, option=self.option)
+            except orjson.JSONEncodeError:
+                return _JsonSerializer.json_dumps(self, data)
+            if _orjson_divergent_numbers.search(encoded) is not None:
+                return _JsonSerializer.json_dumps(self, data)
+            return encoded
+
+        def default(self, data: Any) -> Any:
+            return JsonSerializer.default(self, data)
+
+    class _AutoOrjsonNdjsonSerializer(_AutoOrjsonSerializer, NdjsonSerializer):
+        mimetype: ClassVar[str] = "application/x-ndjson"
+
+
 class CompatibilityModeJsonSerializer(JsonSerializer):
     mimetype: ClassVar[str] = "application/vnd.elasticsearch+json"
 
@@ -121,16 +282,60 @@ class MapboxVectorTileSerializer(Serializer):
         raise SerializationError(f"Cannot serialize {data!r} into a MapBox vector tile")
 
 
+if cbor2 is not None:
+
+    class CborSerializer(Serializer):
+        """CBOR serializer relying on the cbor2 package, for deserializing
+        responses requested with ``response_format="cbor"``.
+        """
+
+        mimetype: ClassVar[str] = "application/cbor"
+
+        def loads(self, data: bytes) -> Any:
+            if data == b"":
+                return None
+            try:
+                return cbor2.loads(data)
+            except (cbor2.CBORDecodeError, ValueError, TypeError) as e:
+                raise SerializationError(
+                    message=f"Unable to deserialize as CBOR: {data!r}", errors=(e,)
+                )
+
+        def dumps(self, data: Any) -> bytes:
+            # Request bodies are sent as JSON, only encoded bodies are forwarded.
+            if isinstance(data, bytes):
+                return data
+            raise SerializationError(
+                message=f"Unable to serialize to CBOR: {data!r} (type: {type(data).__name__})"
+            )
+
+
 if pa is not None:
 
     class PyArrowSerializer(Serializer):
-        """PyArrow serializer for deserializing Arrow Stream data."""
+        """PyArrow serializer for deserializing Arrow Stream data.
+
+        With ``streaming=True`` a ``pyarrow.ipc.RecordBatchStreamReader`` is
+        returned instead of a ``pyarrow.Table``, which decodes the record
+        batches one at a time as it's iterated. Besides bytes, the data
+        can be any readable binary file, like a streamed HTTP body.
+        """
 
         mimetype: ClassVar[str] = "application/vnd.apache.arrow.stream"
 
-        def loads(self, data: bytes) -> pa.Table:
+        def __init__(self, streaming: bool = False) -> None:
+            self.streaming = streaming
+
+        def loads(self, data: Any) -> Any:
+            # Batches are read from the body without copying it.
+            source = data
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                source = pa.py_buffer(data)
             try:
-                with pa.ipc.open_stream(data) as reader:
+                reader = pa.ipc.open_stream(source)
+                if self.streaming:
+                    return reader
+                with reader:
                     return reader.read_all()
             except pa.ArrowException as e:
                 raise SerializationError(
@@ -152,6 +357,8 @@ DEFAULT_SERIALIZERS: Dict[str, Serializer] = {
     CompatibilityModeNdjsonSerializer.mimetype: CompatibilityModeNdjsonSerializer(),
 }
 
+if cbor2 is not None:
+    DEFAULT_SERIALIZERS[CborSerializer.mimetype] = CborSerializer()
 if pa is not None:
     DEFAULT_SERIALIZERS[PyArrowSerializer.mimetype] = PyArrowSerializer()
 
@@ -159,35 +366,99 @@ if pa is not None:
 # Alias for backwards compatibility
 JSONSerializer = JsonSerializer
 
+_json_serializer = JsonSerializer()
 
-def _attempt_serialize_numpy_or_pandas(data: Any) -> Tuple[bool, Any]:
-    """Attempts to serialize a value from the numpy or pandas libraries.
-    This function is separate from JSONSerializer because the inner functions
-    are rewritten to be no-ops if either library isn't available to avoid
-    attempting to import and raising an ImportError over and over again.
 
-    Returns a tuple of (bool, Any) where the bool corresponds to whether
-    the second value contains a properly serialized value and thus
-    should be returned by JSONSerializer.default().
+def _auto_serializers() -> Dict[str, Serializer]:
+    """Returns the serializers of the JSON and NDJSON mimetypes,
+    including the compatibility mode ones, backed by orjson if it's
+    installed. Used with 'serializer="auto"'. msgspec isn't used as it
+    writes datetimes, decimals and NaN differently than the standard
+    library, which the auto serializers must not.
     """
-    serialized, value = _attempt_serialize_numpy(data)
-    if serialized:
-        return serialized, value
-
-    serialized, value = _attempt_serialize_pandas(data)
-    if serialized:
-        return serialized, value
-
-    return False, None
+    if _OrjsonSerializer is not None:
+        json_serializer: Serializer = _AutoOrjsonSerializer()
+        ndjson_serializer: Serializer = _AutoOrjsonNdjsonSerializer()
+    else:
+        json_serializer = JsonSerializer()
+        ndjson_serializer = NdjsonSerializer()
+    return {
+        JsonSerializer.mimetype: json_serializer,
+        NdjsonSerializer.mimetype: ndjson_serializer,
+        CompatibilityModeJsonSerializer.mimetype: json_serializer,
+        CompatibilityModeNdjsonSerializer.mimetype: ndjson_serializer,
+    }
+
+
+# msgspec decoders of typed responses, by response type
+_typed_decoders: Dict[Any, Any] = {}
+
+
+def _typed_decoder(response_type: Any) -> Any:
+    decoder = _typed_decoders.get(response_type)
+    if decoder is None:
+        decoder = _typed_decoders[response_type] = msgspec.json.Decoder(response_type)
+    return decoder
+
+
+# Converters of types which were already seen, by exact type
+_converters: Dict[type, Callable[[Any], Any]] = {}
+# Converters of types which orjson can't serialize natively
+_orjson_converters: Dict[type, Callable[[Any], Any]] = {}
+# Converters registered with 'JsonSerializer.register_type()'
+_registered_converters: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _resolve_converter(
+    data_type: type, native_numpy: bool = False
+) -> Optional[Callable[[Any], Any]]:
+    """Returns the converter of values of a type which can't be serialized
+    natively, or 'None' if the type isn't supported. With 'native_numpy'
+    numeric arrays are converted to arrays orjson serializes natively.
+    """
+    for registered_type, converter in _registered_converters.items():
+        if issubclass(data_type, registered_type):
+            return converter
+
+    if native_numpy:
+        native_converter = _resolve_native_numpy_converter(data_type)
+        if native_converter is not None:
+            return native_converter
+
+    if issubclass(data_type, TIME_TYPES):
+        return _isoformat
+    elif issubclass(data_type, uuid.UUID):
+        return str
+    elif issubclass(data_type, FLOAT_TYPES):
+        return float
+
+    # This is kept for backwards compatibility even
+    # if 'INTEGER_TYPES' isn't used by default anymore.
+    elif INTEGER_TYPES and issubclass(data_type, INTEGER_TYPES):
+        return int
+
+    # Special cases for numpy and pandas types
+    # These are expensive to import so we try them last.
+    return _resolve_numpy_converter(data_type) or _resolve_pandas_converter(data_type)
+
+
+def _isoformat(data: Any) -> Any:
+    # Little hack to avoid importing pandas but to not
+    # return 'NaT' string for pd.NaT as that's not a valid
+    # Elasticsearch date.
+    formatted_data = data.isoformat()
+    if formatted_data == "NaT":
+        raise TypeError(f"Unable to serialize {data!r} (type: {type(data)})")
+    return formatted_data
 
 
-def _attempt_serialize_numpy(data: Any) -> Tuple[bool, Any]:
-    global _attempt_serialize_numpy
+def _resolve_numpy_converter(data_type: type) -> Optional[Callable[[Any], Any]]:
+    global _resolve_numpy_converter
     try:
         import numpy as np
 
-        if isinstance(
-            data,
+        if issubclass(
+            data_type,
             (
                 np.int_,
                 np.intc,
@@ -201,50 +472,131 @@ def _attempt_serialize_numpy(data: Any) -> Tuple[bool, Any]:
                 np.uint64,
             ),
         ):
-            return True, int(data)
-        elif isinstance(
-            data,
-            (
-                np.float16,
-                np.float32,
-                np.float64,
-            ),
-        ):
-            return True, float(data)
-        elif isinstance(data, np.bool_):
-            return True, bool(data)
-        elif isinstance(data, np.datetime64):
-            return True, data.item().isoformat()
-        elif isinstance(data, np.ndarray):
-            return True, data.tolist()
+            return int
+        elif issubclass(data_type, (np.float16, np.float32)):
+            return _short_float
+        elif issubclass(data_type, np.float64):
+            return float
+        elif issubclass(data_type, np.bool_):
+            return bool
+        elif issubclass(data_type, np.datetime64):
+            return _numpy_datetime
+        elif issubclass(data_type, np.ndarray):
+            return _array_tolist
 
     except ImportError:
         # Since we failed to import 'numpy' we don't want to try again.
-        _attempt_serialize_numpy = _attempt_serialize_noop
+        _resolve_numpy_converter = _resolve_noop
 
-    return False, None
+    return None
 
 
-def _attempt_serialize_pandas(data: Any) -> Tuple[bool, Any]:
-    global _attempt_serialize_pandas
+def _resolve_pandas_converter(data_type: type) -> Optional[Callable[[Any], Any]]:
+    global _resolve_pandas_converter
     try:
         import pandas as pd
 
-        if isinstance(data, (pd.Series, pd.Categorical)):
-            return True, data.tolist()
-        elif isinstance(data, pd.Timestamp) and data is not getattr(pd, "NaT", None):
-            return True, data.isoformat()
-        elif data is getattr(pd, "NA", None):
-            return True, None
+        if issubclass(data_type, (pd.Series, pd.Categorical)):
+            return _tolist
+        elif hasattr(pd, "NA") and issubclass(data_type, type(pd.NA)):
+            return _none
 
     except ImportError:
         # Since we failed to import 'pandas' we don't want to try again.
-        _attempt_serialize_pandas = _attempt_serialize_noop
+        _resolve_pandas_converter = _resolve_noop
+
+    return None
+
+
+def _resolve_native_numpy_converter(
+    data_type: type,
+) -> Optional[Callable[[Any], Any]]:
+    # Only called for orjson, so numpy and pandas are only
+    # imported if they're already used by the application.
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and issubclass(data_type, numpy.ndarray):
+        return _native_array
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and issubclass(data_type, pandas.Series):
+        return _native_series
+    return None
+
+
+def _native_array(data: Any) -> Any:
+    # orjson falls back to 'default()' for arrays which aren't contiguous
+    # or have a dtype it doesn't support natively, e.g. float16.
+    dtype = data.dtype
+    if (dtype.kind in "biu" or (dtype.kind == "f" and dtype.itemsize in (4, 8))) and (
+        not data.flags.c_contiguous or not dtype.isnative
+    ):
+        import numpy as np
+
+        return np.ascontiguousarray(data, dtype=dtype.newbyteorder("="))
+    return _array_tolist(data)
+
+
+def _native_series(data: Any) -> Any:
+    import numpy as np
+
+    # Datetimes and timedeltas would be serialized as integers by orjson,
+    # so only numeric series are serialized as arrays.
+    if isinstance(data.dtype, np.dtype) and data.dtype.kind in "biuf":
+        return _native_array(data.to_numpy())
+    return data.tolist()
+
+
+def _numpy_datetime(data: Any) -> Any:
+    return data.item().isoformat()
+
+
+def _tolist(data: Any) -> Any:
+    return data.tolist()
+
+
+def _array_tolist(data: Any) -> Any:
+    # float32 and float16 values are written with their shortest
+    # representation, e.g. 0.1 instead of 0.10000000149011612 for the
+    # float64 value of 0.1 in float32, which Elasticsearch reads back
+    # as the same value. orjson formats finite float32 arrays straight
+    # from the array, otherwise numpy formats them, which is slower but
+    # gives the same values, including for float16, NaN and infinity.
+    dtype = data.dtype
+    if dtype.kind == "f" and dtype.itemsize < 8:
+        if data.ndim == 0:
+            return _short_float(data[()])
+        import numpy as np
+
+        if orjson is not None and dtype.itemsize == 4 and np.isfinite(data).all():
+            data = np.ascontiguousarray(data, dtype=np.float32)
+            return orjson.loads(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+        return data.astype(str).astype(np.float64).tolist()
+    return data.tolist()
+
+
+def _short_float(data: Any) -> float:
+    # Same as '_array_tolist()' for float32 and float16 scalars
+    return float(str(data))
+
+
+def _is_array(data: Any) -> bool:
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(data, numpy.ndarray)
+
+
+def _hex_byte_vector(data: Any) -> Optional[str]:
+    """Returns the hex string of one-dimensional arrays of
+    int8 values, or 'None' for any other value.
+    """
+    if _is_array(data) and data.ndim == 1 and data.dtype == "int8":
+        return data.tobytes().hex()  # type: ignore[no-any-return]
+    return None
+
 
-    return False, None
+def _none(data: Any) -> None:
+    return None
 
 
-def _attempt_serialize_noop(data: Any) -> Tuple[bool, Any]:  # noqa
+def _resolve_noop(data_type: type) -> Optional[Callable[[Any], Any]]:  # noqa
     # Short-circuit if the above functions can't import
     # the corresponding library on the first attempt.
-    return False, None
+    return None
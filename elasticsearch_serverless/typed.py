@@ -0,0 +1,169 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Typed responses of the search, msearch, get and mget APIs.
+
+Clients returned by ``.options(source_type=...)`` decode the responses
+of these APIs straight into the structs below with msgspec, with the
+``_source`` of documents decoded into the given type, without building
+dictionaries for the response first:
+
+.. code-block:: python
+
+    import msgspec
+
+    class Book(msgspec.Struct):
+        title: str
+        year: int
+
+    resp = client.options(source_type=Book).search(index="books")
+    for hit in resp.body.hits.hits:
+        print(hit.id, hit.source.title)
+
+Fields of the responses which aren't declared are ignored. Requires the
+``msgspec`` package.
+"""
+
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+try:
+    import msgspec
+except ImportError:  # pragma: nocover
+    raise ImportError(
+        "Typed responses require the 'msgspec' package. "
+        "Install it with: $ python -m pip install msgspec"
+    ) from None
+
+__all__ = [
+    "GetResult",
+    "Hit",
+    "HitsMetadata",
+    "MultiGetResponse",
+    "MultiSearchItem",
+    "MultiSearchResponse",
+    "SearchResponse",
+    "TotalHits",
+]
+
+T = TypeVar("T")
+
+
+class TotalHits(msgspec.Struct, kw_only=True):
+    value: int
+    relation: str = "eq"
+
+
+class Hit(msgspec.Struct, Generic[T], kw_only=True):
+    index: str = msgspec.field(name="_index")
+    id: Optional[str] = msgspec.field(default=None, name="_id")
+    score: Optional[float] = msgspec.field(default=None, name="_score")
+    source: Optional[T] = msgspec.field(default=None, name="_source")
+    routing: Optional[str] = msgspec.field(default=None, name="_routing")
+    version: Optional[int] = msgspec.field(default=None, name="_version")
+    seq_no: Optional[int] = msgspec.field(default=None, name="_seq_no")
+    primary_term: Optional[int] = msgspec.field(default=None, name="_primary_term")
+    explanation: Optional[Dict[str, Any]] = msgspec.field(
+        default=None, name="_explanation"
+    )
+    fields: Optional[Dict[str, Any]] = None
+    highlight: Optional[Dict[str, List[str]]] = None
+    inner_hits: Optional[Dict[str, Any]] = None
+    matched_queries: Any = None
+    sort: Optional[List[Any]] = None
+
+
+class HitsMetadata(msgspec.Struct, Generic[T], kw_only=True):
+    hits: List[Hit[T]]
+    total: Optional[TotalHits] = None
+    max_score: Optional[float] = None
+
+
+class SearchResponse(msgspec.Struct, Generic[T], kw_only=True):
+    hits: HitsMetadata[T]
+    took: int = 0
+    timed_out: bool = False
+    shards: Optional[Dict[str, Any]] = msgspec.field(default=None, name="_shards")
+    aggregations: Optional[Dict[str, Any]] = None
+    suggest: Optional[Dict[str, Any]] = None
+    profile: Optional[Dict[str, Any]] = None
+    scroll_id: Optional[str] = msgspec.field(default=None, name="_scroll_id")
+    pit_id: Optional[str] = None
+    terminated_early: Optional[bool] = None
+    num_reduce_phases: Optional[int] = None
+
+
+class MultiSearchItem(msgspec.Struct, Generic[T], kw_only=True):
+    """Response of one search of a multi search, with an
+    ``error`` instead of ``hits`` if the search failed.
+    """
+
+    status: int = 200
+    hits: Optional[HitsMetadata[T]] = None
+    error: Optional[Dict[str, Any]] = None
+    took: int = 0
+    timed_out: bool = False
+    shards: Optional[Dict[str, Any]] = msgspec.field(default=None, name="_shards")
+    aggregations: Optional[Dict[str, Any]] = None
+    suggest: Optional[Dict[str, Any]] = None
+    pit_id: Optional[str] = None
+    terminated_early: Optional[bool] = None
+
+
+class MultiSearchResponse(msgspec.Struct, Generic[T], kw_only=True):
+    responses: List[MultiSearchItem[T]]
+    took: int = 0
+
+
+class GetResult(msgspec.Struct, Generic[T], kw_only=True):
+    """Document of a get or multi get request, with an ``error``
+    instead of the document if it couldn't be fetched.
+    """
+
+    index: str = msgspec.field(name="_index")
+    id: Optional[str] = msgspec.field(default=None, name="_id")
+    found: bool = False
+    source: Optional[T] = msgspec.field(default=None, name="_source")
+    routing: Optional[str] = msgspec.field(default=None, name="_routing")
+    version: Optional[int] = msgspec.field(default=None, name="_version")
+    seq_no: Optional[int] = msgspec.field(default=None, name="_seq_no")
+    primary_term: Optional[int] = msgspec.field(default=None, name="_primary_term")
+    fields: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+
+
+class MultiGetResponse(msgspec.Struct, Generic[T], kw_only=True):
+    docs: List[GetResult[T]]
+
+
+# Generic response of the endpoints with typed responses.
+_RESPONSE_TYPES: Dict[str, Any] = {
+    "search": SearchResponse,
+    "search_template": SearchResponse,
+    "scroll": SearchResponse,
+    "msearch": MultiSearchResponse,
+    "msearch_template": MultiSearchResponse,
+    "get": GetResult,
+    "mget": MultiGetResponse,
+}
+
+
+def _response_types(source_type: Any) -> Dict[str, Any]:
+    """Returns the response type of each endpoint for the given source type"""
+    return {
+        endpoint_id: response_type[source_type]
+        for endpoint_id, response_type in _RESPONSE_TYPES.items()
+    }
@@ -21,6 +21,7 @@ import nox
 
 SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
 SOURCE_FILES = (
+    "benchmarks/",
     "docs/sphinx/conf.py",
     "noxfile.py",
     "elasticsearch_serverless/",
@@ -63,6 +64,12 @@ def test_otel(session):
     session.run(*argv, *(session.posargs), env={"TEST_WITH_OTEL": "1"})
 
 
+@nox.session()
+def benchmarks(session):
+    session.install(".[dev]", env=INSTALL_ENV)
+    session.run("python", "-m", "benchmarks", *(session.posargs))
+
+
 @nox.session()
 def format(session):
     session.install("black~=24.0", "isort", "flynt", "unasync", "setuptools")
@@ -15,16 +15,42 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import asyncio
+import json
+import threading
+import time
 from collections import defaultdict
 
-from elastic_transport import ApiResponseMeta, HttpHeaders
+from elastic_transport import ApiResponseMeta, HttpHeaders, SerializerCollection
 
 from elasticsearch_serverless import Elasticsearch
+from elasticsearch_serverless.serializer import DEFAULT_SERIALIZERS
+
+
+def response_meta(status=200, headers=None, duration=0.0):
+    """Returns the meta of a response from Elasticsearch"""
+    return ApiResponseMeta(
+        status=status,
+        http_version="1.1",
+        headers=HttpHeaders({"X-elastic-product": "Elasticsearch", **(headers or {})}),
+        duration=duration,
+        node=None,
+    )
+
+
+def client_with_transport(transport, client_class=Elasticsearch, **kwargs):
+    """Returns a client created with 'kwargs' whose requests are
+    performed by 'transport' instead of the transport it created.
+    """
+    client = client_class("http://localhost:9200", **kwargs)
+    client._transport = transport
+    return client
 
 
 class DummyTransport:
-    def __init__(self, hosts, responses=None, **_):
+    def __init__(self, hosts, responses=None, serializers=None, **_):
         self.hosts = hosts
+        self.serializers = SerializerCollection(serializers)
         self.responses = responses
         self.call_count = 0
         self.calls = defaultdict(list)
@@ -35,21 +61,13 @@ class DummyTransport:
             status, resp = self.responses[self.call_count]
         self.call_count += 1
         self.calls[(method, target)].append(kwargs)
-        return (
-            ApiResponseMeta(
-                status=status,
-                http_version="1.1",
-                headers=HttpHeaders({"X-elastic-product": "Elasticsearch"}),
-                duration=0.0,
-                node=None,
-            ),
-            resp,
-        )
+        return response_meta(status), resp
 
 
 class DummyAsyncTransport:
-    def __init__(self, hosts, responses=None, **_):
+    def __init__(self, hosts, responses=None, serializers=None, **_):
         self.hosts = hosts
+        self.serializers = SerializerCollection(serializers)
         self.responses = responses
         self.call_count = 0
         self.calls = defaultdict(list)
@@ -60,16 +78,133 @@ class DummyAsyncTransport:
             status, resp = self.responses[self.call_count]
         self.call_count += 1
         self.calls[(method, target)].append(kwargs)
-        return (
-            ApiResponseMeta(
-                status=status,
-                http_version="1.1",
-                headers=HttpHeaders({"X-elastic-product": "Elasticsearch"}),
-                duration=0.0,
-                node=None,
-            ),
-            resp,
-        )
+        return response_meta(status), resp
+
+
+class ScriptedTransport:
+    """Transport which returns or raises the given responses in order,
+    statuses are responses with an empty body. Once all responses are
+    used it returns 'default'.
+    """
+
+    def __init__(self, *responses, default=None):
+        self.responses = list(responses)
+        self.default = default or (response_meta(200), {})
+        self.calls = []
+        self.bodies = []
+        self.serializers = SerializerCollection(DEFAULT_SERIALIZERS)
+
+    def perform_request(self, method, target, body=None, **kwargs):
+        self.calls.append((method, target, {"body": body, **kwargs}))
+        self.bodies.append(body)
+        response = self.responses.pop(0) if self.responses else self.default
+        if isinstance(response, Exception):
+            raise response
+        if isinstance(response, int):
+            return response_meta(response), {}
+        return response
+
+
+class AsyncScriptedTransport(ScriptedTransport):
+    async def perform_request(self, method, target, **kwargs):
+        return super().perform_request(method, target, **kwargs)
+
+
+class StatusTransport:
+    """Transport which responds with 'status' or raises 'error' when set"""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.error = None
+        self.call_count = 0
+
+    def perform_request(self, method, target, **kwargs):
+        self.call_count += 1
+        if self.error is not None:
+            raise self.error
+        return response_meta(self.status), {}
+
+
+class AsyncStatusTransport(StatusTransport):
+    async def perform_request(self, method, target, **kwargs):
+        return super().perform_request(method, target, **kwargs)
+
+
+class SlowTransport:
+    """Transport where each call sleeps for the next of the given delays
+    and raises the next of the given errors. It returns 'response', or
+    the number of the call, and deserializes the body with its serializers.
+    """
+
+    def __init__(
+        self,
+        hosts=None,
+        delays=(),
+        errors=(),
+        response=None,
+        serializers=DEFAULT_SERIALIZERS,
+        **_,
+    ):
+        self.delays = list(delays)
+        self.errors = list(errors)
+        self.response = response
+        self.serializers = SerializerCollection(serializers)
+        self.bodies = []
+        self.call_count = 0
+        self.lock = threading.Lock()
+
+    def _next_call(self, body):
+        with self.lock:
+            call = self.call_count
+            self.call_count += 1
+            self.bodies.append(body)
+        delay = self.delays[call] if call < len(self.delays) else 0
+        return call, delay
+
+    def _respond(self, call):
+        if call < len(self.errors) and self.errors[call]:
+            raise self.errors[call]
+        meta, body = self.response or (response_meta(200), {"call": call})
+        return meta, self.serializers.loads(json.dumps(body).encode(), meta.mimetype)
+
+    def perform_request(self, method, target, body=None, **kwargs):
+        call, delay = self._next_call(body)
+        if delay:
+            time.sleep(delay)
+        return self._respond(call)
+
+
+class AsyncSlowTransport(SlowTransport):
+    async def perform_request(self, method, target, body=None, **kwargs):
+        call, delay = self._next_call(body)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(call)
+
+
+class BlockingTransport:
+    """Transport which blocks every request until 'unblock' is set"""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.unblock = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def perform_request(self, method, target, **kwargs):
+        self.started.release()
+        self.unblock.wait(5)
+        return response_meta(self.status), {}
+
+
+class AsyncBlockingTransport:
+    def __init__(self):
+        self.unblock = asyncio.Event()
+        self.call_count = 0
+
+    async def perform_request(self, method, target, **kwargs):
+        self.call_count += 1
+        await self.unblock.wait()
+        return response_meta(200), {}
 
 
 class DummyTransportTestCase:
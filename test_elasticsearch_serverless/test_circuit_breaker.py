@@ -0,0 +1,183 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import pytest
+
+from elasticsearch_serverless import (
+    ApiError,
+    AsyncElasticsearch,
+    CircuitBreaker,
+    CircuitBreakerError,
+    ConnectionError,
+    RetryPolicy,
+)
+
+from .test_cases import AsyncStatusTransport, StatusTransport, client_with_transport
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "elasticsearch_serverless._circuit_breaker.time.monotonic", lambda: clock[0]
+    )
+    return clock
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    client = client_with_transport(StatusTransport(), circuit_breaker=breaker)
+    client.transport.error = ConnectionError("error")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            client.info()
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitBreakerError) as e:
+        client.info()
+    assert str(e.value) == "Circuit breaker is open, the request wasn't sent"
+    assert client.transport.call_count == 3
+    assert breaker.rejected_requests == 1
+
+
+def test_successes_reset_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = client_with_transport(StatusTransport(), circuit_breaker=breaker)
+
+    for status in (503, 200, 503, 200):
+        client.transport.status = status
+        try:
+            client.info()
+        except ApiError:
+            pass
+    assert breaker.state == "closed"
+
+
+def test_opens_on_error_rate(clock):
+    breaker = CircuitBreaker(
+        failure_threshold=100, error_rate_threshold=0.5, window_size=10, min_requests=4
+    )
+    client = client_with_transport(StatusTransport(), circuit_breaker=breaker)
+
+    # Only server errors count as failures.
+    client.transport.status = 404
+    for _ in range(10):
+        with pytest.raises(ApiError):
+            client.info()
+    assert breaker.state == "closed"
+
+    for status in (200, 502, 200, 502, 200, 502, 200, 502, 200):
+        client.transport.status = status
+        try:
+            client.info()
+        except ApiError:
+            pass
+        assert breaker.state == "closed"
+
+    # 5 of the last 10 requests failed.
+    client.transport.status = 504
+    with pytest.raises(ApiError):
+        client.info()
+    assert breaker.state == "open"
+
+
+def test_half_open_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    client = client_with_transport(StatusTransport(), circuit_breaker=breaker)
+    client.transport.status = 503
+    with pytest.raises(ApiError):
+        client.info()
+    assert breaker.state == "open"
+
+    clock[0] += 10
+    assert breaker.state == "half_open"
+
+    # A failed probe opens the breaker for another 'reset_timeout'
+    with pytest.raises(ApiError):
+        client.info()
+    assert breaker.state == "open"
+    clock[0] += 5
+    with pytest.raises(CircuitBreakerError):
+        client.info()
+    assert client.transport.call_count == 2
+
+    clock[0] += 5
+    client.transport.status = 200
+    client.info()
+    assert breaker.state == "closed"
+    client.info()
+    assert client.transport.call_count == 4
+
+
+def test_half_open_limits_probes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1)
+    breaker._record(False, probe=False)
+    clock[0] += 1
+
+    assert breaker._before_request() is True
+    with pytest.raises(CircuitBreakerError) as e:
+        breaker._before_request()
+    assert str(e.value) == "Circuit breaker is half open, the request wasn't sent"
+
+    # A probe which didn't complete frees its slot
+    breaker._release_probe()
+    assert breaker._before_request() is True
+    breaker._record(True, probe=True)
+    assert breaker.state == "closed"
+
+
+def test_breaker_stops_retries(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = client_with_transport(
+        StatusTransport(),
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_retries=5, initial_backoff=0.001),
+    )
+    client.transport.error = ConnectionError("error")
+
+    with pytest.raises(CircuitBreakerError):
+        client.info()
+    assert client.transport.call_count == 2
+
+
+def test_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker._record(False, probe=False)
+    assert breaker.state == "open"
+    breaker.reset()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_async_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+    client = client_with_transport(
+        AsyncStatusTransport(), AsyncElasticsearch, circuit_breaker=breaker
+    )
+
+    client.transport.error = ConnectionError("error")
+    with pytest.raises(ConnectionError):
+        await client.info()
+    with pytest.raises(CircuitBreakerError):
+        await client.info()
+
+    clock[0] += 5
+    client.transport.error = None
+    await client.info()
+    assert breaker.state == "closed"
+    assert client.transport.call_count == 2
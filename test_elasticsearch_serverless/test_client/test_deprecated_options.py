@@ -74,6 +74,7 @@ def test_serializer_and_serializers():
         "application/json",
         "text/*",
         "application/vnd.apache.arrow.stream",
+        "application/cbor",
         "application/vnd.elasticsearch+json",
         "application/vnd.elasticsearch+x-ndjson",
     }
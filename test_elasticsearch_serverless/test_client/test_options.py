@@ -16,11 +16,24 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+from functools import partial
+
 import pytest
 from elastic_transport import OpenTelemetrySpan
 from elastic_transport.client_utils import DEFAULT
 
-from elasticsearch_serverless import AsyncElasticsearch, Elasticsearch
+from elasticsearch_serverless import (
+    AdaptiveConcurrencyLimiter,
+    AsyncElasticsearch,
+    CircuitBreaker,
+    Elasticsearch,
+    HedgingPolicy,
+    MetricsRegistry,
+    RequestHooks,
+    RetryPolicy,
+    SlowRequestLog,
+    TrafficRecorder,
+)
 from elasticsearch_serverless._sync.client.utils import ELASTIC_API_VERSION, USER_AGENT
 from test_elasticsearch_serverless.test_cases import (
     DummyAsyncTransport,
@@ -500,3 +513,62 @@ class TestOptions(DummyTransportTestCase):
                 transport_class=DummyTransport,
             )
         assert str(e.value) == "Can't specify more than one host in 'hosts'"
+
+    def test_options_share_instrumentation(self):
+        client = Elasticsearch("http://localhost:9200", transport_class=DummyTransport)
+        options_client = client.options(request_timeout=1).options(ignore_status=404)
+        assert options_client._otel is client._otel
+        assert options_client.indices._otel is client._otel
+        assert client.indices._otel is client._otel
+
+
+@pytest.mark.parametrize("client_class", [Elasticsearch, AsyncElasticsearch])
+@pytest.mark.parametrize(
+    ["option", "value"],
+    [
+        ("hedging_policy", HedgingPolicy(delay=0.01)),
+        ("concurrency_limiter", AdaptiveConcurrencyLimiter()),
+        ("retry_policy", RetryPolicy()),
+        ("circuit_breaker", CircuitBreaker()),
+        ("metrics_registry", MetricsRegistry()),
+        ("request_timings", True),
+        ("hooks", RequestHooks()),
+    ],
+)
+def test_request_features_preserved_by_options(client_class, option, value):
+    client = client_class("http://localhost:9200", **{option: value})
+    options_client = client.options(request_timeout=1).options(ignore_status=404)
+    assert getattr(options_client, f"_{option}") is value
+
+
+@pytest.mark.parametrize(
+    ["factory", "kwargs"],
+    [
+        (HedgingPolicy, {"delay": -1}),
+        (HedgingPolicy, {"percentile": 1}),
+        (HedgingPolicy, {"percentile": 0}),
+        (HedgingPolicy, {"max_hedge_ratio": 2}),
+        (AdaptiveConcurrencyLimiter, {"min_limit": 0}),
+        (AdaptiveConcurrencyLimiter, {"initial_limit": 300}),
+        (AdaptiveConcurrencyLimiter, {"smoothing": 0}),
+        (AdaptiveConcurrencyLimiter, {"tolerance": 0.5}),
+        (AdaptiveConcurrencyLimiter, {"backoff_ratio": 1}),
+        (RetryPolicy, {"max_retries": -1}),
+        (RetryPolicy, {"initial_backoff": 0}),
+        (RetryPolicy, {"initial_backoff": 2, "max_backoff": 1}),
+        (RetryPolicy, {"budget_ratio": 0}),
+        (CircuitBreaker, {"failure_threshold": 0}),
+        (CircuitBreaker, {"error_rate_threshold": 0}),
+        (CircuitBreaker, {"half_open_max_requests": 0}),
+        (MetricsRegistry, {"buckets": []}),
+        (MetricsRegistry, {"buckets": [1, 0.5]}),
+        (MetricsRegistry, {"buckets": [1, 1]}),
+        (SlowRequestLog, {"body_strategy": "full"}),
+        (SlowRequestLog, {"max_logs_per_second": 0}),
+        (partial(TrafficRecorder, "traffic"), {"sample_rate": 2}),
+        (partial(TrafficRecorder, "traffic"), {"max_segment_bytes": 0}),
+    ],
+)
+def test_invalid_request_feature_config(factory, kwargs):
+    with pytest.raises(ValueError):
+        factory(**kwargs)
@@ -0,0 +1,170 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import json
+
+import pytest
+
+from elasticsearch_serverless import AsyncElasticsearch, Param
+from test_elasticsearch_serverless.test_cases import (
+    DummyAsyncTransport,
+    DummyTransportTestCase,
+)
+
+
+class TestPreparedRequests(DummyTransportTestCase):
+    def test_search_matches_regular_search(self):
+        prepared = self.client.prepare_search(
+            index="books",
+            body_template={
+                "query": {"match": {"title": Param("title")}},
+                "size": Param("size"),
+                "sort": ["_doc"],
+            },
+        )
+        assert prepared.slots == {"title", "size"}
+
+        self.client.perform_prepared(prepared, title='py"thon', size=10)
+        calls = self.assert_url_called("POST", "/books/_search")
+        assert calls[0]["headers"] == {
+            "accept": "application/json",
+            "content-type": "application/json",
+        }
+        assert json.loads(calls[0]["body"]) == {
+            "query": {"match": {"title": 'py"thon'}},
+            "size": 10,
+            "sort": ["_doc"],
+        }
+
+    def test_values_are_spliced_per_request(self):
+        prepared = self.client.prepare_count(
+            index="books", body_template={"query": {"terms": {"tag": Param("tags")}}}
+        )
+        self.client.perform_prepared(prepared, tags=["a", "b"])
+        self.client.perform_prepared(prepared, tags=[])
+
+        calls = self.assert_url_called("POST", "/books/_count", count=2)
+        assert calls[0]["body"] == b'{"query":{"terms":{"tag":["a","b"]}}}'
+        assert calls[1]["body"] == b'{"query":{"terms":{"tag":[]}}}'
+
+    def test_index_and_params_slots(self):
+        prepared = self.client.prepare_search(
+            index=Param("index"),
+            params={"routing": Param("routing"), "filter_path": ["hits.hits"]},
+        )
+        self.client.perform_prepared(prepared, index="my index", routing="r,1")
+
+        calls = self.assert_url_called(
+            "POST", "/my%20index/_search?routing=r,1&filter_path=hits.hits"
+        )
+        assert calls[0]["body"] is None
+        assert "content-type" not in calls[0]["headers"]
+
+    def test_msearch_ndjson(self):
+        prepared = self.client.prepare_msearch(
+            searches_template=[
+                {"index": Param("index")},
+                {"query": {"term": {"user": Param("user")}}},
+                {},
+                {"query": {"match_all": {}}},
+            ]
+        )
+        self.client.perform_prepared(prepared, index="logs", user="kimchy")
+
+        calls = self.assert_url_called("POST", "/_msearch")
+        assert calls[0]["headers"]["content-type"] == "application/x-ndjson"
+        assert calls[0]["body"] == (
+            b'{"index":"logs"}\n'
+            b'{"query":{"term":{"user":"kimchy"}}}\n'
+            b"{}\n"
+            b'{"query":{"match_all":{}}}\n'
+        )
+
+    def test_esql_query(self):
+        prepared = self.client.prepare_esql_query(
+            body_template={
+                "query": "FROM books | WHERE author == ? | LIMIT 10",
+                "params": [Param("author")],
+            },
+            params={"format": "json"},
+        )
+        self.client.perform_prepared(prepared, author="Frank Herbert")
+
+        calls = self.assert_url_called("POST", "/_query?format=json")
+        assert json.loads(calls[0]["body"]) == {
+            "query": "FROM books | WHERE author == ? | LIMIT 10",
+            "params": ["Frank Herbert"],
+        }
+
+    def test_options_are_applied(self):
+        prepared = self.client.prepare_search(index="books")
+        self.client.options(request_timeout=3).perform_prepared(prepared)
+
+        calls = self.assert_url_called("POST", "/books/_search")
+        assert calls[0]["request_timeout"] == 3
+
+    def test_missing_and_unknown_values(self):
+        prepared = self.client.prepare_search(
+            body_template={"size": Param("size"), "from": Param("from")}
+        )
+        with pytest.raises(TypeError) as e:
+            self.client.perform_prepared(prepared, size=1)
+        assert str(e.value) == "Missing values for prepared request parameters: from"
+
+        with pytest.raises(TypeError) as e:
+            self.client.perform_prepared(prepared, size=1, **{"from": 0, "to": 2})
+        assert str(e.value) == "Unknown prepared request parameters: to"
+        self.assert_call_count_equals(0)
+
+    def test_none_params_are_omitted(self):
+        prepared = self.client.prepare_search(
+            index="books",
+            params={"routing": Param("routing"), "size": Param("size")},
+        )
+        self.client.perform_prepared(prepared, routing=None, size=1)
+        self.client.perform_prepared(prepared, routing=None, size=None)
+        self.client.perform_prepared(prepared, routing="", size=None)
+
+        self.assert_url_called("POST", "/books/_search?size=1")
+        self.assert_url_called("POST", "/books/_search")
+        self.assert_url_called("POST", "/books/_search?routing=")
+
+    def test_empty_index_value(self):
+        prepared = self.client.prepare_search(index=Param("index"))
+        with pytest.raises(ValueError) as e:
+            self.client.perform_prepared(prepared, index="")
+        assert str(e.value) == (
+            "Empty value passed for path parameter 'index' of a prepared request"
+        )
+
+    def test_invalid_param_name(self):
+        with pytest.raises(ValueError):
+            Param("")
+
+
+@pytest.mark.asyncio
+async def test_async_perform_prepared():
+    client = AsyncElasticsearch(
+        "http://localhost:9200", transport_class=DummyAsyncTransport
+    )
+    prepared = client.prepare_search(
+        index="books", body_template={"query": {"match": {"title": Param("title")}}}
+    )
+    await client.perform_prepared(prepared, title="dune")
+
+    calls = client.transport.calls[("POST", "/books/_search")]
+    assert calls[0]["body"] == b'{"query":{"match":{"title":"dune"}}}'
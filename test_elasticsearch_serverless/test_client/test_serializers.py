@@ -72,6 +72,7 @@ class TestSerializers(DummyTransportTestCase):
             "text/*",
             "application/x-ndjson",
             "application/vnd.apache.arrow.stream",
+            "application/cbor",
             "application/vnd.mapbox-vector-tile",
             "application/vnd.elasticsearch+json",
             "application/vnd.elasticsearch+x-ndjson",
@@ -100,6 +101,7 @@ class TestSerializers(DummyTransportTestCase):
             "text/*",
             "application/x-ndjson",
             "application/vnd.apache.arrow.stream",
+            "application/cbor",
             "application/vnd.mapbox-vector-tile",
             "application/vnd.elasticsearch+json",
             "application/vnd.elasticsearch+x-ndjson",
@@ -120,6 +122,7 @@ class TestSerializers(DummyTransportTestCase):
             "text/*",
             "application/x-ndjson",
             "application/vnd.apache.arrow.stream",
+            "application/cbor",
             "application/vnd.mapbox-vector-tile",
             "application/vnd.elasticsearch+json",
             "application/vnd.elasticsearch+x-ndjson",
@@ -0,0 +1,185 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import threading
+
+import pytest
+
+from elasticsearch_serverless import (
+    AdaptiveConcurrencyLimiter,
+    ApiError,
+    AsyncElasticsearch,
+    ConcurrencyLimitError,
+)
+from elasticsearch_serverless._concurrency import _Waiter
+
+from .test_cases import AsyncBlockingTransport, BlockingTransport, client_with_transport
+
+
+def start_request(client):
+    thread = threading.Thread(target=client.info, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_fail_fast_when_limit_reached():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue_size=0)
+    transport = BlockingTransport()
+    client = client_with_transport(transport, concurrency_limiter=limiter)
+
+    thread = start_request(client)
+    assert transport.started.acquire(timeout=5)
+    assert limiter.in_flight == 1
+
+    with pytest.raises(ConcurrencyLimitError):
+        client.info()
+    assert limiter.rejected_requests == 1
+
+    transport.unblock.set()
+    thread.join(5)
+    assert limiter.in_flight == 0
+
+
+def test_queue_timeout():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=0.01)
+    transport = BlockingTransport()
+    client = client_with_transport(transport, concurrency_limiter=limiter)
+
+    thread = start_request(client)
+    assert transport.started.acquire(timeout=5)
+    with pytest.raises(ConcurrencyLimitError):
+        client.info()
+    assert limiter.queued == 0
+
+    transport.unblock.set()
+    thread.join(5)
+
+
+def test_queued_request_is_sent_when_slot_is_released():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    transport = BlockingTransport()
+    client = client_with_transport(transport, concurrency_limiter=limiter)
+
+    first = start_request(client)
+    assert transport.started.acquire(timeout=5)
+    second = start_request(client)
+    while limiter.queued != 1:
+        pass
+    # The queued request hasn't been sent.
+    assert not transport.started.acquire(timeout=0.05)
+
+    transport.unblock.set()
+    first.join(5)
+    second.join(5)
+    assert transport.started.acquire(timeout=5)
+    assert limiter.in_flight == 0
+
+
+def test_throttled_responses_lower_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+    transport = BlockingTransport(status=429)
+    transport.unblock.set()
+    client = client_with_transport(transport, concurrency_limiter=limiter)
+
+    with pytest.raises(ApiError):
+        client.info()
+    assert limiter.limit == 5
+    with pytest.raises(ApiError):
+        client.info()
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+    for _ in range(5):
+        with pytest.raises(ApiError):
+            client.info()
+    assert limiter.limit == limiter.min_limit == 1
+
+
+def saturate(limiter, latency, samples):
+    """Completes requests while keeping the limiter saturated"""
+    for _ in range(samples):
+        while limiter._enqueue(_Waiter(lambda: None)):
+            pass
+        limiter._waiters.clear()
+        limiter._release(latency, throttled=False)
+        limiter._in_flight = 0
+
+
+def test_limit_follows_latency_gradient():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=100)
+    saturate(limiter, 0.01, 100)
+    assert limiter.limit == 100
+
+    # Latency above the tolerated ratio lowers the limit.
+    saturate(limiter, 0.1, 20)
+    assert limiter.limit < 50
+
+    # Which recovers once latency goes back to normal.
+    saturate(limiter, 0.01, 100)
+    assert limiter.limit == 100
+
+
+def test_limit_doesnt_grow_when_not_saturated():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+    for _ in range(100):
+        assert limiter._enqueue(_Waiter(lambda: None))
+        limiter._release(0.01, throttled=False)
+    assert limiter.limit == 10
+
+
+@pytest.mark.asyncio
+async def test_async_requests_are_queued():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+    transport = AsyncBlockingTransport()
+    client = client_with_transport(
+        transport, AsyncElasticsearch, concurrency_limiter=limiter
+    )
+
+    tasks = [asyncio.ensure_future(client.info()) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    assert transport.call_count == 2
+    assert limiter.in_flight == 2
+    assert limiter.queued == 3
+
+    # Cancelling a queued request removes it from the queue.
+    tasks.pop().cancel()
+    await asyncio.sleep(0.01)
+    assert limiter.queued == 2
+
+    transport.unblock.set()
+    await asyncio.gather(*tasks)
+    assert transport.call_count == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_async_queue_timeout():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=0.01)
+    transport = AsyncBlockingTransport()
+    client = client_with_transport(
+        transport, AsyncElasticsearch, concurrency_limiter=limiter
+    )
+
+    first = asyncio.ensure_future(client.info())
+    await asyncio.sleep(0)
+    with pytest.raises(ConcurrencyLimitError):
+        await client.info()
+
+    transport.unblock.set()
+    await first
+    assert limiter.in_flight == 0
@@ -0,0 +1,254 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import time
+
+import pytest
+
+from benchmarks.fake_server import FakeServer
+from elasticsearch_serverless import (
+    ApiError,
+    AsyncElasticsearch,
+    Elasticsearch,
+    NotFoundError,
+    helpers,
+)
+
+
+def fake_client(server, **kwargs):
+    return Elasticsearch(
+        "http://localhost:9200", node_class=server.node_class, **kwargs
+    )
+
+
+def docs(count):
+    return [
+        {"_id": str(i), "n": i, "tag": "even" if i % 2 == 0 else "odd"}
+        for i in range(count)
+    ]
+
+
+def test_bulk_items():
+    server = FakeServer()
+    client = fake_client(server)
+    client.index(index="test", id="1", document={"n": 1})
+
+    resp = client.bulk(
+        operations=[
+            {"create": {"_index": "test", "_id": "1"}},
+            {"n": 1},
+            {"index": {"_index": "test", "_id": "2"}},
+            {"n": 2},
+            {"update": {"_index": "test", "_id": "2"}},
+            {"doc": {"m": 2}},
+            {"delete": {"_index": "test", "_id": "1"}},
+            {"delete": {"_index": "test", "_id": "3"}},
+        ]
+    )
+    assert resp["errors"] is True
+    assert [list(item.values())[0]["status"] for item in resp["items"]] == [
+        409,
+        201,
+        200,
+        200,
+        404,
+    ]
+    assert client.get(index="test", id="2")["_source"] == {"n": 2, "m": 2}
+    with pytest.raises(NotFoundError):
+        client.get(index="test", id="1")
+
+
+def test_streaming_bulk_retries_rejected_items():
+    server = FakeServer(item_rejection_rate=0.3)
+    client = fake_client(server)
+
+    results = list(
+        helpers.streaming_bulk(
+            client,
+            docs(100),
+            index="test",
+            chunk_size=10,
+            max_retries=10,
+            initial_backoff=0,
+            raise_on_error=False,
+        )
+    )
+    assert all(ok for ok, _ in results)
+    assert len(results) == 100
+    assert len(server.indices["test"]) == 100
+    # Rejected items were retried in additional bulk requests
+    assert server.requests.count(("PUT", "/test/_bulk")) > 10
+
+
+def test_request_rejections_and_max_request_bytes():
+    server = FakeServer(request_rejection_rate=1)
+    client = fake_client(server)
+    with pytest.raises(ApiError) as e:
+        client.bulk(operations=[{"index": {"_index": "test"}}, {"a": 1}])
+    assert e.value.status_code == 429
+
+    server = FakeServer(max_request_bytes=100)
+    client = fake_client(server)
+    with pytest.raises(ApiError) as e:
+        client.bulk(operations=[{"index": {"_index": "test"}}, {"a": "a" * 100}])
+    assert e.value.status_code == 413
+
+
+def test_scan_and_reindex():
+    server = FakeServer()
+    server.add_documents("source", docs(25))
+    client = fake_client(server)
+
+    hits = list(helpers.scan(client, index="source", size=10))
+    assert [hit["_id"] for hit in hits] == [str(i) for i in range(25)]
+    # Search, 3 scroll pages and the cleared scroll
+    assert server.requests == [
+        ("POST", "/source/_search"),
+        ("POST", "/_search/scroll"),
+        ("POST", "/_search/scroll"),
+        ("POST", "/_search/scroll"),
+        ("DELETE", "/_search/scroll"),
+    ]
+    assert server._scrolls == {}
+
+    assert helpers.reindex(
+        client, "source", "target", query={"query": {"term": {"tag": "odd"}}}
+    ) == (12, 0)
+    assert client.count(index="target")["count"] == 12
+
+
+def test_point_in_time_slices():
+    server = FakeServer()
+    server.add_documents("test", docs(20))
+    client = fake_client(server)
+
+    pit = client.open_point_in_time(index="test", keep_alive="1m")["id"]
+    # Documents indexed after opening the PIT aren't visible
+    client.index(index="test", id="new", document={"n": 100})
+
+    seen = []
+    for slice_id in range(3):
+        search_after = None
+        while True:
+            resp = client.search(
+                pit={"id": pit, "keep_alive": "1m"},
+                slice={"id": slice_id, "max": 3},
+                sort=[{"n": "desc"}],
+                search_after=search_after,
+                size=4,
+            )
+            hits = resp["hits"]["hits"]
+            if not hits:
+                break
+            seen.extend(hit["_source"]["n"] for hit in hits)
+            search_after = hits[-1]["sort"]
+    assert sorted(seen) == list(range(20))
+    assert client.close_point_in_time(id=pit)["num_freed"] == 1
+
+
+def test_msearch_mget_and_esql():
+    server = FakeServer()
+    server.add_documents(
+        "test", [{"_id": "1", "a": {"b": 1}, "c": "x"}, {"_id": "2", "c": "y"}]
+    )
+    client = fake_client(server)
+
+    resp = client.msearch(
+        searches=[
+            {"index": "test"},
+            {"query": {"ids": {"values": ["2"]}}},
+            {"index": "missing"},
+            {},
+        ]
+    )
+    assert [r["hits"]["hits"][0]["_id"] for r in resp["responses"][:1]] == ["2"]
+    assert resp["responses"][1]["status"] == 404
+
+    resp = client.mget(index="test", ids=["1", "3"])
+    assert [doc["found"] for doc in resp["docs"]] == [True, False]
+
+    resp = client.esql.query(query="FROM test | KEEP c, a.b | LIMIT 5")
+    assert resp["columns"] == [
+        {"name": "c", "type": "keyword"},
+        {"name": "a.b", "type": "long"},
+    ]
+    assert resp["values"] == [["x", 1], ["y", None]]
+
+
+def test_latency_and_throughput():
+    server = FakeServer(latency=0.02, throughput=10_000)
+    client = fake_client(server)
+    start = time.perf_counter()
+    client.index(index="test", document={"a": "a" * 100})
+    # 20ms of latency and ~13ms to transfer the bodies
+    assert time.perf_counter() - start >= 0.03
+
+
+def test_serves_over_http():
+    server = FakeServer()
+    server.add_documents("test", docs(3))
+    with server.serve() as url:
+        client = Elasticsearch(url)
+        assert client.count(index="test")["count"] == 3
+        assert client.indices.exists(index="test")
+
+
+@pytest.mark.asyncio
+async def test_async_streaming_bulk():
+    server = FakeServer(item_rejection_rate=0.2)
+    client = AsyncElasticsearch(
+        "http://localhost:9200", node_class=server.async_node_class
+    )
+    results = [
+        result
+        async for result in helpers.async_streaming_bulk(
+            client,
+            docs(50),
+            index="test",
+            max_retries=10,
+            initial_backoff=0,
+            raise_on_error=False,
+        )
+    ]
+    assert all(ok for ok, _ in results)
+    assert len(server.indices["test"]) == 50
+
+
+def test_response_format_cbor():
+    server = FakeServer()
+    server.add_documents("test", docs(3))
+    client = fake_client(server, response_format="cbor")
+
+    resp = client.search(index="test", query={"ids": {"values": ["1"]}})
+    assert resp.meta.headers["content-type"] == "application/cbor"
+    assert [hit["_source"] for hit in resp["hits"]["hits"]] == [{"n": 1, "tag": "odd"}]
+    with pytest.raises(NotFoundError) as e:
+        client.get(index="test", id="4")
+    assert e.value.body["found"] is False
+
+    # Per call, and back to JSON
+    resp = client.options(response_format="json").count(index="test")
+    assert resp.meta.headers["content-type"] == "application/json"
+    client = fake_client(server)
+    resp = client.options(response_format="cbor").count(index="test")
+    assert resp.meta.headers["content-type"] == "application/cbor"
+    assert resp.body["count"] == 3
+
+    with pytest.raises(ValueError, match="'response_format' must be one of"):
+        client.options(response_format="yaml")
+    with pytest.raises(ValueError, match="No serializer is configured"):
+        client.options(response_format="smile")
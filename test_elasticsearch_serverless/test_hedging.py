@@ -0,0 +1,157 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from elasticsearch_serverless import AsyncElasticsearch, HedgingPolicy
+from elasticsearch_serverless.exceptions import ConnectionError
+
+from .test_cases import AsyncSlowTransport, SlowTransport, client_with_transport
+
+
+def test_hedge_wins_when_primary_is_slow():
+    policy = HedgingPolicy(delay=0.01, max_hedge_ratio=1)
+    client = client_with_transport(
+        SlowTransport(delays=[0.5, 0]), hedging_policy=policy
+    )
+
+    start = time.monotonic()
+    resp = client.search(index="test")
+    assert time.monotonic() - start < 0.4
+
+    assert resp.body == {"call": 1}
+    assert client.transport.call_count == 2
+    assert policy.hedged_requests == 1
+    assert policy.hedged_wins == 1
+
+
+def test_primary_wins_before_delay():
+    policy = HedgingPolicy(delay=0.5, max_hedge_ratio=1)
+    client = client_with_transport(SlowTransport(delays=[0]), hedging_policy=policy)
+
+    assert client.search(index="test").body == {"call": 0}
+    assert client.transport.call_count == 1
+    assert policy.hedged_requests == 0
+
+
+def test_only_configured_endpoints_are_hedged():
+    policy = HedgingPolicy(delay=0, max_hedge_ratio=1)
+    client = client_with_transport(SlowTransport(delays=[0.05]), hedging_policy=policy)
+
+    client.index(index="test", document={})
+    assert client.transport.call_count == 1
+    assert policy.hedged_requests == 0
+
+
+def test_budget_caps_hedged_requests():
+    policy = HedgingPolicy(delay=0, max_hedge_ratio=0.25)
+    client = client_with_transport(
+        SlowTransport(delays=[0.02] * 100), hedging_policy=policy
+    )
+
+    for _ in range(8):
+        client.get(index="test", id="1")
+    assert policy.hedged_requests == 2
+    assert client.transport.call_count == 10
+
+
+def test_observed_percentile_delay():
+    policy = HedgingPolicy(min_samples=10, window_size=10, max_hedge_ratio=1)
+    client = client_with_transport(SlowTransport(), hedging_policy=policy)
+
+    # Not enough samples to hedge yet.
+    for _ in range(10):
+        client.mget(index="test", ids=["1"])
+    assert policy.hedged_requests == 0
+    assert client.transport.call_count == 10
+
+    delay = policy.hedge_delay("mget")
+    assert delay is not None and delay < 0.1
+    assert policy.hedge_delay("search") is None
+
+
+def test_first_error_waits_for_other_request():
+    policy = HedgingPolicy(delay=0.01, max_hedge_ratio=1)
+    client = client_with_transport(
+        SlowTransport(delays=[0.05, 0.1], errors=[ConnectionError("error"), None]),
+        hedging_policy=policy,
+    )
+    assert client.search(index="test").body == {"call": 1}
+
+    first = ConnectionError("first")
+    client = client_with_transport(
+        SlowTransport(delays=[0.05, 0.1], errors=[first, ConnectionError("second")]),
+        hedging_policy=policy,
+    )
+    with pytest.raises(ConnectionError) as e:
+        client.search(index="test")
+    assert e.value is first
+
+
+def test_concurrency_isnt_limited_by_workers():
+    policy = HedgingPolicy(delay=0.1, max_hedge_ratio=0, max_workers=2)
+    client = client_with_transport(
+        SlowTransport(delays=[0.2] * 8), hedging_policy=policy
+    )
+
+    threads = [
+        threading.Thread(target=client.get, kwargs={"index": "test", "id": "1"})
+        for _ in range(8)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start < 0.4
+    assert client.transport.call_count == 8
+    assert policy.hedged_requests == 0
+    assert policy._busy_workers == 0
+
+
+@pytest.mark.asyncio
+async def test_async_hedge_cancels_loser():
+    policy = HedgingPolicy(delay=0.01, max_hedge_ratio=1)
+    client = client_with_transport(
+        AsyncSlowTransport(delays=[5, 0]), AsyncElasticsearch, hedging_policy=policy
+    )
+
+    start = time.monotonic()
+    resp = await client.search(index="test")
+    assert time.monotonic() - start < 1
+
+    assert resp.body == {"call": 1}
+    assert policy.hedged_wins == 1
+    # The primary request was cancelled
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    await asyncio.sleep(0)
+    assert all(task.done() for task in tasks)
+
+
+@pytest.mark.asyncio
+async def test_async_primary_wins():
+    policy = HedgingPolicy(delay=1, max_hedge_ratio=1)
+    client = client_with_transport(
+        AsyncSlowTransport(delays=[0]), AsyncElasticsearch, hedging_policy=policy
+    )
+
+    assert (await client.get(index="test", id="1")).body == {"call": 0}
+    assert client.transport.call_count == 1
@@ -16,14 +16,29 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
 import threading
 import time
 from unittest import mock
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import pytest
 
-from elasticsearch_serverless import Elasticsearch, helpers
-from elasticsearch_serverless.serializer import JSONSerializer
+from benchmarks.fake_server import FakeServer
+from elasticsearch_serverless import AsyncElasticsearch, Elasticsearch, helpers
+from elasticsearch_serverless.exceptions import SerializationError
+from elasticsearch_serverless.serializer import (
+    JSONSerializer,
+    OrjsonSerializer,
+    PyArrowSerializer,
+)
+
+try:
+    import polars
+except ImportError:
+    polars = None
 
 lock_side_effect = threading.Lock()
 
@@ -183,3 +198,202 @@ class TestExpandActions:
     @pytest.mark.parametrize("action", ["whatever", b"whatever"])
     def test_string_actions_are_marked_as_simple_inserts(self, action):
         assert ({"index": {}}, b"whatever") == helpers.expand_action(action)
+
+
+class TestEsqlRecordBatches:
+    def server(self):
+        server = FakeServer(arrow_batch_size=2)
+        server.add_documents(
+            "logs", [{"n": i, "level": ("info", "warn")[i % 2]} for i in range(5)]
+        )
+        return server
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_record_batches(self, streaming):
+        server = self.server()
+        client = Elasticsearch(
+            "http://localhost:9200",
+            node_class=server.node_class,
+            serializers={
+                PyArrowSerializer.mimetype: PyArrowSerializer(streaming=streaming)
+            },
+        )
+        batches = list(helpers.esql_record_batches(client, "FROM logs | KEEP n, level"))
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+        assert pa.Table.from_batches(batches).to_pydict() == {
+            "n": [0, 1, 2, 3, 4],
+            "level": ["info", "warn", "info", "warn", "info"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_async_record_batches(self):
+        server = self.server()
+        client = AsyncElasticsearch(
+            "http://localhost:9200", node_class=server.async_node_class
+        )
+        batches = [
+            batch
+            async for batch in helpers.async_esql_record_batches(
+                client, "FROM logs | KEEP n | LIMIT 3"
+            )
+        ]
+        assert [batch.to_pydict() for batch in batches] == [
+            {"n": [0, 1]},
+            {"n": [2]},
+        ]
+
+
+class TestDataframeActions:
+    def frame(self):
+        return pd.DataFrame(
+            {
+                "isbn": ["1", "2", None],
+                "title": ["Dune", 'A "quoted" title', None],
+                "year": [1965, 1815, 1922],
+                "rating": [4.5, np.nan, np.inf],
+                "pages": pd.array([412, None, 730], dtype="Int64"),
+                "published": pd.to_datetime(["1965-08-01", None, "1922-02-02"]),
+                "available": [True, False, True],
+                "tags": [["scifi"], [], None],
+            }
+        )
+
+    documents = [
+        {
+            "title": "Dune",
+            "year": 1965,
+            "rating": 4.5,
+            "pages": 412,
+            "published": "1965-08-01T00:00:00.000000000",
+            "available": True,
+            "tags": ["scifi"],
+        },
+        {
+            "title": 'A "quoted" title',
+            "year": 1815,
+            "rating": None,
+            "pages": None,
+            "published": None,
+            "available": False,
+            "tags": [],
+        },
+        {
+            "title": None,
+            "year": 1922,
+            "rating": None,
+            "pages": 730,
+            "published": "1922-02-02T00:00:00.000000000",
+            "available": True,
+            "tags": None,
+        },
+    ]
+
+    def frames(self):
+        frame = self.frame()
+        frame["published"] = frame["published"].astype("datetime64[ns]")
+        yield frame
+        yield pa.Table.from_pandas(frame, preserve_index=False)
+        if polars is not None:
+            yield polars.from_pandas(frame)
+
+    def test_actions(self):
+        for frame in self.frames():
+            actions = list(
+                helpers.dataframe_actions(frame, index="books", id_column="isbn")
+            )
+            assert [helpers.expand_action(action)[0] for action in actions] == [
+                {"index": {"_index": "books", "_id": "1"}},
+                {"index": {"_index": "books", "_id": "2"}},
+                {"index": {"_index": "books"}},
+            ]
+            assert [
+                json.loads(helpers.expand_action(action)[1]) for action in actions
+            ] == self.documents
+
+    def test_serialized_like_json_serializer(self):
+        serializer = JSONSerializer()
+        for action in helpers.dataframe_actions(self.frame().drop(columns="published")):
+            header, body = helpers.expand_action(action)
+            assert header.raw == serializer.dumps(dict(header))
+            assert json.loads(body) == json.loads(serializer.dumps(json.loads(body)))
+            assert b"NaN" not in body and b"Infinity" not in body
+
+    def test_missing_values_compared_to_serializers(self):
+        frame = pd.DataFrame(
+            {
+                "na": pd.array([None], dtype="Int64"),
+                "none": [None],
+                "nan": [np.nan],
+                "inf": [np.inf],
+                "nat": pd.to_datetime([None]),
+            }
+        )
+        (action,) = helpers.dataframe_actions(frame)
+        body = json.loads(helpers.expand_action(action)[1])
+        assert body == {"na": None, "none": None, "nan": None, "inf": None, "nat": None}
+
+        row = {"na": pd.NA, "none": None, "nan": np.nan, "inf": np.inf}
+        assert OrjsonSerializer().dumps(row) == (
+            b'{"na":null,"none":null,"nan":null,"inf":null}'
+        )
+        assert JSONSerializer().dumps(row) == (
+            b'{"na":null,"none":null,"nan":NaN,"inf":Infinity}'
+        )
+        with pytest.raises(SerializationError):
+            JSONSerializer().dumps({"nat": pd.NaT})
+
+    def test_op_type_and_index_columns(self):
+        frame = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "target": ["a", "b", "a"],
+                "op": ["index", "update", "delete"],
+                "n": [1.0, 2.0, 3.0],
+            }
+        )
+        actions = [
+            helpers.expand_action(action)
+            for action in helpers.dataframe_actions(
+                frame, index_column="target", id_column="id", op_type_column="op"
+            )
+        ]
+        assert actions == [
+            ({"index": {"_index": "a", "_id": "1"}}, b'{"n":1.0}'),
+            ({"update": {"_index": "b", "_id": "2"}}, b'{"doc":{"n":2.0}}'),
+            ({"delete": {"_index": "a", "_id": "3"}}, None),
+        ]
+
+    def test_batches(self):
+        frame = pd.DataFrame({"n": range(25)})
+        actions = list(helpers.dataframe_actions(frame, index="i", batch_size=10))
+        assert [json.loads(action["_source"]) for action in actions] == [
+            {"n": n} for n in range(25)
+        ]
+
+    def test_invalid_frame(self):
+        with pytest.raises(TypeError, match="'frame' must be a pandas DataFrame"):
+            list(helpers.dataframe_actions([{"n": 1}]))
+
+    def test_bulk(self):
+        server = FakeServer()
+        client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+        frame = self.frame().dropna(subset=["isbn"])
+        assert helpers.bulk(
+            client, helpers.dataframe_actions(frame, index="books", id_column="isbn")
+        ) == (2, [])
+        assert client.get(index="books", id="2")["_source"]["title"] == (
+            'A "quoted" title'
+        )
+
+        frame = pd.DataFrame({"isbn": ["1", "3"], "year": [1966, 2000]})
+        success, errors = helpers.bulk(
+            client,
+            helpers.dataframe_actions(
+                frame, index="books", id_column="isbn", op_type="update"
+            ),
+            raise_on_error=False,
+        )
+        assert success == 1
+        assert errors[0]["update"]["_id"] == "3"
+        assert client.get(index="books", id="1")["_source"]["year"] == 1966
+        assert client.get(index="books", id="1")["_source"]["title"] == "Dune"
@@ -0,0 +1,147 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+
+import pytest
+
+from elasticsearch_serverless import (
+    AsyncElasticsearch,
+    ConnectionError,
+    NotFoundError,
+    RequestHooks,
+    RetryPolicy,
+)
+
+from .test_cases import (
+    AsyncScriptedTransport,
+    ScriptedTransport,
+    client_with_transport,
+    response_meta,
+)
+
+
+def recording_hooks():
+    hooks = RequestHooks()
+    events = []
+    for event in ("before_request", "after_response", "on_error", "on_retry"):
+        hooks.register(
+            event, lambda context, *args, event=event: events.append((event, context))
+        )
+    return hooks, events
+
+
+def test_hooks_see_request_and_response():
+    hooks, events = recording_hooks()
+    client = client_with_transport(
+        ScriptedTransport((response_meta(200, {"Content-Length": "42"}), {"took": 7})),
+        hooks=hooks,
+    )
+
+    client.search(index="test", query={"match_all": {}}, routing="a")
+
+    assert [event for event, _ in events] == ["before_request", "after_response"]
+    context = events[0][1]
+    assert context is events[1][1]
+    assert context.method == "POST"
+    assert context.path == "/test/_search?routing=a"
+    assert context.endpoint_id == "search"
+    assert context.path_parts == {"index": "test"}
+    assert context.request_bytes == 26
+    assert context.response_bytes == 42
+    assert context.status == 200
+    assert context.duration > 0
+    assert context.timings.server == 0.007
+
+
+def test_on_error_and_on_retry():
+    hooks, events = recording_hooks()
+    transport = ScriptedTransport(
+        ConnectionError("error"), (response_meta(503), {}), (response_meta(404), {})
+    )
+    client = client_with_transport(
+        transport, hooks=hooks, retry_policy=RetryPolicy(initial_backoff=0.001)
+    )
+
+    with pytest.raises(NotFoundError):
+        client.get(index="test", id="1")
+
+    assert [event for event, _ in events] == [
+        "before_request",
+        "on_retry",
+        "on_retry",
+        "on_error",
+    ]
+    context = events[-1][1]
+    assert context.retries == 2
+    assert context.status == 404
+
+    events.clear()
+    client = client_with_transport(
+        ScriptedTransport(ConnectionError("error")), hooks=hooks, max_retries=0
+    )
+    with pytest.raises(ConnectionError):
+        client.options(request_timeout=1).info()
+    assert [event for event, _ in events] == ["before_request", "on_error"]
+    assert events[-1][1].status is None
+
+
+def test_hook_errors_are_logged(caplog):
+    hooks = RequestHooks()
+    calls = []
+
+    @hooks.register("before_request")
+    def failing(context):
+        raise ValueError("hook error")
+
+    hooks.register("before_request", calls.append)
+
+    client = client_with_transport(
+        ScriptedTransport((response_meta(200), {})), hooks=hooks
+    )
+    with caplog.at_level(logging.WARNING, logger="elasticsearch"):
+        client.info()
+
+    assert len(calls) == 1
+    assert "Request hook" in caplog.text
+
+
+def test_register_and_unregister():
+    hooks = RequestHooks()
+    hook = hooks.register("on_error", print)
+    assert hook is print
+    assert hooks._hooks["on_error"] == (print,)
+    hooks.unregister("on_error", print)
+    assert hooks._hooks["on_error"] == ()
+
+    with pytest.raises(ValueError):
+        hooks.register("after_request", print)
+
+
+@pytest.mark.asyncio
+async def test_async_hooks():
+    hooks, events = recording_hooks()
+    client = client_with_transport(
+        AsyncScriptedTransport((response_meta(201), {})),
+        AsyncElasticsearch,
+        hooks=hooks,
+    )
+
+    await client.index(index="test", id="1", document={"a": 1})
+    assert [event for event, _ in events] == ["before_request", "after_response"]
+    assert events[0][1].request_bytes == 7
+    assert events[0][1].path_parts == {"index": "test", "id": "1"}
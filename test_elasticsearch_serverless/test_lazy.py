@@ -0,0 +1,147 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import json
+import pickle
+
+import pytest
+from elastic_transport import ObjectApiResponse
+
+from benchmarks.fake_server import FakeServer
+from elasticsearch_serverless import (
+    AsyncElasticsearch,
+    Elasticsearch,
+    LazyObjectApiResponse,
+    NotFoundError,
+    SerializationError,
+)
+from elasticsearch_serverless._lazy import _keep_raw
+from elasticsearch_serverless._streaming import StreamedArray
+from elasticsearch_serverless.serializer import JsonSerializer, OrjsonSerializer
+
+BOOKS = [{"_id": str(i), "title": f"Book {i}", "year": 1900 + i} for i in range(10)]
+
+
+@pytest.fixture(params=[JsonSerializer, OrjsonSerializer])
+def client(request):
+    server = FakeServer()
+    server.add_documents("books", BOOKS)
+    return Elasticsearch(
+        "http://localhost:9200",
+        node_class=server.node_class,
+        serializer=request.param(),
+    )
+
+
+def test_lazy_body(client):
+    resp = client.options(lazy_body=True).search(index="books", size=3)
+    assert isinstance(resp, LazyObjectApiResponse)
+    assert isinstance(resp, ObjectApiResponse)
+    assert resp.meta.status == 200
+    assert not resp.decoded
+
+    raw_bytes = resp.raw_bytes
+    assert isinstance(raw_bytes, bytes)
+    assert not resp.decoded
+
+    assert resp["hits"]["total"]["value"] == 10
+    assert resp.decoded
+    assert resp.body == json.loads(raw_bytes)
+    assert resp.raw_bytes is raw_bytes
+    assert resp == client.search(index="books", size=3).body
+
+
+@pytest.mark.parametrize(
+    "access",
+    [
+        lambda resp: resp.body,
+        lambda resp: resp["took"],
+        lambda resp: "hits" in resp,
+        lambda resp: list(resp),
+        lambda resp: len(resp),
+        lambda resp: resp.get("hits"),
+        lambda resp: str(resp),
+        lambda resp: repr(resp),
+        lambda resp: pickle.loads(pickle.dumps(resp)),
+    ],
+)
+def test_decode_on_first_access(client, access):
+    resp = client.options(lazy_body=True).search(index="books")
+    assert not resp.decoded
+    access(resp)
+    assert resp.decoded
+    assert resp.body["hits"]["total"]["value"] == 10
+
+
+def test_lazy_body_option(client):
+    lazy = client.options(lazy_body=True).options(request_timeout=10)
+    assert isinstance(lazy.count(index="books"), LazyObjectApiResponse)
+    assert not isinstance(
+        lazy.options(lazy_body=False).count(index="books"), LazyObjectApiResponse
+    )
+    assert not isinstance(client.count(index="books"), LazyObjectApiResponse)
+
+    with pytest.raises(TypeError, match="'lazy_body' must be of type 'bool'"):
+        client.options(lazy_body=1)
+
+
+def test_only_objects_are_lazy(client):
+    assert _keep_raw(b' \n{"a": 1}').data == b' \n{"a": 1}'
+    for data in (b"[1, 2]", b'"text"', b"null", b""):
+        with pytest.raises(ValueError):
+            _keep_raw(data)
+
+    assert client.options(lazy_body=True).indices.exists(index="books")
+
+
+def test_errors_are_decoded(client):
+    lazy = client.options(lazy_body=True)
+    with pytest.raises(NotFoundError) as e:
+        lazy.get(index="books", id="missing")
+    assert isinstance(e.value.body, dict)
+
+    resp = lazy.options(ignore_status=404).get(index="books", id="missing")
+    assert not isinstance(resp, LazyObjectApiResponse)
+    assert resp["found"] is False
+
+
+def test_lazy_body_with_stream_path(client):
+    resp = client.options(lazy_body=True, stream_path="hits.hits").search(index="books")
+    assert not resp.decoded
+    assert isinstance(resp["hits"]["hits"], StreamedArray)
+    assert len(list(resp["hits"]["hits"])) == 10
+
+
+def test_invalid_body_raises_on_access():
+    server = FakeServer()
+    client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+    resp = client.options(lazy_body=True).info()
+    resp._decode = lambda data: JsonSerializer().loads(data + b"}")
+    with pytest.raises(SerializationError):
+        resp.body
+
+
+@pytest.mark.asyncio
+async def test_async_lazy_body():
+    server = FakeServer()
+    server.add_documents("books", BOOKS)
+    client = AsyncElasticsearch(
+        "http://localhost:9200", node_class=server.async_node_class
+    )
+    resp = await client.options(lazy_body=True).search(index="books")
+    assert isinstance(resp, LazyObjectApiResponse)
+    assert resp["hits"]["total"]["value"] == 10
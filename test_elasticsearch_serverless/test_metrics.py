@@ -0,0 +1,211 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import threading
+
+import pytest
+
+from elasticsearch_serverless import (
+    ApiError,
+    AsyncElasticsearch,
+    ConnectionError,
+    MetricsRegistry,
+    RequestTimings,
+    RetryPolicy,
+)
+
+from .test_cases import (
+    AsyncScriptedTransport,
+    ScriptedTransport,
+    client_with_transport,
+    response_meta,
+)
+
+# Default response, with the Content-Length of its '{}' body
+OK = (response_meta(200, {"Content-Length": "2"}), {})
+
+
+def test_records_requests_per_endpoint_and_status_class():
+    registry = MetricsRegistry(buckets=[0.1, 1])
+    transport = ScriptedTransport(
+        (response_meta(200, {"Content-Length": "100"}), {}),
+        (response_meta(404, {"Content-Length": "20"}), {}),
+        (response_meta(200), {}),
+        default=OK,
+    )
+    client = client_with_transport(transport, metrics_registry=registry)
+
+    client.search(index="test", query={"match_all": {}})
+    with pytest.raises(ApiError):
+        client.get(index="test", id="1")
+    client.search(index="test")
+
+    # Bodies are serialized before being passed to the transport.
+    assert client.transport.bodies[0] == b'{"query":{"match_all":{}}}'
+
+    snapshot = registry.snapshot()
+    assert set(snapshot) == {"search", "get"}
+    search = snapshot["search"]["2xx"]
+    assert search["requests"] == 2
+    assert search["request_bytes"] == 26
+    assert search["response_bytes"] == 100
+    assert search["latency"]["buckets"] == {0.1: 2, 1.0: 2, float("inf"): 2}
+    assert 0 < search["latency"]["sum"] < 0.2
+
+    get = snapshot["get"]["4xx"]
+    assert get["requests"] == 1
+    assert get["request_bytes"] == 0
+    assert get["response_bytes"] == 20
+
+
+def test_records_errors_retries_and_throttling():
+    registry = MetricsRegistry()
+    transport = ScriptedTransport(
+        (response_meta(429), {}),
+        ConnectionError("error"),
+        (response_meta(503), {}),
+        (response_meta(200), {}),
+        ConnectionError("error"),
+        default=OK,
+    )
+    client = client_with_transport(
+        transport,
+        metrics_registry=registry,
+        retry_policy=RetryPolicy(
+            initial_backoff=0.001, endpoint_overrides={"count": {"max_retries": 0}}
+        ),
+    )
+    client.info()
+    with pytest.raises(ConnectionError):
+        client.count()
+
+    snapshot = registry.snapshot()
+    assert snapshot["info"]["2xx"]["requests"] == 1
+    assert snapshot["info"]["4xx"] == {
+        "requests": 0,
+        "latency": {
+            "sum": 0.0,
+            "buckets": {bound: 0 for bound in registry.buckets + (float("inf"),)},
+        },
+        "request_bytes": 0,
+        "response_bytes": 0,
+        "retries": 1,
+        "throttled": 1,
+        "timings": {
+            "serialize": 0.0,
+            "transport": 0.0,
+            "deserialize": 0.0,
+            "server": 0.0,
+        },
+    }
+    assert snapshot["info"]["error"]["retries"] == 1
+    assert snapshot["info"]["5xx"]["retries"] == 1
+    assert snapshot["count"]["error"]["requests"] == 1
+    assert snapshot["count"]["error"]["retries"] == 0
+
+
+def test_threads_record_into_shards():
+    registry = MetricsRegistry()
+    client = client_with_transport(
+        ScriptedTransport(default=OK), metrics_registry=registry
+    )
+
+    def worker():
+        for _ in range(100):
+            client.info()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry._shards) == 4
+    assert registry.snapshot()["info"]["2xx"]["requests"] == 400
+
+    registry.reset()
+    assert registry.snapshot() == {}
+
+
+def test_openmetrics_exposition():
+    registry = MetricsRegistry(buckets=[0.5], namespace="es")
+    registry._record_request("search", 200, 0.25, 10, 20)
+    registry._record_request(
+        "search", 200, 1.0, 10, 20, RequestTimings(0.125, 0.5, 0.25, 0.375)
+    )
+    registry._record_request(None, 429, 0.1, 0, 0)
+
+    assert registry.to_openmetrics() == (
+        "# TYPE es_request_duration_seconds histogram\n"
+        "# UNIT es_request_duration_seconds seconds\n"
+        "# HELP es_request_duration_seconds Duration of requests including retries.\n"
+        'es_request_duration_seconds_bucket{endpoint="search",status_class="2xx",le="0.5"} 1\n'
+        'es_request_duration_seconds_bucket{endpoint="search",status_class="2xx",le="+Inf"} 2\n'
+        'es_request_duration_seconds_count{endpoint="search",status_class="2xx"} 2\n'
+        'es_request_duration_seconds_sum{endpoint="search",status_class="2xx"} 1.25\n'
+        'es_request_duration_seconds_bucket{endpoint="unknown",status_class="4xx",le="0.5"} 1\n'
+        'es_request_duration_seconds_bucket{endpoint="unknown",status_class="4xx",le="+Inf"} 1\n'
+        'es_request_duration_seconds_count{endpoint="unknown",status_class="4xx"} 1\n'
+        'es_request_duration_seconds_sum{endpoint="unknown",status_class="4xx"} 0.1\n'
+        "# TYPE es_request_body_bytes counter\n"
+        "# UNIT es_request_body_bytes bytes\n"
+        "# HELP es_request_body_bytes Size of request bodies.\n"
+        'es_request_body_bytes_total{endpoint="search",status_class="2xx"} 20\n'
+        'es_request_body_bytes_total{endpoint="unknown",status_class="4xx"} 0\n'
+        "# TYPE es_response_body_bytes counter\n"
+        "# UNIT es_response_body_bytes bytes\n"
+        "# HELP es_response_body_bytes Size of response bodies.\n"
+        'es_response_body_bytes_total{endpoint="search",status_class="2xx"} 40\n'
+        'es_response_body_bytes_total{endpoint="unknown",status_class="4xx"} 0\n'
+        "# TYPE es_retries counter\n"
+        "# HELP es_retries Retries by the status of the retried attempt.\n"
+        'es_retries_total{endpoint="search",status_class="2xx"} 0\n'
+        'es_retries_total{endpoint="unknown",status_class="4xx"} 0\n'
+        "# TYPE es_throttled_responses counter\n"
+        "# HELP es_throttled_responses 429 Too Many Requests responses.\n"
+        'es_throttled_responses_total{endpoint="search",status_class="2xx"} 0\n'
+        'es_throttled_responses_total{endpoint="unknown",status_class="4xx"} 1\n'
+        "# TYPE es_request_phase_seconds counter\n"
+        "# UNIT es_request_phase_seconds seconds\n"
+        "# HELP es_request_phase_seconds Time spent in each phase of requests.\n"
+        'es_request_phase_seconds_total{endpoint="search",status_class="2xx",phase="serialize"} 0.125\n'
+        'es_request_phase_seconds_total{endpoint="search",status_class="2xx",phase="transport"} 0.5\n'
+        'es_request_phase_seconds_total{endpoint="search",status_class="2xx",phase="deserialize"} 0.25\n'
+        'es_request_phase_seconds_total{endpoint="search",status_class="2xx",phase="server"} 0.375\n'
+        'es_request_phase_seconds_total{endpoint="unknown",status_class="4xx",phase="serialize"} 0.0\n'
+        'es_request_phase_seconds_total{endpoint="unknown",status_class="4xx",phase="transport"} 0.0\n'
+        'es_request_phase_seconds_total{endpoint="unknown",status_class="4xx",phase="deserialize"} 0.0\n'
+        'es_request_phase_seconds_total{endpoint="unknown",status_class="4xx",phase="server"} 0.0\n'
+        "# EOF\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_client_records_metrics():
+    registry = MetricsRegistry()
+    client = client_with_transport(
+        AsyncScriptedTransport((response_meta(201, {"Content-Length": "5"}), {})),
+        AsyncElasticsearch,
+        metrics_registry=registry,
+    )
+
+    await client.index(index="test", document={"a": 1})
+    assert client.transport.bodies == [b'{"a":1}']
+    index = registry.snapshot()["index"]["2xx"]
+    assert index["requests"] == 1
+    assert index["request_bytes"] == 7
+    assert index["response_bytes"] == 5
@@ -16,13 +16,17 @@
 #  under the License.
 
 import os
+import sys
+import threading
 from unittest import mock
 
 import pytest
 
-from elasticsearch_serverless import Elasticsearch, helpers
+from elasticsearch_serverless import ApiError, Elasticsearch, helpers
 
 try:
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
     from opentelemetry.sdk.trace import TracerProvider, export
     from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
         InMemorySpanExporter,
@@ -31,7 +35,15 @@ except ModuleNotFoundError:
     pass
 
 
-from elasticsearch_serverless._otel import ENABLED_ENV_VAR, OpenTelemetry
+from elasticsearch_serverless._otel import (
+    ENABLED_ENV_VAR,
+    SAMPLE_RATE_ENV_VAR,
+    OpenTelemetry,
+    OpenTelemetryHelperSpan,
+    _rate_from_env,
+)
+
+from .test_cases import ScriptedTransport, response_meta
 
 pytestmark = [
     pytest.mark.skipif(
@@ -51,6 +63,20 @@ def setup_tracing():
     return tracer, memory_exporter
 
 
+def bulk_response(*statuses, took=1):
+    items = []
+    for status in statuses:
+        item = {"_index": "i", "status": status}
+        if status >= 300:
+            item["error"] = {"type": "error"}
+        items.append({"index": item})
+    return response_meta(200), {
+        "took": took,
+        "errors": any(s >= 300 for s in statuses),
+        "items": items,
+    }
+
+
 def test_enabled():
     otel = OpenTelemetry()
     assert otel.enabled == (os.environ.get(ENABLED_ENV_VAR, "true") == "true")
@@ -101,6 +127,7 @@ def test_detailed_span():
 
 
 @mock.patch("elasticsearch_serverless._otel.OpenTelemetry.use_span")
+@mock.patch("elasticsearch_serverless._otel.OpenTelemetry.chunk_span")
 @mock.patch("elasticsearch_serverless._otel.OpenTelemetry.helpers_span")
 @mock.patch("elasticsearch_serverless.helpers.actions._process_bulk_chunk_success")
 @mock.patch("elasticsearch_serverless.Elasticsearch.bulk")
@@ -108,6 +135,7 @@ def test_forward_otel_context_to_subthreads(
     _call_bulk_mock,
     _process_bulk_success_mock,
     _mock_otel_helpers_span,
+    _mock_otel_chunk_span,
     _mock_otel_use_span,
 ):
     tracer, memory_exporter = setup_tracing()
@@ -119,4 +147,303 @@ def test_forward_otel_context_to_subthreads(
     list(helpers.parallel_bulk(es_client, actions, chunk_size=4))
     # Ensures that the OTEL context has been forwarded to all chunks
     assert es_client._otel.helpers_span.call_count == 1
+    assert es_client._otel.chunk_span.call_count == 25
     assert es_client._otel.use_span.call_count == 25
+
+
+def setup_metrics():
+    reader = InMemoryMetricReader()
+    meter = MeterProvider(metric_readers=[reader]).get_meter(__name__)
+    return meter, reader
+
+
+def metric_points(reader):
+    points = {}
+    for resource_metrics in reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                points[metric.name] = list(metric.data.data_points)
+    return points
+
+
+def test_metrics_disabled_by_default():
+    tracer, _ = setup_tracing()
+    with mock.patch.dict(os.environ, {}, clear=True):
+        assert OpenTelemetry(enabled=True, tracer=tracer).metrics is None
+    meter, _ = setup_metrics()
+    otel = OpenTelemetry(enabled=False, metrics_enabled=True, meter=meter)
+    assert otel.metrics is None
+
+
+def test_request_metrics():
+    tracer, _ = setup_tracing()
+    meter, reader = setup_metrics()
+    client = Elasticsearch("http://localhost:9200")
+    client._otel = OpenTelemetry(
+        enabled=True, tracer=tracer, metrics_enabled=True, meter=meter
+    )
+    client._transport = ScriptedTransport(200, 404)
+
+    client.info()
+    with pytest.raises(ApiError):
+        client.get(index="test", id="1")
+
+    points = metric_points(reader)
+    durations = {
+        tuple(sorted(point.attributes.items())): point.count
+        for point in points["db.client.operation.duration"]
+    }
+    assert durations == {
+        (("db.operation", "info"), ("db.system", "elasticsearch")): 1,
+        (
+            ("db.operation", "get"),
+            ("db.system", "elasticsearch"),
+            ("error.type", "404"),
+        ): 1,
+    }
+    assert [
+        point.value for point in points["elasticsearch.client.active_requests"]
+    ] == [
+        0,
+        0,
+    ]
+
+
+def test_bulk_metrics():
+    tracer, _ = setup_tracing()
+    meter, reader = setup_metrics()
+    client = Elasticsearch("http://localhost:9200")
+    client._otel = OpenTelemetry(
+        enabled=True, tracer=tracer, metrics_enabled=True, meter=meter
+    )
+    client._transport = ScriptedTransport(
+        bulk_response(201, 429, 400), bulk_response(201)
+    )
+    client._transport.serializers = Elasticsearch(
+        "http://localhost:9200"
+    ).transport.serializers
+
+    results = list(
+        helpers.streaming_bulk(
+            client,
+            [{"a": 1}, {"a": 2}, {"a": 3}],
+            max_retries=1,
+            initial_backoff=0,
+            raise_on_error=False,
+        )
+    )
+    assert [ok for ok, _ in results] == [True, False, True]
+
+    points = metric_points(reader)
+    for name, value in (
+        ("elasticsearch.client.bulk.docs.indexed", 2),
+        ("elasticsearch.client.bulk.docs.failed", 1),
+        ("elasticsearch.client.bulk.docs.retried", 1),
+    ):
+        (point,) = points[name]
+        assert point.value == value
+        assert point.attributes == {
+            "db.system": "elasticsearch",
+            "db.operation": "helpers.streaming_bulk",
+        }
+
+
+def test_bulk_chunk_spans():
+    tracer, memory_exporter = setup_tracing()
+    client = Elasticsearch("http://localhost:9200", request_timings=True)
+    client._otel = OpenTelemetry(enabled=True, tracer=tracer, chunk_sampling_rate=0.5)
+    client._transport = ScriptedTransport(
+        bulk_response(201, took=3),
+        bulk_response(429, took=4),
+        bulk_response(201, took=5),
+        bulk_response(201, took=6),
+    )
+    client._transport.serializers = Elasticsearch(
+        "http://localhost:9200"
+    ).transport.serializers
+
+    results = list(
+        helpers.streaming_bulk(
+            client,
+            [{"a": 1}, {"a": 2}, {"a": 3}],
+            chunk_size=1,
+            max_retries=1,
+            initial_backoff=0.001,
+            raise_on_error=False,
+        )
+    )
+    assert [ok for ok, _ in results] == [True, True, True]
+
+    spans = {}
+    for span in memory_exporter.get_finished_spans():
+        spans.setdefault(span.name, []).append(span)
+    (helper,) = spans["helpers.streaming_bulk"]
+    chunks = spans["helpers.streaming_bulk.chunk"]
+    assert len(spans["bulk"]) == 4
+
+    # Every other chunk is sampled
+    assert [chunk.attributes["db.elasticsearch.helpers.chunk"] for chunk in chunks] == [
+        0,
+        2,
+    ]
+    assert all(chunk.parent.span_id == helper.context.span_id for chunk in chunks)
+    assert spans["bulk"][0].parent.span_id == chunks[0].context.span_id
+    # Requests of unsampled chunks are children of the helper span
+    assert spans["bulk"][1].parent.span_id == helper.context.span_id
+    assert chunks[1].attributes["db.elasticsearch.bulk.docs"] == 1
+    assert chunks[1].attributes["db.elasticsearch.bulk.bytes"] == 21
+    assert chunks[1].attributes["db.elasticsearch.took"] == 6
+    assert chunks[1].attributes["db.elasticsearch.client.transport"] >= 0
+    assert chunks[1].attributes["db.elasticsearch.client.deserialize"] >= 0
+    assert chunks[1].attributes["db.elasticsearch.client.serialize"] > 0
+
+    assert helper.attributes["db.elasticsearch.bulk.docs"] == 3
+    assert helper.attributes["db.elasticsearch.bulk.docs.retried"] == 1
+    assert helper.attributes["db.elasticsearch.bulk.docs.failed"] == 0
+    assert helper.attributes["db.elasticsearch.bulk.backoff"] == 0.001
+    assert helper.attributes["db.elasticsearch.took"] == 18
+    assert helper.attributes["db.elasticsearch.bulk.docs_per_second"] > 0
+    assert helper.attributes["db.elasticsearch.bulk.bytes_per_second"] > 0
+
+
+def test_parallel_bulk_chunk_spans():
+    tracer, memory_exporter = setup_tracing()
+    client = Elasticsearch("http://localhost:9200")
+    client._otel = OpenTelemetry(enabled=True, tracer=tracer)
+    client._transport = ScriptedTransport(
+        *(bulk_response(201, 400, took=2) for _ in range(20))
+    )
+    client._transport.serializers = Elasticsearch(
+        "http://localhost:9200"
+    ).transport.serializers
+
+    results = list(
+        helpers.parallel_bulk(
+            client,
+            [{"a": i} for i in range(40)],
+            chunk_size=2,
+            thread_count=8,
+            raise_on_error=False,
+        )
+    )
+    assert len(results) == 40
+
+    spans = {}
+    for span in memory_exporter.get_finished_spans():
+        spans.setdefault(span.name, []).append(span)
+    (helper,) = spans["helpers.parallel_bulk"]
+    chunks = spans["helpers.parallel_bulk.chunk"]
+    assert sorted(
+        chunk.attributes["db.elasticsearch.helpers.chunk"] for chunk in chunks
+    ) == list(range(20))
+    assert all(chunk.parent.span_id == helper.context.span_id for chunk in chunks)
+    assert all(chunk.attributes["db.elasticsearch.bulk.docs"] == 2 for chunk in chunks)
+    assert all(
+        chunk.attributes["db.elasticsearch.bulk.docs.failed"] == 1 for chunk in chunks
+    )
+    chunk_ids = {chunk.context.span_id for chunk in chunks}
+    assert all(bulk.parent.span_id in chunk_ids for bulk in spans["bulk"])
+
+    # Totals of all threads are summed on the helper span
+    assert helper.attributes["db.elasticsearch.bulk.docs"] == 40
+    assert helper.attributes["db.elasticsearch.bulk.docs.failed"] == 20
+    assert helper.attributes["db.elasticsearch.took"] == 40
+
+
+def test_helper_span_totals_are_thread_safe():
+    tracer, _ = setup_tracing()
+    span = OpenTelemetryHelperSpan(tracer.start_span("helper"))
+
+    def add():
+        for _ in range(10000):
+            span.add("db.elasticsearch.bulk.docs", 1)
+
+    threads = [threading.Thread(target=add) for _ in range(8)]
+    # Switch threads often to make lost updates likely without the lock
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert span.totals == {"db.elasticsearch.bulk.docs": 80000}
+
+
+def test_scan_page_spans():
+    tracer, memory_exporter = setup_tracing()
+    client = Elasticsearch("http://localhost:9200")
+    client._otel = OpenTelemetry(enabled=True, tracer=tracer)
+
+    def page(*hits):
+        return response_meta(200), {
+            "_scroll_id": "scroll",
+            "_shards": {"successful": 1, "total": 1},
+            "took": 2,
+            "hits": {"hits": [{"_id": hit} for hit in hits]},
+        }
+
+    client._transport = ScriptedTransport(page("1", "2"), page("3"), page(), 200)
+    assert [hit["_id"] for hit in helpers.scan(client, index="test")] == [
+        "1",
+        "2",
+        "3",
+    ]
+
+    spans = memory_exporter.get_finished_spans()
+    (helper,) = [span for span in spans if span.name == "helpers.scan"]
+    pages = [span for span in spans if span.name == "helpers.scan.page"]
+    assert [p.attributes["db.elasticsearch.scroll.hits"] for p in pages] == [2, 1, 0]
+    assert [
+        span.parent.span_id for span in spans if span.name in ("search", "scroll")
+    ] == [p.context.span_id for p in pages]
+    assert helper.attributes["db.elasticsearch.scroll.hits"] == 3
+    assert helper.attributes["db.elasticsearch.took"] == 6
+    assert helper.attributes["db.elasticsearch.scroll.hits_per_second"] > 0
+
+
+def test_invalid_chunk_sampling_rate():
+    with pytest.raises(ValueError):
+        OpenTelemetry(chunk_sampling_rate=2)
+
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        OpenTelemetry(sample_rate=-0.5)
+
+
+@pytest.mark.parametrize("value", ["abc", "1.5", "nan", ""])
+def test_invalid_sample_rate_env_var(value):
+    with mock.patch.dict(os.environ, {SAMPLE_RATE_ENV_VAR: value}):
+        with pytest.raises(ValueError, match=SAMPLE_RATE_ENV_VAR):
+            _rate_from_env(SAMPLE_RATE_ENV_VAR)
+    with mock.patch.dict(os.environ, {SAMPLE_RATE_ENV_VAR: "0.25"}):
+        assert _rate_from_env(SAMPLE_RATE_ENV_VAR) == 0.25
+
+
+def test_unsampled_requests_have_no_span():
+    tracer, memory_exporter = setup_tracing()
+    client = Elasticsearch("http://localhost:9200")
+    client._otel = OpenTelemetry(enabled=True, tracer=tracer, sample_rate=0)
+    client._transport = ScriptedTransport(200, 200)
+
+    with mock.patch.object(OpenTelemetry, "span") as span:
+        client.info()
+    span.assert_not_called()
+    assert memory_exporter.get_finished_spans() == ()
+
+    client._otel.sample_rate = 1
+    client.info()
+    assert [span.name for span in memory_exporter.get_finished_spans()] == ["info"]
+
+
+def test_disabled_requests_have_no_span():
+    client = Elasticsearch("http://localhost:9200")
+    client._otel = OpenTelemetry(enabled=False)
+    client._transport = ScriptedTransport(200)
+
+    with mock.patch.object(OpenTelemetry, "span") as span:
+        client.info()
+    span.assert_not_called()
@@ -0,0 +1,321 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from elasticsearch_serverless import (
+    ApiError,
+    AsyncElasticsearch,
+    ConnectionError,
+    ConnectionTimeout,
+    RetryPolicy,
+    helpers,
+)
+from elasticsearch_serverless._async.helpers import async_streaming_bulk
+from elasticsearch_serverless._retry import _parse_retry_after
+
+from .test_cases import (
+    AsyncScriptedTransport,
+    ScriptedTransport,
+    client_with_transport,
+    response_meta,
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+
+    async def async_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    monkeypatch.setattr("asyncio.sleep", async_sleep)
+    return sleeps
+
+
+def test_retries_status_until_success(sleeps):
+    policy = RetryPolicy(initial_backoff=1, max_backoff=100)
+    client = client_with_transport(
+        ScriptedTransport(
+            (response_meta(503), {}), (response_meta(502), {}), (response_meta(200), {})
+        ),
+        retry_policy=policy,
+    )
+
+    assert client.info().meta.status == 200
+    assert len(client.transport.calls) == 3
+    # The transport doesn't retry on its own.
+    assert all(kwargs["max_retries"] == 0 for _, _, kwargs in client.transport.calls)
+
+    # Decorrelated jitter: between the initial backoff and 3x the previous backoff.
+    assert 1 <= sleeps[0] <= 3
+    assert 1 <= sleeps[1] <= sleeps[0] * 3
+
+
+def test_gives_up_after_max_retries(sleeps):
+    policy = RetryPolicy(max_retries=2)
+    client = client_with_transport(
+        ScriptedTransport(*[(response_meta(429), {})] * 3), retry_policy=policy
+    )
+
+    with pytest.raises(ApiError) as e:
+        client.info()
+    assert e.value.status_code == 429
+    assert len(sleeps) == 2
+
+
+def test_retry_after_header(sleeps):
+    policy = RetryPolicy(max_backoff=1, max_retry_after=10)
+    client = client_with_transport(
+        ScriptedTransport(
+            (response_meta(429, {"Retry-After": "5"}), {}),
+            (response_meta(429, {"Retry-After": "60"}), {}),
+            (response_meta(200), {}),
+        ),
+        retry_policy=policy,
+    )
+    client.info()
+    assert sleeps == [5.0, 10.0]
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("") is None
+    assert _parse_retry_after("invalid") is None
+    assert _parse_retry_after(" 3 ") == 3.0
+    assert _parse_retry_after("-1") == 0.0
+
+    date = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < _parse_retry_after(format_datetime(date, usegmt=True)) <= 30
+    date = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert _parse_retry_after(format_datetime(date, usegmt=True)) == 0.0
+
+
+def test_connection_errors(sleeps):
+    policy = RetryPolicy()
+    client = client_with_transport(
+        ScriptedTransport(ConnectionError("error"), (response_meta(200), {})),
+        retry_policy=policy,
+    )
+    assert client.info().meta.status == 200
+
+    # Timeouts aren't retried by default
+    client = client_with_transport(
+        ScriptedTransport(ConnectionTimeout("timeout"), (response_meta(200), {})),
+        retry_policy=policy,
+    )
+    with pytest.raises(ConnectionTimeout):
+        client.info()
+
+    policy = RetryPolicy(retry_on_timeout=True)
+    client = client_with_transport(
+        ScriptedTransport(ConnectionTimeout("timeout"), (response_meta(200), {})),
+        retry_policy=policy,
+    )
+    assert client.info().meta.status == 200
+
+
+def test_budget_limits_retries(sleeps):
+    policy = RetryPolicy(max_retries=5, budget_ratio=0.5, budget_burst=2)
+    client = client_with_transport(
+        ScriptedTransport(*[(response_meta(503), {})] * 20), retry_policy=policy
+    )
+
+    # The burst allows two retries.
+    with pytest.raises(ApiError):
+        client.info()
+    assert len(client.transport.calls) == 3
+
+    # Every request adds half a token which allows one more retry after two requests.
+    with pytest.raises(ApiError):
+        client.info()
+    assert len(client.transport.calls) == 4
+    with pytest.raises(ApiError):
+        client.info()
+    assert len(client.transport.calls) == 6
+
+    # Without a budget every request is retried.
+    policy = RetryPolicy(max_retries=2, budget_ratio=None, budget_burst=0)
+    client = client_with_transport(
+        ScriptedTransport(*[(response_meta(503), {})] * 6), retry_policy=policy
+    )
+    for _ in range(2):
+        with pytest.raises(ApiError):
+            client.info()
+    assert len(client.transport.calls) == 6
+
+
+def test_endpoint_overrides(sleeps):
+    policy = RetryPolicy(
+        max_retries=3,
+        endpoint_overrides={
+            "info": {"max_retries": 0},
+            "ping": {"retry_on_status": ()},
+        },
+    )
+    assert policy.for_endpoint("info").max_retries == 0
+    assert policy.for_endpoint("info")._budget is policy._budget
+    assert policy.for_endpoint("search") is policy
+    assert policy.for_endpoint(None) is policy
+
+    client = client_with_transport(
+        ScriptedTransport((response_meta(503), {}), (response_meta(200), {})),
+        retry_policy=policy,
+    )
+    with pytest.raises(ApiError):
+        client.info()
+    assert len(client.transport.calls) == 1
+
+    with pytest.raises(TypeError):
+        RetryPolicy(endpoint_overrides={"info": {"unknown": 1}})
+
+
+def bulk_response(*statuses):
+    items = []
+    for status in statuses:
+        item = {"_index": "i", "status": status}
+        if status >= 300:
+            item["error"] = {"type": "es_rejected_execution_exception"}
+        items.append({"index": item})
+    return (
+        response_meta(200),
+        {"errors": any(s >= 300 for s in statuses), "items": items},
+    )
+
+
+def test_streaming_bulk_retry_policy(sleeps):
+    policy = RetryPolicy(
+        initial_backoff=1,
+        endpoint_overrides={"bulk": {"max_retries": 2, "retry_on_status": (429, 503)}},
+    )
+    transport = ScriptedTransport(
+        bulk_response(200, 429, 503),
+        (response_meta(429, {"Retry-After": "20"}), {}),
+        bulk_response(201, 200),
+    )
+    results = list(
+        helpers.streaming_bulk(
+            client_with_transport(transport),
+            [{"a": 1}, {"a": 2}, {"a": 3}],
+            retry_policy=policy,
+            raise_on_error=False,
+        )
+    )
+    assert [ok for ok, _ in results] == [True, True, True]
+    assert len(transport.calls) == 3
+    assert transport.calls[2][2]["body"] == [
+        b'{"index":{}}',
+        b'{"a":2}',
+        b'{"index":{}}',
+        b'{"a":3}',
+    ]
+    assert 1 <= sleeps[0] <= 3
+    assert sleeps[1] == 20
+    assert policy._budget.tokens == 8.0
+
+
+def test_streaming_bulk_retry_policy_exhausted(sleeps):
+    policy = RetryPolicy(max_retries=1)
+    transport = ScriptedTransport(bulk_response(429), bulk_response(429))
+    results = list(
+        helpers.streaming_bulk(
+            client_with_transport(transport),
+            [{"a": 1}],
+            retry_policy=policy,
+            raise_on_error=False,
+        )
+    )
+    assert [ok for ok, _ in results] == [False]
+    assert len(transport.calls) == 2
+    assert len(sleeps) == 1
+
+
+def test_concurrent_bulk_retries_within_budget(sleeps):
+    # Chunks retried at the same time by several threads
+    # only retry as many times as the budget allows.
+    policy = RetryPolicy(max_retries=1, budget_ratio=0.01, budget_burst=2)
+    threads = 8
+    throttled = threading.Barrier(threads)
+
+    class ThrottlingTransport(ScriptedTransport):
+        def perform_request(self, method, target, **kwargs):
+            response = super().perform_request(method, target, **kwargs)
+            if response[1]["items"][0]["index"]["status"] == 429:
+                throttled.wait(5)
+            return response
+
+    transport = ThrottlingTransport(
+        *(bulk_response(429) for _ in range(threads)),
+        *(bulk_response(201) for _ in range(threads)),
+    )
+    client = client_with_transport(transport)
+    results = []
+
+    def index():
+        for ok, _ in helpers.streaming_bulk(
+            client, [{"a": 1}], retry_policy=policy, raise_on_error=False
+        ):
+            results.append(ok)
+
+    workers = [threading.Thread(target=index) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(results) == [False] * 6 + [True] * 2
+    assert len(transport.calls) == threads + 2
+    assert policy.acquire_retry() is False
+
+
+@pytest.mark.asyncio
+async def test_async_retries(sleeps):
+    transport = AsyncScriptedTransport(
+        (response_meta(503, {"Retry-After": "2"}), {}),
+        ConnectionError("error"),
+        (response_meta(200), {}),
+    )
+    client = client_with_transport(
+        transport, AsyncElasticsearch, retry_policy=RetryPolicy()
+    )
+    assert (await client.info()).meta.status == 200
+    assert len(sleeps) == 2
+    assert sleeps[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_streaming_bulk_retry_policy(sleeps):
+    transport = AsyncScriptedTransport(bulk_response(429, 200), bulk_response(200))
+    client = client_with_transport(transport, AsyncElasticsearch)
+
+    results = [
+        ok
+        async for ok, _ in async_streaming_bulk(
+            client,
+            [{"a": 1}, {"a": 2}],
+            retry_policy=RetryPolicy(),
+            raise_on_error=False,
+        )
+    ]
+    assert results == [True, True]
+    assert len(transport.calls) == 2
+    assert len(sleeps) == 1
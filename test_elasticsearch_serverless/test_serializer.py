@@ -16,10 +16,13 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from unittest import mock
 
+import cbor2
 import pyarrow as pa
 import pytest
 
@@ -31,10 +34,13 @@ except ImportError:
 
 import re
 
-from elasticsearch_serverless import Elasticsearch
+from elasticsearch_serverless import Elasticsearch, serializer
 from elasticsearch_serverless.exceptions import SerializationError
 from elasticsearch_serverless.serializer import (
+    CborSerializer,
     JSONSerializer,
+    MsgspecSerializer,
+    NdjsonSerializer,
     OrjsonSerializer,
     PyArrowSerializer,
     TextSerializer,
@@ -45,7 +51,14 @@ requires_numpy_and_pandas = pytest.mark.skipif(
 )
 
 
-@pytest.fixture(params=[JSONSerializer, OrjsonSerializer])
+@pytest.fixture(
+    params=[
+        JSONSerializer,
+        OrjsonSerializer,
+        MsgspecSerializer,
+        serializer._AutoOrjsonSerializer,
+    ]
+)
 def json_serializer(request: pytest.FixtureRequest):
     yield request.param()
 
@@ -102,6 +115,80 @@ def test_serializes_numpy_floats(json_serializer):
         )
 
 
+@requires_numpy_and_pandas
+def test_serializes_float32_shortest(json_serializer):
+    vector = np.array([0.1, -2.7, 1234.5, 0.3333], dtype=np.float32)
+    data = json_serializer.dumps({"v": vector, "s": np.float32(0.1)})
+    assert data == b'{"v":[0.1,-2.7,1234.5,0.3333],"s":0.1}'
+    assert json_serializer.dumps({"v": vector[::2]}) == b'{"v":[0.1,1234.5]}'
+    assert json_serializer.dumps({"v": np.array([0.5, 1.5], dtype=np.float16)}) == (
+        b'{"v":[0.5,1.5]}'
+    )
+    # Zero-dimensional arrays are serialized as scalars
+    assert json_serializer.dumps({"v": np.array(0.1, dtype=np.float32)}) == (
+        b'{"v":0.1}'
+    )
+
+    # The shortest representation is read back as the same float32 value
+    vector = np.random.default_rng(0).standard_normal(256).astype(np.float32)
+    vector[:3] = (1e-8, 3.4e38, 1e-45)
+    data = json_serializer.dumps({"v": vector})
+    assert len(data) < len(json.dumps({"v": vector.tolist()}))
+    assert np.array(json_serializer.loads(data)["v"], dtype=np.float32).tobytes() == (
+        vector.tobytes()
+    )
+
+
+@requires_numpy_and_pandas
+@pytest.mark.parametrize("orjson", [serializer.orjson, None])
+def test_array_tolist_same_without_orjson(orjson):
+    rng = np.random.default_rng(0)
+    vectors = [
+        rng.standard_normal(256).astype(np.float32),
+        rng.standard_normal((4, 8)).astype(np.float32),
+        rng.standard_normal(64).astype(np.float32)[::3],
+        rng.standard_normal(64).astype(">f4"),
+        rng.standard_normal(64).astype(np.float16),
+        np.array([0.1, np.nan, np.inf, -np.inf], dtype=np.float32),
+        np.array([0.1, 1e-5, 65504.0], dtype=np.float16),
+    ]
+    with mock.patch.object(serializer, "orjson", orjson):
+        for vector in vectors:
+            values = serializer._array_tolist(vector)
+            expected = np.array([float(str(value)) for value in vector.flat])
+            expected = expected.reshape(vector.shape)
+            assert values == expected.tolist() or (
+                # NaN never compares equal
+                np.array_equal(values, expected, equal_nan=True)
+            )
+            assert JSONSerializer().dumps({"v": vector}) == (
+                json.dumps({"v": expected.tolist()}, separators=(",", ":")).encode()
+            )
+
+
+@requires_numpy_and_pandas
+@pytest.mark.parametrize("hex_byte_vectors", [False, True])
+def test_hex_byte_vectors(json_serializer, hex_byte_vectors):
+    json_serializer = type(json_serializer)(hex_byte_vectors=hex_byte_vectors)
+    data = {
+        "b": np.array([-128, -1, 0, 127], dtype=np.int8),
+        "m": np.zeros((2, 2), dtype=np.int8),
+        "u": np.array([1, 255], dtype=np.uint8),
+        "f": np.array([0.1], dtype=np.float32),
+        "s": pd.Series([1.5, 2.5]),
+    }
+    expected = b'{"b":%s,"m":[[0,0],[0,0]],"u":[1,255],"f":[0.1],"s":[1.5,2.5]}' % (
+        b'"80ff007f"' if hex_byte_vectors else b"[-128,-1,0,127]"
+    )
+    assert json_serializer.dumps(data) == expected
+    assert json_serializer.dumps({"b": data["b"][::2]}) == (
+        b'{"b":"8000"}' if hex_byte_vectors else b'{"b":[-128,0]}'
+    )
+    assert json_serializer.dumps({"b": np.array([], dtype=np.int8)}) == (
+        b'{"b":""}' if hex_byte_vectors else b'{"b":[]}'
+    )
+
+
 @requires_numpy_and_pandas
 def test_serializes_numpy_datetime(json_serializer):
     assert b'{"d":"2010-10-01T02:30:00"}' == json_serializer.dumps(
@@ -126,6 +213,12 @@ def test_serializes_numpy_nan_to_nan():
     # NaN is invalid JSON, and orjson silently converts it to null
     assert b'{"d":null}' == OrjsonSerializer().dumps({"d": float("NaN")})
 
+    # float32 values are serialized like float64 values
+    for dtype in (np.float32, np.float64):
+        data = {"v": np.array([np.nan, 1.5], dtype=dtype), "s": dtype("nan")}
+        assert b'{"v":[NaN,1.5],"s":NaN}' == JSONSerializer().dumps(data)
+        assert b'{"v":[null,1.5],"s":null}' == OrjsonSerializer().dumps(data)
+
 
 @requires_numpy_and_pandas
 def test_serializes_pandas_timestamp(json_serializer):
@@ -182,6 +275,30 @@ def test_pyarrow_loads():
     }
 
 
+def test_pyarrow_loads_streaming(tmp_path):
+    table = pa.table({"n": list(range(5)), "s": list("abcde")})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=2)
+    data = sink.getvalue().to_pybytes()
+
+    reader = PyArrowSerializer(streaming=True).loads(data)
+    assert isinstance(reader, pa.ipc.RecordBatchStreamReader)
+    assert [batch.num_rows for batch in reader] == [2, 2, 1]
+
+    # From a file, like a streamed HTTP body
+    path = tmp_path / "body.arrow"
+    path.write_bytes(data)
+    with open(path, "rb") as f:
+        reader = PyArrowSerializer(streaming=True).loads(f)
+        assert reader.read_next_batch().to_pydict() == {"n": [0, 1], "s": ["a", "b"]}
+    with open(path, "rb") as f:
+        assert PyArrowSerializer().loads(f) == table
+
+    with pytest.raises(SerializationError):
+        PyArrowSerializer(streaming=True).loads(b"not arrow")
+
+
 def test_json_raises_serialization_error_on_dump_error(json_serializer):
     with pytest.raises(SerializationError):
         json_serializer.dumps(object())
@@ -196,6 +313,212 @@ def test_raises_serialization_error_on_load_error():
         JSONSerializer().loads("{{")
 
 
+@requires_numpy_and_pandas
+def test_orjson_serializes_numpy_natively():
+    serializer = OrjsonSerializer()
+    vector = np.linspace(0, 1, 6, dtype=np.float32)
+    assert serializer.dumps({"v": vector}) == serializer.dumps({"v": vector.copy()})
+    assert b'{"v":[0.0,0.4,0.8]}' == serializer.dumps({"v": vector[::2]})
+    assert b'{"v":[[0,2],[3,5]]}' == serializer.dumps(
+        {"v": np.arange(6).reshape(2, 3)[:, ::2]}
+    )
+    assert b'{"v":[1.5,2.5]}' == serializer.dumps(
+        {"v": np.array([1.5, 2.5], dtype=np.float16)}
+    )
+    assert b'{"s":[1.5,2.5],"n":[1,null]}' == serializer.dumps(
+        {"s": pd.Series([1.5, 2.5]), "n": pd.Series([1, None], dtype="Int64")}
+    )
+
+
+@requires_numpy_and_pandas
+def test_serializes_pandas_datetime_series(json_serializer):
+    series = pd.Series(pd.to_datetime(["2020-01-01T00:00:00", "2020-01-02T03:04:05"]))
+    assert (
+        b'{"s":["2020-01-01T00:00:00","2020-01-02T03:04:05"]}'
+        == json_serializer.dumps({"s": series})
+    )
+
+    # Timedeltas aren't serialized as integers
+    with pytest.raises(SerializationError):
+        json_serializer.dumps({"s": pd.Series(pd.to_timedelta([1], unit="ns"))})
+
+
+def test_orjson_serializes_non_str_keys():
+    assert (
+        JSONSerializer().dumps({1: "a", 2.5: "b", None: "c"})
+        == OrjsonSerializer().dumps({1: "a", 2.5: "b", None: "c"})
+        == b'{"1":"a","2.5":"b","null":"c"}'
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"n": 2**64},
+        {"s": "\udcff"},
+        [{"n": -(2**70)}, {"s": "\ud83d"}],
+    ],
+)
+def test_auto_falls_back_to_stdlib(data):
+    json_serializer = serializer._AutoOrjsonSerializer()
+    ndjson_serializer = serializer._AutoOrjsonNdjsonSerializer()
+    with pytest.raises(SerializationError):
+        OrjsonSerializer().dumps(data)
+    assert json_serializer.dumps(data) == JSONSerializer().dumps(data)
+    assert ndjson_serializer.dumps([data, data]) == NdjsonSerializer().dumps(
+        [data, data]
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        1e16,
+        1.5e300,
+        -1e-05,
+        1e-07,
+        5e-324,
+        0.0001,
+        float("nan"),
+        float("inf"),
+        -float("inf"),
+        None,
+        Decimal("1.10"),
+        Decimal("1e20"),
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2020, 1, 1, 12, 30, 0, 1000),
+        datetime(2020, 1, 1, tzinfo=timezone(timedelta(hours=5, seconds=15))),
+        date(2020, 1, 1),
+        uuid.UUID("00000000-0000-0000-0000-000000000001"),
+        {1: 1e16, None: "c"},
+        "1,1e16",
+    ],
+)
+def test_auto_matches_stdlib(data):
+    doc = {"a": data, "b": [data, 1]}
+    assert serializer._AutoOrjsonSerializer().dumps(doc) == JSONSerializer().dumps(doc)
+    assert serializer._AutoOrjsonNdjsonSerializer().dumps(
+        [doc, data]
+    ) == NdjsonSerializer().dumps([doc, data])
+
+
+@requires_numpy_and_pandas
+def test_auto_matches_stdlib_for_numpy_and_pandas():
+    doc = {
+        "f32": np.array([1e-05, 0.1, np.nan], dtype=np.float32),
+        "f64": np.array([[1e16, 0.5], [1e-07, 2.0]])[:, 0],
+        "scalars": [np.float32(1e-05), np.float64(1e20), np.int64(1), np.bool_(True)],
+        "date": np.datetime64("2020-01-01"),
+        "series": pd.Series([1.0, np.nan]),
+        "timestamp": pd.Timestamp("2020-01-01T00:00:00.000000001"),
+        "na": pd.NA,
+    }
+    assert serializer._AutoOrjsonSerializer().dumps(doc) == JSONSerializer().dumps(doc)
+
+
+def test_auto_serializers():
+    serializers = serializer._auto_serializers()
+    assert set(serializers) == {
+        "application/json",
+        "application/x-ndjson",
+        "application/vnd.elasticsearch+json",
+        "application/vnd.elasticsearch+x-ndjson",
+    }
+    assert isinstance(serializers["application/json"], OrjsonSerializer)
+    assert isinstance(serializers["application/x-ndjson"], NdjsonSerializer)
+    assert (
+        serializers["application/vnd.elasticsearch+json"]
+        is serializers["application/json"]
+    )
+    assert (
+        serializers["application/vnd.elasticsearch+x-ndjson"]
+        is serializers["application/x-ndjson"]
+    )
+
+    client = Elasticsearch("http://localhost:9200", serializer="auto")
+    for mimetype, expected in serializers.items():
+        assert type(client.transport.serializers.get_serializer(mimetype)) is type(
+            expected
+        )
+
+    with pytest.raises(ValueError, match="'serializer' must be a Serializer"):
+        Elasticsearch("http://localhost:9200", serializer="fast")
+
+
+def test_auto_serializers_without_orjson():
+    # msgspec isn't used as its output differs from the standard library
+    with mock.patch.object(serializer, "_OrjsonSerializer", None):
+        serializers = serializer._auto_serializers()
+    assert type(serializers["application/json"]) is JSONSerializer
+    assert type(serializers["application/x-ndjson"]) is NdjsonSerializer
+
+
+def test_msgspec_serializer():
+    json_serializer = MsgspecSerializer()
+    assert json_serializer.loads(b'{"a":[1,2.5,null]}') == {"a": [1, 2.5, None]}
+    assert json_serializer.loads(b"") is None
+    with pytest.raises(SerializationError):
+        json_serializer.loads(b"{{")
+    with pytest.raises(SerializationError):
+        json_serializer.dumps({"o": object()})
+
+
+@pytest.fixture
+def registered_types():
+    registered = dict(serializer._registered_converters)
+    yield
+    serializer._registered_converters.clear()
+    serializer._registered_converters.update(registered)
+    serializer._converters.clear()
+
+
+def test_register_type(json_serializer, registered_types):
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    class Point3D(Point):
+        pass
+
+    JSONSerializer.register_type(Point, lambda p: [p.x, p.y])
+    assert b'{"p":[1,2],"q":[3,4]}' == json_serializer.dumps(
+        {"p": Point(1, 2), "q": Point3D(3, 4)}
+    )
+    # Registered types take precedence over the built-in conversions,
+    # except for the types msgspec serializes natively.
+    JSONSerializer.register_type(Decimal, str)
+    if not isinstance(json_serializer, MsgspecSerializer):
+        assert b'{"d":"3.8"}' == json_serializer.dumps({"d": Decimal("3.8")})
+
+
+def test_converters_are_resolved_once_per_type(registered_types):
+    serializer._converters.clear()
+    with mock.patch.object(
+        serializer, "_resolve_converter", wraps=serializer._resolve_converter
+    ) as resolve:
+        JSONSerializer().dumps([Decimal("1.5"), Decimal("2.5"), uuid.uuid4()])
+        JSONSerializer().dumps({"d": Decimal("3.5")})
+    assert [call.args[0] for call in resolve.call_args_list] == [Decimal, uuid.UUID]
+    # Unsupported types aren't cached
+    with pytest.raises(SerializationError):
+        JSONSerializer().dumps(object())
+    assert object not in serializer._converters
+
+
+def test_cbor_loads():
+    cbor_serializer = CborSerializer()
+    assert cbor_serializer.loads(
+        cbor2.dumps({"hits": {"hits": [{"_source": {"n": 1.5, "s": "a"}}]}})
+    ) == {"hits": {"hits": [{"_source": {"n": 1.5, "s": "a"}}]}}
+    assert cbor_serializer.loads(b"") is None
+    with pytest.raises(SerializationError):
+        cbor_serializer.loads(b"\xff\x00")
+
+    assert cbor_serializer.dumps(b"\xa0") == b"\xa0"
+    with pytest.raises(SerializationError):
+        cbor_serializer.dumps({})
+
+
 def test_strings_are_left_untouched():
     assert b"\xe4\xbd\xa0\xe5\xa5\xbd" == TextSerializer().dumps("你好")
 
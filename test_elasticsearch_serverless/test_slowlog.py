@@ -0,0 +1,179 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import json
+import logging
+
+import pytest
+
+from elasticsearch_serverless import (
+    ConnectionError,
+    RequestHooks,
+    SlowRequestLog,
+)
+from elasticsearch_serverless._slowlog import BODY_STRATEGY_ENV_VAR
+
+from .test_cases import ScriptedTransport, client_with_transport, response_meta
+
+
+@pytest.fixture(autouse=True)
+def log_level(caplog):
+    caplog.set_level(logging.WARNING, logger="elasticsearch.slow_requests")
+
+
+def slow_log_hooks(slow_log):
+    hooks = RequestHooks()
+    slow_log.register(hooks)
+    return hooks
+
+
+def test_logs_slow_requests(caplog):
+    client = client_with_transport(
+        ScriptedTransport((response_meta(200, {"Content-Length": "10"}), {"took": 3})),
+        hooks=slow_log_hooks(SlowRequestLog(threshold=0, body_strategy="raw")),
+    )
+    client.search(index="test", query={"match": {"title": "secret"}})
+
+    (record,) = caplog.records
+    message = record.getMessage()
+    assert message.startswith("Slow request POST /test/_search [endpoint_id:search ")
+    assert "status:200 " in message
+    assert "request_bytes:38 response_bytes:10 " in message
+    assert "server:0.003s" in message
+    assert message.endswith('body={"query":{"match":{"title":"secret"}}}')
+
+    details = record.elasticsearch_slow_request
+    assert details["endpoint_id"] == "search"
+    assert details["server"] == 0.003
+    assert details["transport"] >= 0
+
+
+def test_endpoint_thresholds(caplog):
+    client = client_with_transport(
+        ScriptedTransport(),
+        hooks=slow_log_hooks(
+            SlowRequestLog(threshold=0, endpoint_thresholds={"info": 60})
+        ),
+    )
+    client.info()
+    assert caplog.records == []
+    client.ping()
+    assert len(caplog.records) == 1
+
+
+def test_body_strategies(caplog, monkeypatch):
+    client = client_with_transport(
+        ScriptedTransport(),
+        hooks=slow_log_hooks(SlowRequestLog(threshold=0, body_strategy="redact")),
+    )
+    client.search(query={"match": {"title": "secret"}}, aggs={"a": {"terms": {}}})
+    assert caplog.records[-1].elasticsearch_slow_request["body"] == (
+        '{"aggs":{"a":{"terms":{}}},"query":{"match":{"title":"?"}}}'
+    )
+
+    client = client_with_transport(
+        ScriptedTransport(),
+        hooks=slow_log_hooks(
+            SlowRequestLog(threshold=0, body_strategy="raw", max_body_size=10)
+        ),
+    )
+    client.search(query={"match_all": {}})
+    assert caplog.records[-1].elasticsearch_slow_request["body"] == '{"query":{...'
+
+    # Bodies are omitted by default
+    client = client_with_transport(
+        ScriptedTransport(), hooks=slow_log_hooks(SlowRequestLog(threshold=0))
+    )
+    client.search(query={"match_all": {}})
+    assert "body" not in caplog.records[-1].elasticsearch_slow_request
+
+    monkeypatch.setenv(BODY_STRATEGY_ENV_VAR, "redact")
+    assert SlowRequestLog().body_strategy == "redact"
+
+
+def test_redacts_ndjson(caplog):
+    client = client_with_transport(
+        ScriptedTransport(),
+        hooks=slow_log_hooks(SlowRequestLog(threshold=0, body_strategy="redact")),
+    )
+    client.bulk(operations=[{"index": {"_index": "i"}}, {"a": [1, 2]}])
+    assert caplog.records[-1].elasticsearch_slow_request["body"] == (
+        '{"index":{"_index":"?"}}\n{"a":["?","?"]}'
+    )
+
+
+def test_samples_large_bodies(caplog, monkeypatch):
+    slow_log = SlowRequestLog(threshold=0, body_strategy="redact", max_body_size=50)
+    client = client_with_transport(ScriptedTransport(), hooks=slow_log_hooks(slow_log))
+    operations = [{"index": {"_index": "i"}}, {"a": "b" * 100}] * 10000
+
+    parsed = []
+    loads = json.loads
+    monkeypatch.setattr(
+        "elasticsearch_serverless._slowlog.json.loads",
+        lambda line: parsed.append(line) or loads(line),
+    )
+    client.bulk(operations=operations)
+    # Only the lines of the sample are redacted
+    assert len(parsed) == 3
+    assert caplog.records[-1].elasticsearch_slow_request["body"] == (
+        '{"index":{"_index":"?"}}\n{"a":"?"}\n{"index":{"_ind...'
+    )
+
+    client = client_with_transport(
+        ScriptedTransport(),
+        hooks=slow_log_hooks(
+            SlowRequestLog(threshold=0, body_strategy="raw", max_body_size=20)
+        ),
+    )
+    client.bulk(operations=operations)
+    assert caplog.records[-1].elasticsearch_slow_request["body"] == (
+        '{"index":{"_index":"...'
+    )
+
+
+def test_logs_errors(caplog):
+    client = client_with_transport(
+        ScriptedTransport(ConnectionError("error")),
+        hooks=slow_log_hooks(SlowRequestLog(threshold=0)),
+        max_retries=0,
+    )
+    with pytest.raises(ConnectionError):
+        client.info()
+    (record,) = caplog.records
+    assert "status:None " in record.getMessage()
+    assert record.elasticsearch_slow_request["error"] == "ConnectionError"
+
+
+def test_rate_limit(caplog, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(
+        "elasticsearch_serverless._slowlog.time.monotonic", lambda: clock[0]
+    )
+    slow_log = SlowRequestLog(threshold=0, max_logs_per_second=2)
+    client = client_with_transport(ScriptedTransport(), hooks=slow_log_hooks(slow_log))
+
+    for _ in range(5):
+        client.info()
+    assert len(caplog.records) == 2
+    assert slow_log.suppressed == 3
+
+    clock[0] += 0.5
+    client.info()
+    assert len(caplog.records) == 3
+    assert caplog.records[-1].getMessage().endswith("(3 slow requests not logged)")
+    assert slow_log.suppressed == 0
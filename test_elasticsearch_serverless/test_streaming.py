@@ -0,0 +1,193 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import json
+
+import pytest
+
+from benchmarks.fake_server import FakeServer
+from elasticsearch_serverless import (
+    AsyncElasticsearch,
+    Elasticsearch,
+    NotFoundError,
+    SerializationError,
+)
+from elasticsearch_serverless._streaming import StreamedArray, _decode_streaming
+from elasticsearch_serverless.helpers import async_scan, scan
+from elasticsearch_serverless.serializer import JsonSerializer, OrjsonSerializer
+
+RESPONSE = {
+    "took": 3,
+    "_shards": {"total": 1, "successful": 1},
+    "hits": {
+        "total": {"value": 3, "relation": "eq"},
+        "max_score": None,
+        "hits": [
+            {"_id": str(i), "_source": {"n": i, "tags": ["a", "b"]}} for i in range(3)
+        ],
+        "after": "x",
+    },
+    "aggregations": {"by_n": {"buckets": [{"key": 1}, {"key": 2}]}},
+    "_scroll_id": "abc",
+}
+
+
+@pytest.fixture(params=[{}, {"indent": 2}], ids=["compact", "indented"])
+def data(request):
+    return json.dumps(RESPONSE, **request.param).encode()
+
+
+def test_iterate_streamed_array(data):
+    body = _decode_streaming(data, ("hits", "hits"))
+    assert body["took"] == 3
+    assert body["hits"]["total"] == {"value": 3, "relation": "eq"}
+
+    hits = body["hits"]["hits"]
+    assert isinstance(hits, StreamedArray)
+    assert hits
+    assert [hit["_id"] for hit in hits] == ["0", "1", "2"]
+    assert body["hits"]["after"] == "x"
+    assert body["_scroll_id"] == "abc"
+
+    with pytest.raises(RuntimeError, match="can only be iterated once"):
+        iter(hits)
+    with pytest.raises(TypeError):
+        len(hits)
+
+
+def test_access_following_members_while_iterating(data):
+    body = _decode_streaming(data, ("hits", "hits"))
+    hits = iter(body["hits"]["hits"])
+    assert next(hits)["_id"] == "0"
+    # The rest of the hits are decoded to reach the following members
+    assert body["aggregations"] == RESPONSE["aggregations"]
+    assert [hit["_id"] for hit in hits] == ["1", "2"]
+
+
+def test_materialize_streamed_array(data):
+    body = _decode_streaming(data, ("hits", "hits"))
+    hits = body["hits"]["hits"]
+    assert len(hits) == 3
+    assert hits[-1]["_id"] == "2"
+    assert list(hits) == list(hits) == RESPONSE["hits"]["hits"]
+    assert body == RESPONSE
+    assert json.loads(json.dumps(body.copy(), default=list)) == RESPONSE
+
+
+def test_stream_aggregation_buckets(data):
+    body = _decode_streaming(data, ("aggregations", "by_n", "buckets"))
+    assert body["hits"] == RESPONSE["hits"]
+    assert [bucket["key"] for bucket in body["aggregations"]["by_n"]["buckets"]] == [
+        1,
+        2,
+    ]
+    assert "_scroll_id" in body
+    assert set(body) == set(RESPONSE)
+
+
+@pytest.mark.parametrize(
+    ["data", "expected"],
+    [
+        (
+            b'{"error": {"type": "x"}, "status": 404}',
+            {"error": {"type": "x"}, "status": 404},
+        ),
+        (b'{"hits": 5, "took": 1}', {"hits": 5, "took": 1}),
+        (b'{"hits": {"hits": null}}', {"hits": {"hits": None}}),
+        (b"[1, 2]", [1, 2]),
+    ],
+)
+def test_path_not_found(data, expected):
+    assert _decode_streaming(data, ("hits", "hits")) == expected
+
+
+def test_empty_streamed_array():
+    body = _decode_streaming(b'{"hits": {"hits": [ ]}}', ("hits", "hits"))
+    assert not body["hits"]["hits"]
+    assert list(body["hits"]["hits"]) == []
+
+
+def test_invalid_json():
+    with pytest.raises(ValueError):
+        _decode_streaming(b'{"hits": ', ("hits", "hits"))
+
+    body = _decode_streaming(b'{"hits": {"hits": [1, }}', ("hits", "hits"))
+    hits = iter(body["hits"]["hits"])
+    assert next(hits) == 1
+    with pytest.raises(SerializationError):
+        next(hits)
+
+    body = _decode_streaming(b'{"hits": {"hits": []}} x', ("hits", "hits"))
+    with pytest.raises(SerializationError):
+        body["took"]
+
+
+@pytest.fixture(params=[JsonSerializer, OrjsonSerializer])
+def server_client(request):
+    server = FakeServer()
+    server.add_documents("books", [{"_id": str(i), "n": i} for i in range(25)])
+    client = Elasticsearch(
+        "http://localhost:9200",
+        node_class=server.node_class,
+        serializer=request.param(),
+    )
+    return server, client
+
+
+def test_stream_path_option(server_client):
+    _, client = server_client
+    resp = client.options(stream_path="hits.hits").search(index="books", size=5)
+    assert isinstance(resp.body["hits"]["hits"], StreamedArray)
+    assert len(list(resp["hits"]["hits"])) == 5
+    assert resp["hits"]["total"]["value"] == 25
+
+    # Kept by '.options()' and reset with 'None'
+    streaming = client.options(stream_path=["hits", "hits"]).options(request_timeout=10)
+    assert isinstance(streaming.search(index="books")["hits"]["hits"], StreamedArray)
+    assert isinstance(
+        streaming.options(stream_path=None).search(index="books")["hits"]["hits"],
+        list,
+    )
+    assert isinstance(client.search(index="books")["hits"]["hits"], list)
+
+    # Errors and other responses are decoded as usual
+    with pytest.raises(NotFoundError) as e:
+        streaming.get(index="books", id="missing")
+    assert isinstance(e.value.body, dict)
+    assert streaming.count(index="books")["count"] == 25
+
+    with pytest.raises(ValueError, match="'stream_path' must be"):
+        client.options(stream_path="")
+
+
+def test_scan_stream_hits(server_client):
+    _, client = server_client
+    hits = list(scan(client, index="books", size=4, stream_hits=True))
+    assert sorted(int(hit["_id"]) for hit in hits) == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_async_scan_stream_hits():
+    server = FakeServer()
+    server.add_documents("books", [{"_id": str(i), "n": i} for i in range(25)])
+    client = AsyncElasticsearch(
+        "http://localhost:9200", node_class=server.async_node_class
+    )
+    hits = [
+        hit async for hit in async_scan(client, index="books", size=4, stream_hits=True)
+    ]
+    assert sorted(int(hit["_id"]) for hit in hits) == list(range(25))
@@ -0,0 +1,176 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import time
+from functools import partial
+
+import pytest
+from elastic_transport import SerializerCollection
+
+from elasticsearch_serverless import (
+    ApiError,
+    AsyncElasticsearch,
+    Elasticsearch,
+    MetricsRegistry,
+    RequestTimings,
+)
+from elasticsearch_serverless.serializer import JsonSerializer
+
+from .test_cases import (
+    AsyncSlowTransport,
+    SlowTransport,
+    client_with_transport,
+    response_meta,
+)
+
+
+def test_timings_disabled_by_default():
+    client = client_with_transport(
+        SlowTransport(response=(response_meta(200), {"took": 5}))
+    )
+    resp = client.search(query={"match_all": {}})
+
+    assert RequestTimings.from_response(resp) is None
+    # The body is serialized by the transport
+    assert client.transport.bodies == [{"query": {"match_all": {}}}]
+
+
+def timed_client(**kwargs):
+    # Timed clients time deserializing with the serializers
+    # of the transport they create, the transport isn't replaced.
+    return Elasticsearch(
+        "http://localhost:9200",
+        request_timings=True,
+        transport_class=partial(SlowTransport, **kwargs),
+    )
+
+
+def test_request_timings():
+    client = timed_client(
+        response=(response_meta(200, duration=0.05), {"took": 20}), delays=[0.1]
+    )
+    resp = client.search(query={"match_all": {}})
+    assert client.transport.bodies == [b'{"query":{"match_all":{}}}']
+
+    timings = RequestTimings.from_response(resp)
+    assert timings is resp.meta.timings
+    assert 0 < timings.serialize < 0.05
+    assert timings.transport == 0.05
+    assert 0 < timings.deserialize < 0.05
+    assert timings.server == 0.02
+    assert timings.network == pytest.approx(0.03)
+
+
+def test_timings_without_took():
+    client = timed_client(response=(response_meta(200), {"name": "serverless"}))
+    timings = RequestTimings.from_response(client.info())
+    assert timings.serialize == 0.0
+    assert timings.server is None
+    assert timings.network is None
+    # Without a duration from the transport the rest of the call is transport time
+    assert 0 < timings.deserialize < 0.05
+
+
+def test_deserialize_is_timed_directly():
+    class SlowSerializer(JsonSerializer):
+        def loads(self, data):
+            time.sleep(0.05)
+            return super().loads(data)
+
+    client = Elasticsearch(
+        "http://localhost:9200",
+        request_timings=True,
+        serializer=SlowSerializer(),
+        transport_class=partial(
+            SlowTransport,
+            response=(response_meta(200, duration=0.01), {"took": 1}),
+        ),
+    )
+    timings = RequestTimings.from_response(client.search())
+    assert timings.transport == 0.01
+    assert 0.05 <= timings.deserialize < 0.1
+
+    # Time spent in earlier attempts, e.g. retried by the
+    # transport, isn't counted as deserialization.
+    client = timed_client(
+        response=(response_meta(200, duration=0.01), {"took": 1}), delays=[0.2]
+    )
+    timings = RequestTimings.from_response(client.search())
+    assert timings.transport == 0.01
+    assert timings.deserialize < 0.05
+
+
+def test_serializers_replaced_once():
+    client = timed_client()
+    serializers = client.transport.serializers
+    client.search()
+    client.options(request_timeout=1).search()
+    assert client.transport.serializers is serializers
+
+    # Clients without timings keep the serializers of their transport
+    client = Elasticsearch(
+        "http://localhost:9200", transport_class=partial(SlowTransport)
+    )
+    client.search()
+    assert type(client.transport.serializers) is SerializerCollection
+
+
+def test_lazy_bodies_arent_deserialized():
+    client = timed_client(response=(response_meta(200), {"took": 1}))
+    resp = client.options(lazy_body=True).search()
+    assert RequestTimings.from_response(resp).deserialize == 0.0
+    assert resp["took"] == 1
+
+
+def test_timings_on_errors():
+    client = client_with_transport(
+        SlowTransport(response=(response_meta(404), {"took": 1})),
+        request_timings=True,
+    )
+    with pytest.raises(ApiError) as e:
+        client.get(index="test", id="1")
+    assert RequestTimings.from_response(e.value.meta).server == 0.001
+
+
+def test_metrics_registry_aggregates_timings():
+    registry = MetricsRegistry()
+    transport = SlowTransport(
+        response=(response_meta(200, duration=0.01), {"took": 4}), delays=[0.01] * 2
+    )
+    client = client_with_transport(transport, metrics_registry=registry)
+    client.search()
+    client.search()
+
+    timings = registry.snapshot()["search"]["2xx"]["timings"]
+    assert timings["transport"] == 0.02
+    assert timings["server"] == 0.008
+    assert timings["deserialize"] >= 0
+    assert timings["serialize"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_async_request_timings():
+    client = client_with_transport(
+        AsyncSlowTransport(response=(response_meta(200, duration=0.01), {"took": 3})),
+        AsyncElasticsearch,
+        request_timings=True,
+    )
+    resp = await client.index(index="test", document={"a": 1})
+    assert client.transport.bodies == [b'{"a":1}']
+    timings = RequestTimings.from_response(resp)
+    assert timings.server == 0.003
+    assert timings.serialize > 0
@@ -0,0 +1,179 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import gzip
+import os
+
+import pytest
+
+from benchmarks.fake_server import FakeServer
+from elasticsearch_serverless import (
+    AsyncElasticsearch,
+    Elasticsearch,
+    NotFoundError,
+    RequestContext,
+    RequestHooks,
+    TrafficRecorder,
+    async_replay_traffic,
+    read_traffic,
+    replay_traffic,
+)
+
+
+def record(tmp_path, **kwargs):
+    server = FakeServer()
+    hooks = RequestHooks()
+    with TrafficRecorder(tmp_path, **kwargs) as recorder:
+        recorder.register(hooks)
+        client = Elasticsearch(
+            "http://localhost:9200",
+            node_class=server.node_class,
+            hooks=hooks,
+            api_key="secret",
+        )
+        client.index(index="test", id="1", document={"a": 1})
+        client.search(index="test", query={"match_all": {}}, size=5)
+        with pytest.raises(NotFoundError):
+            client.get(index="test", id="missing")
+    return recorder
+
+
+def test_records_requests(tmp_path):
+    recorder = record(tmp_path)
+    assert recorder.records == 3
+
+    records = list(read_traffic(tmp_path))
+    assert [(r.method, r.target, r.endpoint_id, r.status) for r in records] == [
+        ("PUT", "/test/_doc/1", "index", 201),
+        ("POST", "/test/_search", "search", 200),
+        ("GET", "/test/_doc/missing", "get", 404),
+    ]
+    assert records[0].body == b'{"a":1}'
+    assert records[1].body == b'{"query":{"match_all":{}},"size":5}'
+    assert records[2].body is None
+    # Credentials are never recorded
+    assert "authorization" not in {key.lower() for key in records[0].headers}
+    assert records[0].headers["content-type"].startswith("application/")
+    assert 0 <= records[0].offset <= records[1].offset <= records[2].offset
+    assert all(r.duration > 0 for r in records)
+
+
+def test_segments_and_truncation(tmp_path):
+    recorder = record(tmp_path, max_segment_bytes=1)
+    assert len(recorder.segments) == 3
+    assert len(list(read_traffic(recorder.segments[1]))) == 1
+
+    # A segment which wasn't closed is read up to its last complete record.
+    with gzip.open(recorder.segments[0]) as f:
+        data = f.read()
+    with gzip.open(recorder.segments[0], "wb") as f:
+        f.write(data[:-3])
+    assert len(list(read_traffic(tmp_path))) == 2
+
+    with open(tmp_path / "other.traffic.gz", "wb") as f:
+        f.write(gzip.compress(b"not a segment"))
+    with pytest.raises(ValueError):
+        list(read_traffic(tmp_path / "other.traffic.gz"))
+
+
+def test_sample_rate(tmp_path):
+    assert record(tmp_path, sample_rate=0).records == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_replay(tmp_path):
+    record(tmp_path)
+    server = FakeServer()
+    client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+
+    report = replay_traffic(client, tmp_path, concurrency=2, speed=None)
+    assert report.requests == 3
+    assert report.statuses == {201: 1, 200: 1, 404: 1}
+    assert set(report.latencies) == {"index", "search", "get"}
+    assert sorted(server.requests) == [
+        ("GET", "/test/_doc/missing"),
+        ("POST", "/test/_search"),
+        ("PUT", "/test/_doc/1"),
+    ]
+    assert server.indices["test"]["1"].source == {"a": 1}
+
+    percentiles = report.percentiles()
+    assert 0 < percentiles[50] <= percentiles[99]
+    assert report.percentiles("search", recorded=True)[50] > 0
+    lines = str(report).splitlines()
+    assert lines[0].split()[:2] == ["endpoint", "requests"]
+    assert [line.split()[0] for line in lines[1:-1]] == [
+        "get",
+        "index",
+        "search",
+        "total",
+    ]
+    assert lines[-1].startswith("statuses: 200: 1, 201: 1, 404: 1;")
+
+
+def test_replay_time_scaling(tmp_path):
+    records = list(read_traffic(record(tmp_path).segments[0]))
+    for i, r in enumerate(records):
+        r.offset = i * 0.05
+    client = Elasticsearch("http://localhost:9200", node_class=FakeServer().node_class)
+
+    report = replay_traffic(client, records, speed=2)
+    # Offsets of 0, 50 and 100ms replayed twice as fast
+    assert 0.05 <= report.duration < 0.5
+
+    with pytest.raises(ValueError):
+        replay_traffic(client, records, speed=0)
+
+
+def test_records_sorted_by_offset(tmp_path):
+    slow = RequestContext("GET", "/slow", "get", {})
+    fast = RequestContext("GET", "/fast", "get", {})
+    with TrafficRecorder(tmp_path) as recorder:
+        # The slow request started first but finished last.
+        recorder.record(fast)
+        recorder.record(slow)
+    assert [r.target for r in read_traffic(tmp_path)] == ["/slow", "/fast"]
+
+
+def test_replay_sorts_records(tmp_path):
+    records = list(read_traffic(record(tmp_path).segments[0]))
+    for r, offset in zip(records, (10.2, 10.0, 10.1)):
+        r.offset = offset
+    server = FakeServer()
+    client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+
+    report = replay_traffic(client, records, concurrency=3)
+    assert server.requests == [
+        ("POST", "/test/_search"),
+        ("GET", "/test/_doc/missing"),
+        ("PUT", "/test/_doc/1"),
+    ]
+    assert 0.2 <= report.duration < 0.5
+    assert max(report.lag) < 0.05
+
+
+@pytest.mark.asyncio
+async def test_async_replay(tmp_path):
+    record(tmp_path)
+    server = FakeServer()
+    client = AsyncElasticsearch(
+        "http://localhost:9200", node_class=server.async_node_class
+    )
+
+    report = await async_replay_traffic(client, tmp_path, concurrency=3, speed=None)
+    assert report.statuses == {201: 1, 200: 1, 404: 1}
+    assert len(server.requests) == 3
@@ -0,0 +1,202 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import List, Optional
+from unittest import mock
+
+import msgspec
+import pytest
+
+from benchmarks.fake_server import FakeServer
+from elasticsearch_serverless import (
+    AsyncElasticsearch,
+    Elasticsearch,
+    HedgingPolicy,
+    NotFoundError,
+    SerializationError,
+)
+from elasticsearch_serverless._sync.client import _base
+from elasticsearch_serverless.serializer import (
+    JsonSerializer,
+    MsgspecSerializer,
+    OrjsonSerializer,
+)
+from elasticsearch_serverless.typed import (
+    GetResult,
+    MultiGetResponse,
+    MultiSearchResponse,
+    SearchResponse,
+)
+
+
+class Book(msgspec.Struct):
+    title: str
+    year: int
+    tags: List[str] = []
+    isbn: Optional[str] = None
+
+
+BOOKS = [
+    {"_id": "1", "title": "Dune", "year": 1965, "tags": ["scifi"]},
+    {"_id": "2", "title": "Emma", "year": 1815},
+    {"_id": "3", "title": "Ulysses", "year": 1922, "tags": []},
+]
+
+
+@pytest.fixture(params=[JsonSerializer, OrjsonSerializer, MsgspecSerializer])
+def server_client(request):
+    server = FakeServer()
+    server.add_documents("books", BOOKS)
+    client = Elasticsearch(
+        "http://localhost:9200",
+        node_class=server.node_class,
+        serializer=request.param(),
+    )
+    return server, client
+
+
+def test_search(server_client):
+    _, client = server_client
+    resp = client.options(source_type=Book).search(
+        index="books", query={"range": {"year": {"gte": 1900}}}
+    )
+    assert isinstance(resp.body, SearchResponse)
+    assert resp.meta.status == 200
+    assert resp.body.hits.total.value == 2
+    assert sorted((hit.id, hit.source) for hit in resp.body.hits.hits) == [
+        ("1", Book(title="Dune", year=1965, tags=["scifi"])),
+        ("3", Book(title="Ulysses", year=1922)),
+    ]
+    assert all(hit.index == "books" for hit in resp.body.hits.hits)
+
+    # Other APIs and clients without the option aren't typed
+    assert isinstance(client.search(index="books").body, dict)
+    assert isinstance(client.options(source_type=Book).count().body, dict)
+    assert isinstance(
+        client.options(source_type=Book).options(source_type=None).search().body,
+        dict,
+    )
+
+
+def test_msearch(server_client):
+    _, client = server_client
+    resp = client.options(source_type=Book).msearch(
+        searches=[
+            {"index": "books"},
+            {"query": {"ids": {"values": ["2"]}}},
+            {"index": "missing"},
+            {},
+        ]
+    )
+    assert isinstance(resp.body, MultiSearchResponse)
+    found, missing = resp.body.responses
+    assert found.status == 200
+    assert [hit.source for hit in found.hits.hits] == [Book(title="Emma", year=1815)]
+    assert missing.status == 404
+    assert missing.hits is None
+    assert missing.error["type"] == "index_not_found_exception"
+
+
+def test_get_and_mget(server_client):
+    _, client = server_client
+    typed = client.options(source_type=Book)
+
+    resp = typed.mget(index="books", ids=["1", "4"])
+    assert isinstance(resp.body, MultiGetResponse)
+    assert [(doc.id, doc.found, doc.source) for doc in resp.body.docs] == [
+        ("1", True, Book(title="Dune", year=1965, tags=["scifi"])),
+        ("4", False, None),
+    ]
+
+    resp = typed.get(index="books", id="2")
+    assert isinstance(resp.body, GetResult)
+    assert resp.body.source == Book(title="Emma", year=1815)
+
+
+def test_error_responses_arent_typed(server_client):
+    _, client = server_client
+    with pytest.raises(NotFoundError) as e:
+        client.options(source_type=Book).search(index="missing")
+    assert e.value.body["error"]["type"] == "index_not_found_exception"
+    assert e.value.message == "index_not_found_exception"
+
+
+def test_source_not_matching_type(server_client):
+    server, client = server_client
+    server.add_documents("books", [{"_id": "4", "title": "Untitled"}])
+    with pytest.raises(SerializationError, match="year"):
+        client.options(source_type=Book).search(index="books")
+
+
+def test_source_type_dict():
+    server = FakeServer()
+    server.add_documents("books", BOOKS)
+    client = Elasticsearch("http://localhost:9200", node_class=server.node_class)
+    resp = client.options(source_type=dict).search(index="books")
+    assert {hit.id: hit.source["title"] for hit in resp.body.hits.hits} == {
+        "1": "Dune",
+        "2": "Emma",
+        "3": "Ulysses",
+    }
+
+
+def test_custom_serializer_responses_are_converted():
+    class CustomSerializer(JsonSerializer):
+        def loads(self, data):
+            return self.json_loads(data)
+
+    server = FakeServer()
+    server.add_documents("books", BOOKS)
+    client = Elasticsearch(
+        "http://localhost:9200",
+        node_class=server.node_class,
+        serializer=CustomSerializer(),
+    )
+    resp = client.options(source_type=Book).search(index="books")
+    assert isinstance(resp.body, SearchResponse)
+    assert len(resp.body.hits.hits) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_search():
+    server = FakeServer()
+    server.add_documents("books", BOOKS)
+    client = AsyncElasticsearch(
+        "http://localhost:9200", node_class=server.async_node_class
+    )
+    resp = await client.options(source_type=Book).search(
+        index="books", query={"ids": {"values": ["1"]}}
+    )
+    assert [hit.source for hit in resp.body.hits.hits] == [
+        Book(title="Dune", year=1965, tags=["scifi"])
+    ]
+
+
+def test_hedged_search():
+    server = FakeServer(latency=0.05)
+    server.add_documents("books", BOOKS)
+    policy = HedgingPolicy(delay=0.001, max_hedge_ratio=1)
+    client = Elasticsearch(
+        "http://localhost:9200",
+        node_class=server.node_class,
+        hedging_policy=policy,
+    )
+    # Attempts in the threads of the policy are decoded by the serializer
+    with mock.patch.object(_base, "_convert_response", side_effect=AssertionError):
+        resp = client.options(source_type=Book).search(index="books")
+    assert policy.hedged_requests == 1
+    assert isinstance(resp.body, SearchResponse)
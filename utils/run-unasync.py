@@ -29,6 +29,13 @@ def main():
         "AsyncElasticsearch": "Elasticsearch",
         # We don't want to rewrite this class
         "AsyncSearchClient": "AsyncSearchClient",
+        # Request policies which need asyncio in the async client
+        "_async_hedge": "_hedge",
+        "_async_limit": "_limit",
+        "_async_retry": "_retry",
+        "_async_circuit": "_circuit",
+        "_async_measure": "_measure",
+        "_async_time": "_time",
     }
     rules = [
         unasync.Rule(